@@ -0,0 +1,95 @@
+import json
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.brief_service import BriefService
+from app.services.brief_orchestrator_service import run_brief, start_brief, brief_events, brief_is_fresh
+from app.services.poll_service import reset_polling_on_interaction
+
+router = APIRouter(tags=["Brief"])
+
+KEEPALIVE_SECONDS = 15
+
+def _sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data, default=str)}"]
+    return "\n".join(lines) + "\n\n"
+
+@router.post("/run")
+async def run_brief_now() -> Dict[str, Any]:
+    """Sync all connectors and regenerate the brief - PRD 16.2 on-demand execution"""
+    stats = await run_brief()
+    if stats.get("status") == "failed":
+        raise HTTPException(status_code=500, detail=f"Brief generation failed: {stats.get('error')}")
+    return stats
+
+@router.get("/latest")
+async def latest_brief(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Cards of the last finished brief - PRD 16.2"""
+    reset_polling_on_interaction(db)
+    latest = BriefService(db).latest()
+    if latest is None:
+        raise HTTPException(status_code=404, detail="No brief has been generated yet")
+    return latest
+
+@router.get("/stream")
+async def stream_brief(
+    run: bool = True,
+    last_event_id: Optional[int] = Header(default=None, alias="Last-Event-ID"),
+    db: Session = Depends(get_db),
+):
+    """Server-sent events: cached cards first, then progress of a brief run, then a summary
+
+    Events: "card" (cached, provisional or stored), "run", "source" and a final
+    "summary", after which the stream ends. Run events carry ids; reconnecting
+    with Last-Event-ID replays only what was missed. `run=false` follows a run
+    already in progress without starting one; no run is started either while
+    the latest snapshot is younger than brief_snapshot_fresh_minutes.
+    """
+    resuming = last_event_id is not None and brief_events.can_resume(last_event_id)
+    if last_event_id is not None and not brief_events.running and last_event_id >= brief_events.last_id:
+        # Client already saw the end of the last run; 204 stops EventSource reconnecting
+        return Response(status_code=204)
+
+    # Snapshot is read before the response starts; the request session closes afterwards
+    latest = None
+    if not resuming:
+        reset_polling_on_interaction(db)
+        latest = BriefService(db).latest()
+
+    async def events() -> AsyncIterator[str]:
+        queue = brief_events.subscribe(last_event_id if resuming else None)
+        try:
+            if latest is not None:
+                for card in latest["cards"]:
+                    yield _sse("card", {**card, "cached": True})
+            if run and not resuming and not (latest and brief_is_fresh(latest["generated_at"])):
+                start_brief()
+            elif not brief_events.running and queue.empty():
+                # Nothing to follow: close with a summary whose id makes a reconnect get 204
+                snapshot = {key: value for key, value in (latest or {}).items() if key != "cards"}
+                yield _sse("summary", {**snapshot, "cached": True}, brief_events.last_id)
+                return
+
+            while True:
+                try:
+                    event_id, event, data = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event, data, event_id)
+                if event == "summary":
+                    return
+        finally:
+            brief_events.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.dead_letter import DeadLetter
+from app.services.dead_letter_service import DeadLetterService, run_dead_letter_replay
+
+router = APIRouter(tags=["Dead Letters"])
+
+class ReplayRequest(BaseModel):
+    ids: Optional[List[int]] = None
+    source: Optional[str] = None
+    status: Optional[str] = None
+
+@router.get("")
+async def list_dead_letters(
+    status: Optional[str] = Query(default=None, description="pending, resolved or abandoned"),
+    source: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """Connector items that failed to sync - PRD Section 7.1"""
+    service = DeadLetterService(db)
+    return {"counts": service.counts(), "items": service.list(status, source, limit)}
+
+@router.post("/replay")
+async def replay_dead_letters(request: ReplayRequest) -> Dict[str, int]:
+    """Retry matching unresolved items now, abandoned ones included"""
+    # Connector calls block; keep them off the event loop
+    return await asyncio.to_thread(run_dead_letter_replay, request.ids, request.source, request.status)
+
+@router.post("/{letter_id}/replay")
+async def replay_dead_letter(letter_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Retry one item now"""
+    letter = db.query(DeadLetter).filter(DeadLetter.id == letter_id).first()
+    if letter is None:
+        raise HTTPException(status_code=404, detail="Dead letter not found")
+    if letter.status == 'resolved':
+        return {"id": letter_id, "status": "resolved"}
+
+    stats = await asyncio.to_thread(run_dead_letter_replay, [letter_id])
+    db.refresh(letter)
+    if not stats["resolved"]:
+        raise HTTPException(status_code=502, detail=f"Replay failed: {letter.error}")
+    return {"id": letter_id, "status": letter.status}
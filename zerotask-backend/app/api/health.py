@@ -5,6 +5,12 @@ from datetime import datetime
 
 from app.database import get_db
 from app.config import settings
+from app.services.llm_service import get_llm_client
+from app.services.job_state_service import JobStateService
+from app.utils.resilience import circuit_breakers
+from app.services.github_service import github_rate_limits
+from app.services.connector_service import connector_metrics
+from app.services.summary_cache_service import SummaryCacheService
 
 router = APIRouter(tags=["Health"])
 
@@ -18,17 +24,27 @@ async def health_check(db: Session = Depends(get_db)):
     except Exception as e:
         db_status = f"error: {str(e)}"
     
-    # TODO: Test Ollama connection
-    llm_status = "not_implemented"
+    # Test Ollama connection
+    llm_health = await get_llm_client().health()
+    llm_status = llm_health.pop("status")
+    
+    # Background jobs - PRD 7.4 alert threshold on consecutive failed syncs
+    jobs = JobStateService(db).summary() if db_status == "healthy" else []
     
     return {
-        "status": "healthy" if db_status == "healthy" else "degraded",
+        "status": "healthy" if db_status == "healthy" and not any(job["alert"] for job in jobs) else "degraded",
         "timestamp": datetime.utcnow().isoformat(),
         "version": "0.1.0",
         "services": {
             "database": db_status,
             "llm": llm_status,
         },
+        "llm": llm_health,
+        "llm_cache": SummaryCacheService(db).stats() if db_status == "healthy" else None,
+        "jobs": jobs,
+        "circuits": circuit_breakers.status(),
+        "rate_limits": {"github": github_rate_limits.status()},
+        "connectors": connector_metrics(),
         "config": {
             "ollama_url": settings.ollama_base_url,
             "model": settings.ollama_model,
@@ -0,0 +1,41 @@
+from typing import Optional
+
+import httpx
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.services.llm_service import get_llm_client
+from app.services.llm_queue_service import get_llm_queue, QueueFullError
+
+router = APIRouter(tags=["LLM"])
+
+class LLMGenerateRequest(BaseModel):
+    """Interactive LLM request (e.g. drafting a reply)"""
+    prompt: str = Field(..., description="Prompt text")
+    system: Optional[str] = Field(default=None, description="Optional system prompt")
+    max_tokens: int = Field(default=256, le=2048, description="Maximum tokens to generate")
+
+@router.post("/generate")
+async def generate(request: LLMGenerateRequest):
+    """Run an interactive generation ahead of queued brief work"""
+    client = get_llm_client()
+    try:
+        stream = await get_llm_queue().run(
+            "interactive",
+            lambda: client.generate(request.prompt, system=request.system, options={"num_predict": request.max_tokens}),
+            timeout=settings.llm_queue_wait_timeout,
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(int(e.retry_after + 0.5))})
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except (httpx.HTTPError, ValueError) as e:
+        raise HTTPException(status_code=502, detail=f"LLM request failed: {str(e)}")
+
+    return {"text": stream.text, "metrics": stream.metrics}
+
+@router.get("/queue")
+async def queue_status():
+    """Queue depth, wait and service times per priority class"""
+    return get_llm_queue().stats()
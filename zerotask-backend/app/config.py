@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -15,17 +15,140 @@ class Settings(BaseSettings):
     # LLM Configuration
     ollama_base_url: str = Field(default="http://localhost:11434")
     ollama_model: str = Field(default="llama2")
+    llm_keep_alive: str = Field(default="30m")  # how long Ollama keeps the model loaded after a call
+    llm_timeout: float = Field(default=60.0)  # seconds, per-call deadline
+    llm_connect_timeout: float = Field(default=5.0)
+    llm_warmup_timeout: float = Field(default=120.0)  # cold model loads can be slow
+    llm_health_timeout: float = Field(default=2.0)
+    llm_max_connections: int = Field(default=8)
+    llm_keepalive_expiry: float = Field(default=300.0)  # seconds an idle pooled connection is kept
+    llm_warmup_on_startup: bool = Field(default=True)
+    llm_context_tokens: int = Field(default=4096)  # model context window (sent as num_ctx)
+    llm_summary_tokens: int = Field(default=96)  # output budget reserved per summarized item
+    llm_item_max_tokens: int = Field(default=600)  # longer items are truncated before packing
+    llm_batch_max_items: int = Field(default=12)  # items per LLM call
+    llm_queue_concurrency: int = Field(default=2)  # LLM calls in flight (Ollama serves 1-2 at a time on a laptop)
+    llm_queue_interactive_reserved: int = Field(default=1)  # slots only interactive jobs may use
+    llm_queue_max_depth: Dict[str, int] = Field(default={
+        "interactive": 8,
+        "brief": 500,
+        "prefetch": 100,
+    })  # queued jobs per priority class before callers get backpressure
+    llm_queue_wait_timeout: float = Field(default=30.0)  # seconds an interactive job may wait before it is stale
+    llm_cache_enabled: bool = Field(default=True)
+    
+    # Daily Brief - PRD Section 14
+    brief_window_hours: int = Field(default=24)  # events considered for the brief
+    brief_max_cards: int = Field(default=50)
+    brief_evidence_links: int = Field(default=5)  # links stored per card
+    brief_deadline: float = Field(default=15.0)  # seconds for a whole /brief/run (PRD 12: p50 <= 10s, p95 <= 20s)
+    brief_connector_budget: float = Field(default=6.0)  # seconds a connector may fetch before it is marked unavailable
+    brief_connector_max_items: int = Field(default=100)  # items fetched per connector per run
+    llm_cache_ttl_hours: int = Field(default=24)  # PRD 7.3: cache by content hash, 24h TTL
+    llm_cache_stale_days: int = Field(default=7)  # expired entries kept this long for offline briefs
+    llm_cache_max_entries: int = Field(default=5000)  # LRU eviction beyond this
+    
+    # Embeddings (semantic grouping)
+    embedding_provider: str = Field(default="auto")  # 'auto', 'ollama', 'hashing'
+    ollama_embedding_model: str = Field(default="nomic-embed-text")
+    embedding_hashing_dim: int = Field(default=384)
+    embedding_index_dir: str = Field(default="./data/embeddings")
+    embedding_batch_size: int = Field(default=64)
+    embedding_max_chars: int = Field(default=2000)
+    embedding_timeout: float = Field(default=30.0)  # seconds
+    embedding_group_threshold: float = Field(default=0.75)  # cosine similarity
+    brief_semantic_grouping: bool = Field(default=True)  # merge dedupe clusters whose events are similar
+    
+    # Priority Scoring - PRD: mention + ownership + due date + recency
+    priority_weights: Dict[str, float] = Field(default={
+        "mention": 0.3, "ownership": 0.2, "due": 0.15, "recency": 0.2, "affinity": 0.1, "activity": 0.05,
+    })
+    priority_half_life_hours: float = Field(default=12.0)
+    priority_window_days: int = Field(default=7)
+    user_identities: List[str] = Field(default=[])  # extra handles/emails that count as "me"
     
     # Polling Configuration
-    slack_poll_interval: int = Field(default=5)  # minutes
+    slack_poll_interval: int = Field(default=5)  # minutes; starting (and reset) interval per scope
     github_poll_interval: int = Field(default=5)  # minutes
+    gmail_poll_interval: int = Field(default=5)  # minutes
+    gmail_poll_labels: List[str] = Field(default=["INBOX"])  # labels polled (and rated) separately
+    github_repos: List[str] = Field(default=[])  # owner/name repos to follow; empty = every repo the token can see
+    github_repos_per_query: int = Field(default=8)  # repos per batched search (GitHub caps search query length)
+    github_page_size: int = Field(default=50)  # search results per GraphQL page
+    github_max_pages: int = Field(default=5)  # per search and poll, bounds a poll's cost
+    github_rate_limit_reserve: int = Field(default=200)  # GraphQL points / REST calls kept back; polls pause below it
+    github_api_url: str = Field(default="https://api.github.com")
+    github_pr_detail_max: int = Field(default=10)  # PRs per brief run that get a changed-files digest
+    github_pr_detail_budget: float = Field(default=5.0)  # seconds the digest stage may add to a brief run
+    github_files_page_size: int = Field(default=100)  # file stats per GraphQL page
+    github_files_max_pages: int = Field(default=10)
+    github_patch_files: int = Field(default=5)  # top-N files whose patch hunks reach the LLM
+    github_patch_max_chars: int = Field(default=1500)  # per file
+    github_patch_page_size: int = Field(default=20)  # REST files page size; smaller pages carry fewer unwanted patches
+    github_component_depth: int = Field(default=2)  # path segments that name a component (src/api/x.py -> src/api)
+    poll_tick_seconds: int = Field(default=30)  # how often each source checks which scopes are due
+    poll_min_interval: int = Field(default=60)  # seconds, floor for the busiest channels/labels/repos
+    poll_max_interval: int = Field(default=3600)  # seconds, ceiling quiet scopes back off to
+    poll_backoff_factor: float = Field(default=2.0)  # interval multiplier per poll without changes
+    poll_ewma_alpha: float = Field(default=0.3)  # weight of the newest observed item rate
+    poll_target_items: float = Field(default=2.0)  # busy scopes are polled about every this many new items
+    poll_max_scopes_per_tick: int = Field(default=20)  # bounds API calls per tick
+    poll_scope_refresh: int = Field(default=1800)  # seconds between channel/label list refreshes
+    poll_jitter: int = Field(default=10)  # seconds of random delay so polls do not fire in lockstep
+    poll_misfire_grace: int = Field(default=120)  # seconds a late poll (e.g. after sleep) still runs
+    poll_startup_delay: int = Field(default=10)  # seconds after startup before the first polls
+    poll_overlap: int = Field(default=300)  # seconds re-fetched before the last successful poll
+    brief_poll_reuse_seconds: int = Field(default=60)  # /brief/run polls only due scopes of sources polled this recently
+    dead_letter_retry_interval: int = Field(default=60)  # seconds between retry worker runs
+    dead_letter_backoff_base: int = Field(default=60)  # seconds, doubled per failed retry
+    dead_letter_backoff_max: int = Field(default=3600)
+    dead_letter_max_attempts: int = Field(default=8)  # then abandoned until replayed by hand
+    dead_letter_batch_size: int = Field(default=50)  # items retried per worker run
+    dead_letter_retention_days: int = Field(default=7)  # resolved items kept for inspection
+    connector_timeout: float = Field(default=10.0)  # seconds per outbound Gmail/Slack call, cut short by the caller's deadline
+    request_timeout: float = Field(default=30.0)  # seconds an API request's outbound calls may take in total
+    circuit_failure_threshold: int = Field(default=5)  # consecutive outages before an endpoint's circuit opens
+    circuit_open_seconds: float = Field(default=30.0)  # fail fast this long, then let a probe through
+    circuit_half_open_probes: int = Field(default=1)
+    scheduler_shutdown_timeout: float = Field(default=10.0)  # seconds running jobs get to finish on shutdown
+    job_alert_failures: int = Field(default=3)  # PRD 7.4: alert after more consecutive failures
     
     # Daily Brief Settings
     daily_brief_hour: int = Field(default=9)  # 9 AM
+    brief_prewarm_minutes: int = Field(default=20)  # scheduled run this long before daily_brief_hour
+    brief_prewarm_deadline: float = Field(default=600.0)  # seconds; nobody waits on the scheduled run
+    brief_snapshot_fresh_minutes: int = Field(default=15)  # younger snapshots are served without a new run
+    
+    # Dedupe - PRD Section 9 Dedupe rule
+    dedupe_max_url_fanout: int = Field(default=20)  # URLs shared by more events are boilerplate (footers, unsubscribe links)
+    near_duplicate_enabled: bool = Field(default=True)
+    near_duplicate_threshold: float = Field(default=0.95)  # SimHash similarity (1 - hamming/64) to merge
+    near_duplicate_min_tokens: int = Field(default=8)  # shorter texts ("thanks!") are never merged
+    
+    # Data Retention - PRD Section 7.5
+    event_retention_days: int = Field(default=30)
+    card_retention_days: int = Field(default=7)
+    run_retention_days: int = Field(default=30)
+    retention_batch_size: int = Field(default=500)  # rows deleted per transaction
+    retention_vacuum_pages: int = Field(default=2000)  # pages reclaimed per incremental vacuum
+    retention_hour: int = Field(default=3)  # 3 AM
     
     # Security
     app_secret: str = Field(default="zerotask-local-secret-key")
     machine_id: str = Field(default="dev-machine-001")
+    previous_app_secrets: List[str] = Field(default=[])  # old secrets still accepted for decryption during key rotation
+    key_rotation_batch_size: int = Field(default=200)  # rows re-encrypted per transaction
+    key_rotation_pause: float = Field(default=0.05)  # seconds between batches, leaves the write lock to the API
+    encryption_key_cache: str = Field(default="file")  # 'file', 'keyring', 'none'
+    encryption_key_file: str = Field(default="./data/.token_key")  # owner-only (0600)
+    token_cache_size: int = Field(default=32)  # decrypted tokens held in memory
+    token_cache_ttl: int = Field(default=3600)  # seconds, for tokens without expires_at
+    token_expiry_margin: int = Field(default=60)  # seconds before expires_at a cached token is dropped
+    token_refresh_ahead: int = Field(default=300)  # seconds before expiry to refresh in the background
+    token_refresh_interval: int = Field(default=60)  # seconds between scheduled refresh checks
+    token_refresh_wait_timeout: float = Field(default=30.0)  # seconds a caller waits on an in-flight refresh
+    token_refresh_backoff_base: int = Field(default=30)  # seconds, doubled per consecutive transient failure
+    token_refresh_backoff_max: int = Field(default=900)
     
     # Shared Service Account Credentials (IT-managed)
     github_token: str = Field(default="", description="GitHub service account PAT")
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from app.config import settings
@@ -26,4 +26,28 @@ def get_db() -> Session:
 
 def create_tables():
     """Create all tables in the database"""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    _migrate_existing_tables()
+
+def _migrate_existing_tables():
+    """Add columns and indexes introduced after a table was first created
+    
+    create_all() skips tables that already exist, so local databases from
+    earlier versions would otherwise miss new (nullable) columns and indexes.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+            
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
\ No newline at end of file
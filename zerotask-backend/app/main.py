@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,7 +7,10 @@ import uvicorn
 
 from app.config import settings
 from app.database import create_tables
-from app.api import health, auth, gmail, slack
+from app.scheduler import start_scheduler, shutdown_scheduler
+from app.services.llm_service import get_llm_client, close_llm_client
+from app.utils.resilience import deadline_scope
+from app.api import health, auth, gmail, slack, llm, brief, dead_letters
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -20,14 +24,30 @@ async def lifespan(app: FastAPI):
     create_tables()
     print("Database tables created/verified")
     
-    # TODO: Start background job scheduler
+    # Start background job scheduler
+    start_scheduler()
     print("Background jobs initialized")
     
+    # Load the LLM in the background so the first brief does not pay for it
+    warmup_task = None
+    if settings.llm_warmup_on_startup:
+        warmup_task = asyncio.create_task(_warm_up_llm())
+    
     yield
     
     # Shutdown
     print("Shutting down ZeroTask API...")
-    # TODO: Shutdown background job scheduler
+    await shutdown_scheduler()
+    if warmup_task:
+        warmup_task.cancel()
+    await close_llm_client()
+
+async def _warm_up_llm() -> None:
+    try:
+        await get_llm_client().warm_up()
+        print(f"LLM model loaded: {settings.ollama_model}")
+    except Exception as e:
+        print(f"LLM warm-up skipped: {str(e) or type(e).__name__}")
 
 # Create FastAPI application with lifespan
 app = FastAPI(
@@ -48,11 +68,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_deadline(request, call_next):
+    """Bound the outbound connector calls a request makes; X-Request-Timeout may shorten request_timeout"""
+    timeout = settings.request_timeout
+    try:
+        timeout = min(timeout, float(request.headers.get("x-request-timeout", timeout)))
+    except ValueError:
+        pass
+    with deadline_scope(max(timeout, 0.1)):
+        return await call_next(request)
+
 # Include API routers
 app.include_router(health.router, prefix="/api/v1")
 app.include_router(auth.router, prefix="/api/v1/auth")
 app.include_router(gmail.router, prefix="/api/v1/gmail")
 app.include_router(slack.router)
+app.include_router(llm.router, prefix="/api/v1/llm")
+app.include_router(brief.router, prefix="/api/v1/brief")
+app.include_router(dead_letters.router, prefix="/api/v1/dead-letters")
 
 # OAuth callback endpoints (no prefix for external redirects)
 @app.get("/oauth2/callback")
@@ -2,5 +2,13 @@ from .tokens import Token, OAuthToken
 from .events import Event
 from .cards import Card
 from .runs import Run
+from .links import Link, EventUrl, SimhashBand
+from .llm_cache import LLMCacheEntry
+from .brief_snapshot import BriefSnapshot
+from .job_state import JobState
+from .poll_schedule import PollSchedule
+from .dead_letter import DeadLetter
+from .pr_files import PullRequestFiles
+from .connector_checkpoint import ConnectorCheckpoint
 
-__all__ = ["Token", "OAuthToken", "Event", "Card", "Run"]
\ No newline at end of file
+__all__ = ["Token", "OAuthToken", "Event", "Card", "Run", "Link", "EventUrl", "SimhashBand", "LLMCacheEntry", "BriefSnapshot", "JobState", "PollSchedule", "DeadLetter", "PullRequestFiles", "ConnectorCheckpoint"]
\ No newline at end of file
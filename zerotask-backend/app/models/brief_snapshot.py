@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class BriefSnapshot(Base):
+    """Finished daily brief, materialized for GET /brief/latest - PRD Section 16.2"""
+    __tablename__ = "brief_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)  # Newest snapshot = highest id
+    run_id = Column(Integer, nullable=True)  # Run that produced it (runs are purged independently)
+    status = Column(String(20), nullable=False)  # 'completed' or 'partial'
+    card_count = Column(Integer, nullable=False, default=0)
+    payload_json = Column(Text, nullable=False)  # Response body of GET /brief/latest
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_brief_snapshots_created', 'created_at'),
+    )
+    
+    def __repr__(self):
+        return f"<BriefSnapshot(id={self.id}, run_id={self.run_id}, cards={self.card_count}, created_at='{self.created_at}')>"
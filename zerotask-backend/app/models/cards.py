@@ -14,6 +14,8 @@ class Card(Base):
     evidence_links = Column(Text, nullable=True)  # JSON array of URLs with snippets
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     snoozed_until = Column(DateTime(timezone=True), nullable=True)  # For snooze functionality
+    cluster_id = Column(Integer, nullable=True)  # Dedupe cluster the card summarizes
+    cluster_fingerprint = Column(String(64), nullable=True)  # Hash of member events; unchanged => summary reused
     
     # Relationship to primary event
     primary_event = relationship("Event", back_populates="cards")
@@ -23,6 +25,8 @@ class Card(Base):
         Index('idx_cards_priority', 'priority_score'),
         Index('idx_cards_created', 'created_at'),
         Index('idx_cards_snoozed', 'snoozed_until'),
+        Index('idx_cards_event', 'primary_event_id'),
+        Index('idx_cards_cluster', 'cluster_id'),
     )
     
     @property
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class ConnectorCheckpoint(Base):
+    """Incremental-sync cursor per connector scope - PRD Section 7.1 Incremental sync"""
+    __tablename__ = "connector_checkpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(50), nullable=False)  # 'slack', 'gmail', 'github'
+    scope = Column(String(255), nullable=False)  # Same ids as poll_schedules.scope
+    cursor_json = Column(Text, nullable=False)  # Connector-defined, e.g. {"since": "2026-10-19T09:00:00"}
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('idx_connector_checkpoints_scope', 'source', 'scope', unique=True),
+    )
+    
+    def __repr__(self):
+        return f"<ConnectorCheckpoint(source='{self.source}', scope='{self.scope}', cursor={self.cursor_json})>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class DeadLetter(Base):
+    """Connector items that failed to fetch, kept for retry and review - PRD Section 7.1 Dead letter queue"""
+    __tablename__ = "dead_letters"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(50), nullable=False)  # 'gmail', 'slack', 'github'
+    kind = Column(String(50), nullable=False)  # What item_id names: 'message', 'channel', ...
+    item_id = Column(String(255), nullable=False)  # External ID to fetch again
+    payload_json = Column(Text, nullable=True)  # Extra arguments the retry needs (channel name, oldest ts)
+    error = Column(Text, nullable=True)  # Last error
+    attempts = Column(Integer, nullable=False, default=0)  # Failed retries so far
+    status = Column(String(20), nullable=False, default='pending')  # 'pending', 'resolved', 'abandoned'
+    next_retry_at = Column(DateTime(timezone=True), nullable=True)
+    last_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    resolved_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_dead_letters_item', 'source', 'kind', 'item_id', unique=True),
+        Index('idx_dead_letters_due', 'status', 'next_retry_at'),
+    )
+    
+    def __repr__(self):
+        return f"<DeadLetter(source='{self.source}', kind='{self.kind}', item_id='{self.item_id}', status='{self.status}')>"
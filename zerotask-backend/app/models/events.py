@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -16,6 +16,9 @@ class Event(Base):
     author = Column(String(255), nullable=True)
     ts = Column(DateTime(timezone=True), nullable=False)  # Event timestamp from source
     raw_json = Column(Text, nullable=True)  # Original API response for debugging
+    url_hash = Column(String(64), nullable=True)  # SHA-256 of the canonicalized deep link
+    cluster_id = Column(Integer, nullable=True)  # Dedupe cluster root (event id); one card per cluster
+    simhash = Column(BigInteger, nullable=True)  # 64-bit SimHash of title + snippet (stored signed)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationship to cards that reference this event
@@ -26,6 +29,8 @@ class Event(Base):
         Index('idx_events_source_id', 'source', 'source_id', unique=True),
         Index('idx_events_source_ts', 'source', 'ts'),
         Index('idx_events_ts', 'ts'),
+        Index('idx_events_url_hash', 'url_hash'),
+        Index('idx_events_cluster', 'cluster_id'),
     )
     
     def __repr__(self):
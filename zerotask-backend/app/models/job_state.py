@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Index
+from app.database import Base
+
+class JobState(Base):
+    """Last outcome of each background job - PRD Section 7.4 Monitoring"""
+    __tablename__ = "job_state"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(100), nullable=False)  # Scheduler job id, e.g. 'poll_slack'
+    last_started_at = Column(DateTime(timezone=True), nullable=True)
+    last_finished_at = Column(DateTime(timezone=True), nullable=True)
+    last_success_at = Column(DateTime(timezone=True), nullable=True)
+    last_duration_ms = Column(Float, nullable=True)
+    last_status = Column(String(20), nullable=True)  # 'success', 'failed'
+    last_error = Column(Text, nullable=True)
+    last_result_json = Column(Text, nullable=True)  # Stats returned by the job
+    consecutive_failures = Column(Integer, nullable=False, default=0)  # PRD 7.4 alert threshold: >3
+    run_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index('idx_job_state_job_id', 'job_id', unique=True),
+    )
+    
+    def __repr__(self):
+        return f"<JobState(job_id='{self.job_id}', last_status='{self.last_status}', last_success_at='{self.last_success_at}')>"
@@ -0,0 +1,55 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class Link(Base):
+    """Dedupe mapping between related events - PRD Section 9 Data Model"""
+    __tablename__ = "links"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    related_event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    reason = Column(String(20), nullable=False, default='url')  # what made the events duplicates
+    url_hash = Column(String(64), nullable=True)  # Shared canonical URL, for 'url' links
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_links_event', 'event_id'),
+        Index('idx_links_related', 'related_event_id'),
+    )
+    
+    def __repr__(self):
+        return f"<Link(event_id={self.event_id}, related_event_id={self.related_event_id}, reason='{self.reason}')>"
+
+class EventUrl(Base):
+    """Canonical URLs referenced by an event, indexed by hash for O(1) dedupe lookups"""
+    __tablename__ = "event_urls"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    url_hash = Column(String(64), nullable=False)  # SHA-256 of canonical_url
+    canonical_url = Column(Text, nullable=False)
+    
+    __table_args__ = (
+        Index('idx_event_urls_hash', 'url_hash'),
+        Index('idx_event_urls_event', 'event_id'),
+    )
+    
+    def __repr__(self):
+        return f"<EventUrl(event_id={self.event_id}, canonical_url='{self.canonical_url[:50]}')>"
+
+class SimhashBand(Base):
+    """LSH band index over event SimHash signatures for near-duplicate lookups"""
+    __tablename__ = "simhash_bands"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    band_key = Column(String(24), nullable=False)  # '<band index>:<band bits hex>'
+    
+    __table_args__ = (
+        Index('idx_simhash_bands_key', 'band_key'),
+        Index('idx_simhash_bands_event', 'event_id'),
+    )
+    
+    def __repr__(self):
+        return f"<SimhashBand(event_id={self.event_id}, band_key='{self.band_key}')>"
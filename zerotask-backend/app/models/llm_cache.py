@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class LLMCacheEntry(Base):
+    """LLM responses cached by content hash - PRD Section 7.3 Performance"""
+    __tablename__ = "llm_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), nullable=False, unique=True)  # SHA-256 of model + template version + normalized input
+    model = Column(String(100), nullable=False)
+    template_version = Column(String(50), nullable=False)
+    response = Column(Text, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), nullable=False)  # LRU eviction order
+    expires_at = Column(DateTime(timezone=True), nullable=False)  # Fresh until; stale entries still serve offline briefs
+    
+    __table_args__ = (
+        Index('idx_llm_cache_last_used', 'last_used_at'),
+        Index('idx_llm_cache_expires', 'expires_at'),
+    )
+    
+    def __repr__(self):
+        return f"<LLMCacheEntry(model='{self.model}', template_version='{self.template_version}', hits={self.hits})>"
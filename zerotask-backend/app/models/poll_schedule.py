@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index
+from app.database import Base
+
+class PollSchedule(Base):
+    """Adaptive poll interval per source scope (Slack channel, Gmail label, GitHub repo) - PRD Section 7.1"""
+    __tablename__ = "poll_schedules"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(50), nullable=False)  # 'slack', 'gmail', 'github'
+    scope = Column(String(255), nullable=False)  # Channel id, label id or owner/repo
+    label = Column(String(255), nullable=True)  # Human-readable name (channel name)
+    interval_seconds = Column(Float, nullable=False)  # Current poll interval
+    item_rate = Column(Float, nullable=True)  # EWMA of new/changed items per minute
+    idle_polls = Column(Integer, nullable=False, default=0)  # Consecutive polls without changes
+    last_items = Column(Integer, nullable=True)  # New/changed items found by the last poll
+    last_polled_at = Column(DateTime(timezone=True), nullable=True)
+    next_poll_at = Column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        Index('idx_poll_schedules_scope', 'source', 'scope', unique=True),
+        Index('idx_poll_schedules_due', 'source', 'next_poll_at'),
+    )
+    
+    def __repr__(self):
+        return f"<PollSchedule(source='{self.source}', scope='{self.scope}', interval={self.interval_seconds}s)>"
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class PullRequestFiles(Base):
+    """Changed-file stats and lazily fetched patches of a PR at one head commit - PRD Section 8 (GitHub)"""
+    __tablename__ = "pr_files"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    repo = Column(String(255), nullable=False)  # owner/name
+    number = Column(Integer, nullable=False)
+    head_sha = Column(String(64), nullable=False)  # A new push means a new row; old ones age out
+    file_count = Column(Integer, nullable=False, default=0)
+    additions = Column(Integer, nullable=False, default=0)
+    deletions = Column(Integer, nullable=False, default=0)
+    files_json = Column(Text, nullable=False)  # [[path, additions, deletions, change_type], ...]
+    patches_json = Column(Text, nullable=True)  # {path: truncated patch} for the top files, filled on first summary
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index('idx_pr_files_head', 'repo', 'number', 'head_sha', unique=True),
+        Index('idx_pr_files_last_used', 'last_used_at'),
+    )
+    
+    def __repr__(self):
+        return f"<PullRequestFiles(repo='{self.repo}', number={self.number}, head_sha='{self.head_sha[:7]}', files={self.file_count})>"
@@ -9,7 +9,8 @@ class Run(Base):
     id = Column(Integer, primary_key=True, index=True)
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     finished_at = Column(DateTime(timezone=True), nullable=True)
-    status = Column(String(20), nullable=False, default='running')  # 'running', 'completed', 'failed'
+    kind = Column(String(20), nullable=True, default='brief')  # 'brief', 'retention', 'key_rotation'
+    status = Column(String(20), nullable=False, default='running')  # 'running', 'completed', 'partial', 'failed'
     stats_json = Column(Text, nullable=True)  # JSON with processing statistics
     error_message = Column(Text, nullable=True)  # Error details for failed runs
     
@@ -17,6 +18,7 @@ class Run(Base):
     __table_args__ = (
         Index('idx_runs_started', 'started_at'),
         Index('idx_runs_status', 'status'),
+        Index('idx_runs_kind_started', 'kind', 'started_at'),
     )
     
     @property
@@ -28,4 +30,4 @@ class Run(Base):
         return delta.total_seconds()
     
     def __repr__(self):
-        return f"<Run(id={self.id}, status='{self.status}', started_at='{self.started_at}')>"
\ No newline at end of file
+        return f"<Run(id={self.id}, kind='{self.kind}', status='{self.status}', started_at='{self.started_at}')>"
\ No newline at end of file
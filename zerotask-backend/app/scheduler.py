@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from tzlocal import get_localzone
+
+from app.config import settings
+from app.services.retention_service import run_retention_job
+from app.services.gmail_oauth_service import run_token_refresh_job
+from app.services.key_rotation_service import run_key_rotation_job
+from app.services.brief_orchestrator_service import run_brief_prewarm_job
+from app.services.connector_service import CONNECTORS
+from app.services.poll_service import run_poll_job, poll_job_id
+from app.services.dead_letter_service import run_dead_letter_job
+from app.services.job_state_service import tracked_job, wait_for_running_jobs
+
+# Background job scheduler - PRD Section 8 Architecture (Jobs)
+# Every job: coalesce missed runs into one, never overlap itself, and record its outcome in job_state
+scheduler = AsyncIOScheduler(
+    timezone="UTC",
+    job_defaults={"coalesce": True, "max_instances": 1},
+)
+
+def start_scheduler() -> None:
+    """Register background jobs and start the scheduler"""
+    scheduler.add_job(
+        tracked_job("retention", run_retention_job),
+        trigger="cron",
+        hour=settings.retention_hour,
+        id="retention",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        tracked_job("token_refresh", run_token_refresh_job),
+        trigger="interval",
+        seconds=settings.token_refresh_interval,
+        id="token_refresh",
+        replace_existing=True,
+    )
+    # Materialize the brief before the user's morning, in local time like daily_brief_hour
+    prewarm_at = (settings.daily_brief_hour * 60 - settings.brief_prewarm_minutes) % (24 * 60)
+    scheduler.add_job(
+        tracked_job("brief_prewarm", run_brief_prewarm_job),
+        trigger="cron",
+        hour=prewarm_at // 60,
+        minute=prewarm_at % 60,
+        timezone=get_localzone(),
+        id="brief_prewarm",
+        replace_existing=True,
+        misfire_grace_time=settings.brief_prewarm_minutes * 60,  # laptop woke up late: still warm before the hour
+    )
+    # Connector polls - PRD Section 7.1 Incremental sync; each tick polls only the scopes that are due
+    first_poll = datetime.now(timezone.utc) + timedelta(seconds=settings.poll_startup_delay)
+    for index, source in enumerate(CONNECTORS):
+        job_id = poll_job_id(source)
+        scheduler.add_job(
+            tracked_job(job_id, run_poll_job),
+            trigger="interval",
+            seconds=settings.poll_tick_seconds,
+            jitter=settings.poll_jitter,
+            args=[source],
+            id=job_id,
+            replace_existing=True,
+            misfire_grace_time=settings.poll_misfire_grace,
+            next_run_time=first_poll + timedelta(seconds=index * settings.poll_jitter),
+        )
+    # Dead letter retries - backoff is per item, the tick only picks up the due ones
+    scheduler.add_job(
+        tracked_job("dead_letter_retry", run_dead_letter_job),
+        trigger="interval",
+        seconds=settings.dead_letter_retry_interval,
+        id="dead_letter_retry",
+        replace_existing=True,
+        next_run_time=first_poll + timedelta(seconds=settings.dead_letter_retry_interval),
+    )
+    if settings.previous_app_secrets:
+        # One-off background pass; a no-op once rotation to the current key has completed
+        scheduler.add_job(tracked_job("key_rotation", run_key_rotation_job), id="key_rotation", replace_existing=True)
+    scheduler.start()
+
+async def shutdown_scheduler() -> None:
+    """Stop scheduling new runs and give running jobs scheduler_shutdown_timeout seconds to finish"""
+    if not scheduler.running:
+        return
+    # Pause first so running jobs can finish before the executor drops their futures
+    scheduler.pause()
+    still_running = await asyncio.to_thread(wait_for_running_jobs, settings.scheduler_shutdown_timeout)
+    if still_running:
+        print(f"Scheduler stopped with jobs still running: {', '.join(still_running)}")
+    scheduler.shutdown(wait=False)
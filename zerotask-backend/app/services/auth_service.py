@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.tokens import Token
 from app.utils.encryption import token_encryption
+from app.utils.token_cache import token_cache
 
 class AuthService:
     """Authentication service for managing encrypted tokens - PRD Section 8 Architecture"""
@@ -32,6 +33,7 @@ class AuthService:
                 self.db.add(new_token)
             
             self.db.commit()
+            token_cache.invalidate(f"token:{provider}")
             return True
             
         except Exception as e:
@@ -40,13 +42,20 @@ class AuthService:
     
     def get_decrypted_token(self, provider: str) -> str:
         """Retrieve and decrypt token for API calls"""
+        cached = token_cache.get(f"token:{provider}")
+        if cached:
+            return cached[0]["token"]
+        
+        version = token_cache.version(f"token:{provider}")
         token_record = self.db.query(Token).filter(Token.provider == provider).first()
         
         if not token_record:
             raise ValueError(f"No token found for provider: {provider}")
         
         try:
-            return token_encryption.decrypt_token(token_record.encrypted_token)
+            token = token_encryption.decrypt_token(token_record.encrypted_token)
+            token_cache.put(f"token:{provider}", {"token": token}, version=version)
+            return token
         except Exception as e:
             raise ValueError(f"Failed to decrypt token for {provider}: {str(e)}")
     
@@ -62,6 +71,7 @@ class AuthService:
             if token_record:
                 self.db.delete(token_record)
                 self.db.commit()
+                token_cache.invalidate(f"token:{provider}")
                 return True
             
             return False
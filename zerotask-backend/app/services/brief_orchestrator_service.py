@@ -0,0 +1,235 @@
+import time
+import asyncio
+import itertools
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.events import Event
+from app.services.brief_service import BriefService, SOURCES
+from app.services.connector_service import CONNECTORS
+from app.services.event_ingest_service import EventIngestService
+from app.services.embedding_service import EmbeddingService
+from app.services.job_state_service import JobStateService
+from app.services.llm_service import OllamaClient
+from app.services.poll_service import PollService, poll_job_id, run_poll_job
+from app.utils.resilience import SourceUnavailableError, deadline_scope
+
+# Source statuses that make a brief partial
+UNAVAILABLE = ("timeout", "error", "unavailable")
+
+class BriefOrchestratorService:
+    """End-to-end brief run - PRD 16.2 POST /brief/run
+
+    All connectors are fetched concurrently, each within brief_connector_budget
+    (capped by what is left of brief_deadline). A connector that times out or
+    fails is reported as unavailable and the brief is built from the other
+    sources; its events from earlier runs still count. Sources the background
+    poller handled within brief_poll_reuse_seconds get an incremental poll of
+    their due scopes instead of a full fetch. Sources that turn out to have
+    new activity get their backed-off poll intervals reset.
+    Fetch, ingest and summarization timings are recorded in the brief's
+    Run.stats_json.
+    """
+
+    def __init__(self, db: Session, client: Optional[OllamaClient] = None,
+                 listener: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        self.db = db
+        self.client = client
+        self.listener = listener
+        self.deadline = 0.0
+        self.brief: Optional[BriefService] = None
+
+    async def run(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Sync and regenerate within `deadline` seconds (brief_deadline by default)"""
+        self.deadline = time.perf_counter() + (deadline or settings.brief_deadline)
+        self.brief = BriefService(self.db, self.client, deadline=self.deadline, listener=self.listener)
+        # The run is shared by every caller, so it keeps its own deadline rather than the first request's
+        with deadline_scope(deadline or settings.brief_deadline, inherit=False):
+            return await self.brief.generate(prepare=self.sync_sources)
+
+    async def fetch_source(self, source: str, since: datetime, budget: float) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """One connector's records and a status entry for the run stats"""
+        connector = CONNECTORS.get(source)
+        if connector is None:
+            return {"status": "not_configured"}, []
+
+        started = time.perf_counter()
+        records: List[Dict[str, Any]] = []
+        polled = JobStateService(self.db).recent_result(poll_job_id(source), settings.brief_poll_reuse_seconds)
+        incremental = bool(polled) and polled.get("status") == "ok"
+        try:
+            # Outbound calls on the connector's worker threads time out with the budget instead of running on after it
+            with deadline_scope(budget):
+                if incremental:
+                    # The poller is keeping up: only scopes that are due are fetched (after any poll in progress)
+                    fetched = await asyncio.wait_for(run_poll_job(source), timeout=budget)
+                else:
+                    fetched = await asyncio.wait_for(connector(self.db).collect(since), timeout=budget)
+        except asyncio.TimeoutError:
+            info = {"status": "timeout"}
+        except SourceUnavailableError as e:
+            # Circuit open: fail fast, the brief uses this source's events from earlier runs
+            info = {"status": "unavailable", "error": str(e)}
+        except Exception as e:
+            info = {"status": "error", "error": str(e)}
+        else:
+            if fetched is None or (incremental and fetched["status"] == "not_connected"):
+                info = {"status": "not_connected"}
+            elif incremental:
+                info = {"status": "ok", "incremental": True, "polled": fetched["polled"],
+                        "items": fetched["inserted"] + fetched["updated"]}
+            else:
+                records = fetched
+                info = {"status": "ok", "items": len(records)}
+
+        info["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if self.listener is not None:
+            self.listener("source", {"source": source, **info})
+        return info, records
+
+    async def sync_sources(self) -> Dict[str, Any]:
+        """Fetch every connector concurrently and ingest what arrived in time"""
+        started = time.perf_counter()
+        since = datetime.utcnow() - timedelta(hours=settings.brief_window_hours)
+        budget = max(min(settings.brief_connector_budget, self.deadline - started), 0.01)
+        outcomes = await asyncio.gather(*(self.fetch_source(source, since, budget) for source in SOURCES))
+        self.brief.timings["fetch_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        sources = {source: info for source, (info, _) in zip(SOURCES, outcomes)}
+        records = [record for _, source_records in outcomes for record in source_records]
+        for source, info in sources.items():
+            if info["status"] in UNAVAILABLE:
+                print(f"Brief source unavailable: {source} ({info.get('error', info['status'])})")
+
+        started = time.perf_counter()
+        ingest = EventIngestService(self.db).ingest(records)
+        self.brief.timings["ingest_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.reset_changed_sources(sources, ingest.get("event_ids", []))
+
+        started = time.perf_counter()
+        await EmbeddingService(self.db).index_ingested(ingest.get("event_ids", []))
+        self.brief.timings["embed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        return {
+            "sources": sources,
+            "unavailable": [source for source, info in sources.items() if info["status"] in UNAVAILABLE],
+            "ingested": {key: ingest[key] for key in ("received", "inserted", "updated", "unchanged")},
+        }
+
+    def reset_changed_sources(self, sources: Dict[str, Dict[str, Any]], event_ids: List[int]) -> None:
+        """Bring backed-off scopes of sources that had new or changed items back to their base interval"""
+        changed = {source for source, info in sources.items() if info.get("incremental") and info["items"]}
+        for start in range(0, len(event_ids), 900):
+            changed.update(source for source, in self.db.query(Event.source).filter(
+                Event.id.in_(event_ids[start:start + 900])
+            ).distinct())
+        poller = PollService(self.db)
+        for source in sorted(changed):
+            try:
+                poller.reset(source)
+            except Exception as e:
+                self.db.rollback()
+                print(f"Poll reset of {source} failed: {str(e)}")
+
+class BriefBroadcast:
+    """Progress of the current brief run, fanned out to streaming clients
+
+    Every event gets an increasing id. Events since the current run started
+    are kept, so a client reconnecting with Last-Event-ID is replayed what it
+    missed instead of starting over. A run always ends with a "summary" event.
+    """
+
+    HISTORY = 2000
+
+    def __init__(self):
+        self._sequence = itertools.count(1)
+        self._history: Deque[Tuple[int, str, Dict[str, Any]]] = deque(maxlen=self.HISTORY)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self.running = False
+        self.last_id = 0
+
+    def start(self) -> None:
+        self._history.clear()
+        self.running = True
+        self.publish("run", {"status": "running"})
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        item = (next(self._sequence), event, data)
+        self.last_id = item[0]
+        self._history.append(item)
+        for queue in self._subscribers:
+            queue.put_nowait(item)
+        if event == "summary":
+            self.running = False
+
+    def can_resume(self, last_event_id: int) -> bool:
+        """Whether every event after last_event_id is still in the history"""
+        return bool(self._history) and self._history[0][0] <= last_event_id + 1 <= self.last_id + 1
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> asyncio.Queue:
+        """Queue of (id, event, data), pre-filled with the events this client has not seen"""
+        queue: asyncio.Queue = asyncio.Queue()
+        if last_event_id is not None and self.can_resume(last_event_id):
+            replay = [item for item in self._history if item[0] > last_event_id]
+        elif self.running:
+            replay = list(self._history)
+        else:
+            replay = []
+        for item in replay:
+            queue.put_nowait(item)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+brief_events = BriefBroadcast()
+
+_current_run: Optional[asyncio.Task] = None
+
+def start_brief(deadline: Optional[float] = None) -> asyncio.Task:
+    """The brief run in progress, or a newly started one"""
+    global _current_run
+    if _current_run is None or _current_run.done():
+        _current_run = asyncio.ensure_future(_run_brief(deadline))
+    return _current_run
+
+async def run_brief(deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Run a brief on its own session; callers arriving mid-run share the run in progress"""
+    # Shielded so a disconnecting client does not cancel the run for everyone else
+    return await asyncio.shield(start_brief(deadline))
+
+async def _run_brief(deadline: Optional[float]) -> Dict[str, Any]:
+    brief_events.start()
+    stats: Dict[str, Any] = {"status": "failed"}
+    db = SessionLocal()
+    try:
+        stats = await BriefOrchestratorService(db, listener=brief_events.publish).run(deadline)
+        return stats
+    finally:
+        db.close()
+        summary = {key: stats.get(key) for key in ("run_id", "status", "error", "unavailable", "sources", "cards", "timings")}
+        summary["delta"] = {key: value for key, value in stats.get("delta", {}).items() if key != "changed_clusters"}
+        brief_events.publish("summary", summary)
+
+async def run_brief_prewarm_job() -> None:
+    """Scheduled entry point - materializes the brief ahead of daily_brief_hour
+
+    Nobody is waiting on this run, so it gets brief_prewarm_deadline instead of
+    the interactive deadline and summaries are not cut short.
+    """
+    stats = await run_brief(settings.brief_prewarm_deadline)
+    print(f"Brief pre-warm {stats.get('status')}: {len(stats.get('cards') or [])} cards "
+          f"in {stats.get('timings', {}).get('total_ms')} ms")
+
+def brief_is_fresh(generated_at: Optional[str]) -> bool:
+    """Whether a snapshot is recent enough to serve without starting a new run"""
+    if not generated_at:
+        return False
+    age = datetime.utcnow() - datetime.fromisoformat(generated_at)
+    return age < timedelta(minutes=settings.brief_snapshot_fresh_minutes)
@@ -0,0 +1,520 @@
+import json
+import time
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.events import Event
+from app.models.cards import Card
+from app.models.runs import Run
+from app.models.brief_snapshot import BriefSnapshot
+from app.services.llm_service import OllamaClient, get_llm_client
+from app.services.llm_queue_service import get_llm_queue
+from app.services.priority_service import PriorityScoringService
+from app.services.embedding_service import EmbeddingService
+from app.services.summarization_service import SummarizationService
+from app.services.summary_cache_service import SummaryCacheService
+from app.services.pr_files_service import pull_request_digest
+from app.utils.resilience import deadline_scope
+
+MAP_TEMPLATE_VERSION = "map-v1"
+REDUCE_TEMPLATE_VERSION = "reduce-v1"
+
+MAP_INSTRUCTION = (
+    "Each numbered item is one conversation from a single source (email thread, "
+    "Slack thread or GitHub pull request/issue). Summarize each in one or two sentences."
+)
+
+REDUCE_INSTRUCTION = (
+    "Each numbered item lists per-source summaries of the same topic. Fuse each item "
+    "into one or two sentences covering all sources, without repeating yourself."
+)
+
+SOURCES = ('gmail', 'slack', 'github')
+
+class BriefService:
+    """Two-stage daily brief generation - PRD Section 14 (summarize per source, then fuse)
+
+    Map: every (cluster, source) pair becomes one item, and all items are
+    summarized in context-packed batches that run concurrently. Results are
+    cached by content hash, so only sources whose events changed cost LLM time.
+    Reduce: clusters touched by more than one source get their per-source
+    summaries fused in a second (also cached) pass; single-source clusters use
+    the map summary as is. Dedupe clusters whose events are semantically
+    similar (embedding index) are merged into one topic first. Clusters are
+    ranked with the priority scorer and written as Card rows with
+    evidence_links. GitHub pull requests get a changed-files digest appended
+    to their map input (PR detail stage).
+
+    With a `deadline` (time.perf_counter() value) summarization gets whatever
+    time is left; clusters it cannot finish fall back to an expired cached
+    summary or else their newest title, and the run is recorded as 'partial'.
+    Clusters the LLM fails on get the same stale fallback.
+
+    A `listener(event, data)` receives progress for streaming clients: a
+    provisional "card" as soon as a cluster's summary is ready and the stored
+    "card" once it is written.
+    """
+
+    def __init__(self, db: Session, client: Optional[OllamaClient] = None, deadline: Optional[float] = None,
+                 listener: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        self.db = db
+        self.client = client
+        self.deadline = deadline
+        self.listener = listener
+        self.timings: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.details: Dict[str, str] = {}
+        self.stale_clusters: Set[int] = set()
+
+    def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        if self.listener is not None:
+            self.listener(event, data)
+
+    def _timed(self, stage: str, started: float) -> None:
+        self.timings[f"{stage}_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    def load_clusters(self, since: datetime) -> Dict[int, List[Event]]:
+        """Events in the brief window grouped by dedupe cluster, oldest first"""
+        events = self.db.query(Event).filter(Event.ts >= since).order_by(Event.ts).all()
+        clusters: Dict[int, List[Event]] = {}
+        for event in events:
+            clusters.setdefault(event.cluster_id or event.id, []).append(event)
+        return clusters
+
+    async def merge_related(self, clusters: Dict[int, List[Event]]) -> Dict[int, List[int]]:
+        """Merge dedupe clusters joined by embedding similarity, in place; merged id -> member cluster ids"""
+        if not settings.brief_semantic_grouping or len(clusters) < 2:
+            return {}
+
+        cluster_of_event = {event.id: cluster_id for cluster_id, events in clusters.items() for event in events}
+        embeddings = EmbeddingService(self.db)
+        try:
+            await embeddings.index_missing([event for events in clusters.values() for event in events])
+            groups = await embeddings.group_events(list(cluster_of_event))
+        except Exception as e:
+            print(f"Semantic grouping skipped: {str(e)}")
+            return {}
+
+        merged: Dict[int, List[int]] = {}
+        for group in groups:
+            members = sorted({cluster_of_event[event_id] for event_id in group})
+            if len(members) < 2:
+                continue
+            # The oldest cluster keeps its id (and card); the others' cards are dropped as merged
+            root = members[0]
+            for member in members[1:]:
+                clusters[root].extend(clusters.pop(member))
+            clusters[root].sort(key=lambda event: event.ts)
+            merged[root] = members
+        self.counts["semantic_merged"] = sum(len(members) - 1 for members in merged.values())
+        return merged
+
+    @staticmethod
+    def source_text(events: List[Event], details: Optional[Dict[str, str]] = None) -> str:
+        """Map-stage input: one source's events in a cluster, in chronological order"""
+        lines = []
+        for event in events:
+            header = f"[{event.source}] {event.author or 'unknown'}: {event.title}"
+            lines.append(f"{header}\n{event.snippet}" if event.snippet else header)
+            if details and event.source_id in details:
+                lines.append(details[event.source_id])
+        return "\n".join(lines)
+
+    async def pull_request_details(self, clusters: Dict[int, List[Event]]) -> Dict[str, str]:
+        """Changed-files digests of the pull requests about to be summarized, by event source_id
+
+        Bounded by github_pr_detail_budget (and the run deadline); PRs whose
+        digest is slow or fails are summarized without one.
+        """
+        heads: Dict[str, Optional[str]] = {}
+        for events in clusters.values():
+            for event in events:
+                if event.source != 'github' or not event.raw_json:
+                    continue
+                raw = json.loads(event.raw_json)
+                if raw.get('type') == 'pull_request':
+                    heads[event.source_id] = raw.get('head_sha')
+        if not heads:
+            return {}
+
+        started = time.perf_counter()
+        budget = settings.github_pr_detail_budget
+        if self.deadline is not None:
+            budget = min(budget, max(self.deadline - started, 0.01))
+        source_ids = list(heads)[:settings.github_pr_detail_max]
+        with deadline_scope(budget):
+            tasks = [asyncio.ensure_future(asyncio.to_thread(pull_request_digest, source_id, heads[source_id]))
+                     for source_id in source_ids]
+            done, pending = await asyncio.wait(tasks, timeout=budget)
+        for task in pending:
+            # Outbound calls on the thread time out with the budget; nobody waits for the result
+            task.add_done_callback(lambda task: task.exception())
+
+        details = {}
+        for source_id, task in zip(source_ids, tasks):
+            if task in done and task.exception() is None:
+                details[source_id] = task.result()
+            elif task in done:
+                print(f"Changed-files digest of {source_id} failed: {task.exception()}")
+        self._timed("pr_details", started)
+        self.counts["pr_details"] = len(details)
+        return details
+
+    @staticmethod
+    def evidence_links(events: List[Event]) -> List[Dict[str, Any]]:
+        """Deep links backing a card, newest first, one per URL"""
+        links, seen = [], set()
+        for event in sorted(events, key=lambda event: event.ts, reverse=True):
+            url = event.url
+            if not url or url in seen:
+                continue
+            seen.add(url)
+            links.append({
+                "url": url,
+                "source": event.source,
+                "title": event.title,
+                "snippet": (event.snippet or "")[:200],
+            })
+            if len(links) >= settings.brief_evidence_links:
+                break
+        return links
+
+    def map_items(self, clusters: Dict[int, List[Event]], details: Dict[str, str]) -> Dict[Tuple[int, str], str]:
+        """Map-stage inputs: one per (cluster, source)"""
+        items: Dict[Tuple[int, str], str] = {}
+        for cluster_id, events in clusters.items():
+            for source in SOURCES + tuple({event.source for event in events} - set(SOURCES)):
+                source_events = [event for event in events if event.source == source]
+                if source_events:
+                    items[(cluster_id, source)] = self.source_text(source_events, details)
+        return items
+
+    @staticmethod
+    def reduce_inputs(mapped: Dict[Tuple[int, str], str]) -> Tuple[Dict[int, str], Dict[int, str]]:
+        """(final summaries of single-source clusters, reduce-stage inputs of multi-source ones)"""
+        per_cluster: Dict[int, List[Tuple[str, str]]] = {}
+        for (cluster_id, source), summary in mapped.items():
+            per_cluster.setdefault(cluster_id, []).append((source, summary))
+
+        summaries: Dict[int, str] = {}
+        reduce_items: Dict[int, str] = {}
+        for cluster_id, parts in per_cluster.items():
+            if len(parts) == 1:
+                summaries[cluster_id] = parts[0][1]
+            else:
+                reduce_items[cluster_id] = "\n".join(f"{source}: {summary}" for source, summary in sorted(parts))
+        return summaries, reduce_items
+
+    async def summarize_clusters(self, clusters: Dict[int, List[Event]],
+                                 on_summary: Optional[Callable[[int, str], None]] = None) -> Dict[int, str]:
+        """Map per (cluster, source), then reduce multi-source clusters
+
+        `on_summary(cluster_id, summary)` fires as each cluster's final summary arrives.
+        """
+        self.details = await self.pull_request_details(clusters)
+
+        started = time.perf_counter()
+        map_items = self.map_items(clusters, self.details)
+        source_counts: Dict[int, int] = {}
+        for cluster_id, _ in map_items:
+            source_counts[cluster_id] = source_counts.get(cluster_id, 0) + 1
+
+        def on_mapped(results: Dict[Tuple[int, str], str]) -> None:
+            # Single-source clusters are final after the map stage
+            for (cluster_id, _), summary in results.items():
+                if source_counts[cluster_id] == 1:
+                    on_summary(cluster_id, summary)
+
+        mapper = SummarizationService(self.db, self.client, MAP_INSTRUCTION, MAP_TEMPLATE_VERSION, group="brief")
+        mapped = await mapper.summarize(map_items, on_result=on_mapped if on_summary else None)
+        self.stale_clusters.update(cluster_id for cluster_id, _ in mapper.stale)
+        self._timed("map", started)
+        self.counts["map_items"] = len(map_items)
+        self.counts["map_cached"] = mapper.stats.get("cached", 0)
+
+        started = time.perf_counter()
+        summaries, reduce_items = self.reduce_inputs(mapped)
+        if reduce_items:
+            reducer = SummarizationService(self.db, self.client, REDUCE_INSTRUCTION, REDUCE_TEMPLATE_VERSION, group="brief")
+
+            def on_fused(results: Dict[int, str]) -> None:
+                for cluster_id, summary in results.items():
+                    on_summary(cluster_id, summary)
+
+            fused = await reducer.summarize(reduce_items, on_result=on_fused if on_summary else None)
+            self.stale_clusters.update(reducer.stale)
+            for cluster_id, text in reduce_items.items():
+                # Fall back to the concatenated source summaries if fusion failed
+                summaries[cluster_id] = fused.get(cluster_id, text)
+        self._timed("reduce", started)
+        self.counts["reduce_items"] = len(reduce_items)
+        self.counts["summaries_stale"] = len(self.stale_clusters)
+
+        return summaries
+
+    def stale_summaries(self, clusters: Dict[int, List[Event]]) -> Dict[int, str]:
+        """Expired cached summaries of clusters the LLM did not get to (deadline fallback)"""
+        cache = SummaryCacheService(self.db)
+        model = (self.client or get_llm_client()).model
+        map_items = self.map_items(clusters, self.details)
+        mapped = cache.get_many(model, MAP_TEMPLATE_VERSION, map_items, allow_stale=True)
+        # A cluster needs every source's map summary, or its summary would drop a source
+        complete = {key: summary for key, summary in mapped.items()
+                    if all(item in mapped for item in map_items if item[0] == key[0])}
+
+        summaries, reduce_items = self.reduce_inputs(complete)
+        fused = cache.get_many(model, REDUCE_TEMPLATE_VERSION, reduce_items, allow_stale=True)
+        for cluster_id, text in reduce_items.items():
+            summaries[cluster_id] = fused.get(cluster_id, text)
+        return summaries
+
+    async def summarize_within_deadline(self, clusters: Dict[int, List[Event]],
+                                        on_summary: Optional[Callable[[int, str], None]] = None) -> Dict[int, str]:
+        """summarize_clusters bounded by the run deadline; if it runs out, the summaries finished in time plus stale ones"""
+        if self.deadline is None or not clusters:
+            return await self.summarize_clusters(clusters, on_summary)
+
+        finished: Dict[int, str] = {}
+
+        def collect(cluster_id: int, summary: str) -> None:
+            finished[cluster_id] = summary
+            if on_summary is not None:
+                on_summary(cluster_id, summary)
+
+        try:
+            return await asyncio.wait_for(
+                self.summarize_clusters(clusters, collect), timeout=max(self.deadline - time.perf_counter(), 0.01)
+            )
+        except asyncio.TimeoutError:
+            # Finished batches are already cached, so the next run picks up where this one stopped
+            self.counts["summaries_timed_out"] = len(clusters) - len(finished)
+            unfinished = {cluster_id: events for cluster_id, events in clusters.items() if cluster_id not in finished}
+            stale = self.stale_summaries(unfinished)
+            self.stale_clusters.update(stale)
+            self.counts["summaries_stale"] = len(self.stale_clusters)
+            return {**stale, **finished}
+
+    @staticmethod
+    def fingerprint(events: List[Event]) -> str:
+        """Hash of a cluster's member event ids and their content"""
+        digest = hashlib.sha256()
+        for event in sorted(events, key=lambda event: event.id):
+            digest.update(f"{event.id}\x1f{event.title}\x1f{event.snippet or ''}\x1f{event.url or ''}\x1e".encode())
+        return digest.hexdigest()
+
+    async def generate(self, prepare: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+        """Build or refresh the brief, record it as a Run and return its stats
+
+        Clusters are scored first and only the top brief_max_cards are
+        considered. Of those, only clusters whose fingerprint differs from their
+        card's are re-summarized; unchanged cards just get their score refreshed.
+        `prepare` (e.g. a connector sync) runs first inside the same Run and
+        its result is merged into the stats; an "unavailable" list in it marks
+        the brief as partial.
+        """
+        run = Run(kind='brief', status='running')
+        self.db.add(run)
+        self.db.commit()
+
+        # A newer brief supersedes whatever an older run still has queued
+        get_llm_queue().cancel_group("brief")
+
+        total_started = time.perf_counter()
+        stats: Dict[str, Any] = {}
+        try:
+            if prepare is not None:
+                stats.update(await prepare())
+
+            started = time.perf_counter()
+            since = datetime.utcnow() - timedelta(hours=settings.brief_window_hours)
+            clusters = self.load_clusters(since)
+            self._timed("load", started)
+
+            started = time.perf_counter()
+            merged = await self.merge_related(clusters)
+            fingerprints = {cluster_id: self.fingerprint(events) for cluster_id, events in clusters.items()}
+            self._timed("group", started)
+
+            started = time.perf_counter()
+            scorer = PriorityScoringService(self.db)
+            scores = scorer.score_clusters(scorer.build_features(since))
+            for root, members in merged.items():
+                scores[root] = max(scores.get(member, 0.0) for member in members)
+            ranked = sorted(clusters, key=lambda cluster_id: scores.get(cluster_id, 0.0), reverse=True)
+            ranked = ranked[:settings.brief_max_cards]
+            self._timed("score", started)
+
+            existing = self.load_cards(clusters, ranked)
+            changed = [
+                cluster_id for cluster_id in ranked
+                if cluster_id not in existing or existing[cluster_id].cluster_fingerprint != fingerprints[cluster_id]
+            ]
+
+            def on_summary(cluster_id: int, summary: str) -> None:
+                self._emit("card", {
+                    "cluster_id": cluster_id,
+                    "priority_score": round(scores.get(cluster_id, 0.0), 4),
+                    "summary_md": summary,
+                    "evidence_links": self.evidence_links(clusters[cluster_id]),
+                    "provisional": True,
+                })
+
+            summaries = await self.summarize_within_deadline(
+                {cluster_id: clusters[cluster_id] for cluster_id in changed}, on_summary if self.listener else None
+            )
+
+            started = time.perf_counter()
+            delta = self.write_cards(clusters, ranked, changed, existing, summaries, scores, fingerprints)
+            self._timed("write", started)
+
+            stats["clusters"] = len(clusters)
+            stats["cards"] = ranked
+            stats["delta"] = delta
+            stats.update(self.counts)
+            run.status = 'partial' if stats.get("unavailable") or "summaries_timed_out" in self.counts else 'completed'
+        except Exception as e:
+            self.db.rollback()
+            run.status = 'failed'
+            run.error_message = stats["error"] = str(e)
+            print(f"Brief generation failed: {str(e)}")
+
+        self._timed("total", total_started)
+        stats["timings"] = self.timings
+        run.finished_at = datetime.utcnow()
+        run.stats_json = json.dumps(stats)
+        if run.status != 'failed':
+            self.write_snapshot(run, stats["cards"], stats.get("unavailable", []))
+        self.db.commit()
+        stats["run_id"] = run.id
+        stats["status"] = run.status
+        return stats
+
+    def write_snapshot(self, run: Run, cluster_ids: List[int], unavailable: List[str]) -> BriefSnapshot:
+        """Materialize the finished brief so GET /brief/latest is a single read"""
+        cards = []
+        for start in range(0, len(cluster_ids), 900):
+            cards.extend(self.db.query(Card).filter(Card.cluster_id.in_(cluster_ids[start:start + 900])))
+        cards.sort(key=lambda card: card.priority_score or 0.0, reverse=True)
+
+        payload = {
+            "run_id": run.id,
+            "status": run.status,
+            "generated_at": run.finished_at.isoformat(),
+            "unavailable": unavailable,
+            "cards": [self.card_payload(card) for card in cards],
+        }
+        snapshot = BriefSnapshot(run_id=run.id, status=run.status, card_count=len(cards), payload_json=json.dumps(payload))
+        self.db.add(snapshot)
+        return snapshot
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Newest brief snapshot, highest priority first - PRD 16.2 GET /brief/latest"""
+        snapshot = self.db.query(BriefSnapshot).order_by(BriefSnapshot.id.desc()).first()
+        if snapshot is None:
+            return None
+
+        payload = json.loads(snapshot.payload_json)
+        now = datetime.utcnow().isoformat()
+        # Snoozes that have not expired yet still hide their card
+        payload["cards"] = [card for card in payload["cards"] if not card.get("snoozed_until") or card["snoozed_until"] <= now]
+        payload["snapshot_id"] = snapshot.id
+        return payload
+
+    @staticmethod
+    def card_payload(card: Card) -> Dict[str, Any]:
+        return {
+            "id": card.id,
+            "cluster_id": card.cluster_id,
+            "priority_score": card.priority_score,
+            "summary_md": card.summary_md,
+            "evidence_links": json.loads(card.evidence_links or "[]"),
+            "created_at": card.created_at.isoformat() if card.created_at else None,
+            "snoozed_until": card.snoozed_until.isoformat() if card.snoozed_until else None,
+        }
+
+    def load_cards(self, clusters: Dict[int, List[Event]], ranked: List[int]) -> Dict[int, Card]:
+        """Existing card per ranked cluster (cards written before cluster_id existed match by primary event)"""
+        existing: Dict[int, Card] = {}
+        for start in range(0, len(ranked), 900):
+            for card in self.db.query(Card).filter(Card.cluster_id.in_(ranked[start:start + 900])).order_by(Card.created_at):
+                existing[card.cluster_id] = card
+
+        cluster_of_event = {
+            event.id: cluster_id for cluster_id in ranked if cluster_id not in existing for event in clusters[cluster_id]
+        }
+        event_ids = list(cluster_of_event)
+        for start in range(0, len(event_ids), 900):
+            legacy = self.db.query(Card).filter(
+                Card.cluster_id.is_(None), Card.primary_event_id.in_(event_ids[start:start + 900])
+            ).order_by(Card.created_at)
+            for card in legacy:
+                existing[cluster_of_event[card.primary_event_id]] = card
+        return existing
+
+    def write_cards(self, clusters: Dict[int, List[Event]], ranked: List[int], changed: List[int],
+                    existing: Dict[int, Card], summaries: Dict[int, str], scores: Dict[int, float],
+                    fingerprints: Dict[int, str]) -> Dict[str, Any]:
+        """Upsert changed clusters' cards, rescore unchanged ones, drop cards of merged clusters"""
+        changed_set = set(changed)
+        written: List[Card] = []
+        delta: Dict[str, Any] = {"new": 0, "changed": 0, "unchanged": 0, "rescored": 0, "removed": 0}
+        try:
+            for cluster_id in ranked:
+                card = existing.get(cluster_id)
+                score = round(scores.get(cluster_id, 0.0), 4)
+                if cluster_id not in changed_set:
+                    delta["unchanged"] += 1
+                    if abs((card.priority_score or 0.0) - score) > 1e-4:
+                        card.priority_score = score
+                        delta["rescored"] += 1
+                    continue
+
+                events = clusters[cluster_id]
+                summary = summaries.get(cluster_id)
+                values = {
+                    "primary_event_id": events[-1].id,
+                    "cluster_id": cluster_id,
+                    # No fingerprint for fallback (title or stale) summaries, so the next run retries the LLM
+                    "cluster_fingerprint": fingerprints[cluster_id] if summary and cluster_id not in self.stale_clusters else None,
+                    "priority_score": score,
+                    # Offline fallback: the newest event's title stands in for a summary
+                    "summary_md": summary or events[-1].title,
+                    "evidence_links": json.dumps(self.evidence_links(events)),
+                }
+                if card:
+                    for key, value in values.items():
+                        setattr(card, key, value)
+                    delta["changed"] += 1
+                else:
+                    card = Card(**values)
+                    self.db.add(card)
+                    delta["new"] += 1
+                written.append(card)
+
+            # Cards of clusters that dedupe or semantic grouping has since merged into another cluster
+            cluster_of_event = {event.id: cluster_id for cluster_id, events in clusters.items() for event in events}
+            cards = self.db.query(Card.id, Card.cluster_id, Card.primary_event_id, Event.cluster_id).join(
+                Event, Event.id == Card.primary_event_id
+            ).filter(Card.cluster_id.isnot(None))
+            merged_ids = [
+                card_id for card_id, card_cluster, primary_event_id, event_cluster in cards
+                if card_cluster not in clusters and (
+                    primary_event_id in cluster_of_event or (event_cluster is not None and event_cluster != card_cluster)
+                )
+            ]
+            if merged_ids:
+                delta["removed"] = self.db.query(Card).filter(Card.id.in_(merged_ids)).delete(synchronize_session=False)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Failed to write brief cards: {str(e)}")
+
+        for card in written:
+            self._emit("card", self.card_payload(card))
+        delta["changed_clusters"] = changed[:100]
+        return delta
@@ -0,0 +1,395 @@
+import json
+import time
+import asyncio
+import weakref
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.gmail_api_service import GmailApiService
+from app.services.gmail_oauth_service import GmailOAuthService
+from app.services.slack_oauth_service import SlackOAuthService
+from app.services.shared_auth_service import SharedAuthService
+from app.services.github_service import GitHubService, repo_sets
+from app.services.dead_letter_service import DeadLetterService
+from app.models.connector_checkpoint import ConnectorCheckpoint
+from app.utils.rate_limiter import TokenBucket
+from app.utils.resilience import SourceUnavailableError, time_remaining
+
+def gmail_record(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Event record for a parsed Gmail message"""
+    return {
+        'source': 'gmail',
+        'source_id': message['id'],
+        'url': message.get('web_link'),
+        'title': message.get('subject') or '(no subject)',
+        'snippet': message.get('snippet'),
+        'author': message.get('from'),
+        'ts': int(message['internal_date']) / 1000 if message.get('internal_date') else None,
+        'raw_json': {key: message.get(key) for key in ('thread_id', 'to', 'labels')},
+    }
+
+def slack_record(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Event record for a Slack message or mention"""
+    text = message.get('text') or ''
+    return {
+        'source': 'slack',
+        'source_id': f"{message.get('channel_id')}:{message.get('timestamp')}",
+        'url': message.get('permalink'),
+        'title': f"#{message.get('channel_name')}: {text.splitlines()[0][:120] if text else '(no text)'}",
+        'snippet': text,
+        'author': message.get('user'),
+        'ts': float(message['timestamp']) if message.get('timestamp') else None,
+        'raw_json': {key: message.get(key) for key in ('thread_ts', 'reply_count')},
+    }
+
+def github_record(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Event record for an issue or pull request from the GitHub search"""
+    repo = item['repository']['nameWithOwner']
+    raw = {
+        'type': 'pull_request' if 'headRefOid' in item else 'issue',
+        'html_url': item.get('url'),
+        'body': (item.get('bodyText') or '')[:2000],
+        'state': item.get('state'),
+        'reasons': item.get('reasons', []),
+        'assignees': [node['login'] for node in item.get('assignees', {}).get('nodes', []) if node],
+        'labels': [node['name'] for node in item.get('labels', {}).get('nodes', []) if node],
+        'comments': item.get('comments', {}).get('totalCount'),
+    }
+    if raw['type'] == 'pull_request':
+        raw.update({
+            'draft': item.get('isDraft'),
+            'review_decision': item.get('reviewDecision'),
+            'mergeable': item.get('mergeable'),
+            'additions': item.get('additions'),
+            'deletions': item.get('deletions'),
+            'changed_files': item.get('changedFiles'),
+            'head_sha': item.get('headRefOid'),
+            'head_ref': item.get('headRefName'),
+            'base_ref': item.get('baseRefName'),
+            'review_requested': [
+                reviewer.get('login') or reviewer.get('name')
+                for reviewer in (node.get('requestedReviewer') for node in item.get('reviewRequests', {}).get('nodes', []) if node)
+                if reviewer
+            ],
+        })
+    return {
+        'source': 'github',
+        'source_id': f"{repo}#{item['number']}",
+        'url': item.get('url'),
+        'title': f"{repo}#{item['number']}: {item.get('title') or '(untitled)'}",
+        'snippet': (item.get('bodyText') or '')[:500],
+        'author': (item.get('author') or {}).get('login'),
+        'ts': item.get('updatedAt'),
+        'raw_json': raw,
+    }
+
+def github_notification_record(thread: Dict[str, Any]) -> Dict[str, Any]:
+    """Event record for a GitHub notification thread (mentions, comments, CI, ...)"""
+    repo = thread['repository']['full_name']
+    subject = thread.get('subject') or {}
+    # API subject URLs (/repos/o/r/pulls/1) -> the page the user opens (/o/r/pull/1)
+    url = (subject.get('url') or f"https://api.github.com/repos/{repo}")
+    url = url.replace('https://api.github.com/repos/', 'https://github.com/').replace('/pulls/', '/pull/')
+    return {
+        'source': 'github',
+        'source_id': f"notification:{thread['id']}",
+        'url': url,
+        'title': f"{repo}: {subject.get('title') or '(untitled)'}",
+        'snippet': f"{subject.get('type')} notification ({thread.get('reason')})",
+        'author': None,
+        'ts': thread.get('updated_at'),
+        'raw_json': {'html_url': url, 'type': subject.get('type'), 'reason': thread.get('reason'), 'unread': thread.get('unread')},
+    }
+
+def run_with_session(func: Callable[..., Any], *args: Any) -> Any:
+    """Call func(db, *args) with a session of its own - for connector work on worker threads"""
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+Record = Dict[str, Any]
+
+class RateLimit(NamedTuple):
+    """Calls a connector may make per window, across all of its callers in the process"""
+    calls: int
+    per_seconds: float
+
+# Process-wide connector state: token buckets per source, semaphores per (event loop, source), metrics
+_buckets: Dict[str, TokenBucket] = {}
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+_metrics: Dict[str, Dict[str, float]] = {}
+_state_lock = threading.Lock()
+
+def _count(source: str, **amounts: float) -> None:
+    with _state_lock:
+        metrics = _metrics.setdefault(source, {"calls": 0, "errors": 0, "records": 0, "call_ms": 0.0, "throttled_ms": 0.0})
+        for name, amount in amounts.items():
+            metrics[name] += amount
+
+def connector_metrics() -> Dict[str, Dict[str, float]]:
+    """Calls, errors, records yielded and time spent per connector since startup"""
+    with _state_lock:
+        return {source: {name: round(value, 1) for name, value in metrics.items()} for source, metrics in _metrics.items()}
+
+class Connector:
+    """Base class for source connectors - PRD Section 7.1 Incremental sync
+
+    A connector declares its `rate_limit` and `max_concurrency` and implements
+    list_scopes() and fetch_incremental(), an async iterator of event records
+    for one scope (channel, label, repo batch) that advances the cursor it is
+    given; the poller stores that cursor as the scope's checkpoint once the
+    records are ingested. Blocking SDK calls go through call(), which runs
+    them on a worker thread with a session of their own, within the
+    connector's concurrency and rate limits, and counts them in the metrics.
+    """
+
+    source = ''
+    rate_limit = RateLimit(60, 60.0)
+    max_concurrency = 4
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def is_connected(self) -> bool:
+        """Whether the source is set up; may refresh an OAuth token, so implementations keep it off the loop"""
+        raise NotImplementedError
+
+    async def list_scopes(self) -> Dict[str, str]:
+        """Scope id -> label of everything this connector polls"""
+        raise NotImplementedError
+
+    def fetch_incremental(self, scope: str, label: str, cursor: Dict[str, Any]) -> AsyncIterator[Record]:
+        """Records of one scope changed since the cursor; updates the cursor once exhausted"""
+        raise NotImplementedError
+
+    async def fetch_since(self, since: datetime) -> AsyncIterator[Record]:
+        """Everything changed since `since` across all scopes (full sync for brief runs)"""
+        for scope, label in (await self.list_scopes()).items():
+            async for record in self.fetch_incremental(scope, label, {"since": since.isoformat()}):
+                yield record
+
+    async def collect(self, since: datetime) -> Optional[List[Record]]:
+        """fetch_since as a list, one record per source_id (None if not connected)"""
+        if not await self.is_connected():
+            return None
+        records: Dict[str, Record] = {}
+        async for record in self.fetch_since(since):
+            records[record['source_id']] = record
+        return list(records.values())
+
+    @staticmethod
+    def window(cursor: Dict[str, Any]) -> Tuple[datetime, datetime]:
+        """(since, now): the cursor's position less poll_overlap, never before the brief window"""
+        now = datetime.utcnow()
+        window_start = now - timedelta(hours=settings.brief_window_hours)
+        if not cursor.get('since'):
+            return window_start, now
+        since = datetime.fromisoformat(cursor['since']) - timedelta(seconds=settings.poll_overlap)
+        return max(window_start, since), now
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with _state_lock:
+            semaphores = _semaphores.setdefault(loop, {})
+            if self.source not in semaphores:
+                semaphores[self.source] = asyncio.Semaphore(self.max_concurrency)
+            return semaphores[self.source]
+
+    def _limited(self, func: Callable[..., Any], *args: Any) -> Any:
+        with _state_lock:
+            bucket = _buckets.get(self.source)
+            if bucket is None:
+                bucket = _buckets[self.source] = TokenBucket(*self.rate_limit)
+        remaining = time_remaining()
+        waited = bucket.acquire(max_wait=remaining)
+        if waited is None:
+            raise SourceUnavailableError(self.source, 'client', bucket.delay(), reason="rate limit would outlast the deadline")
+        if waited:
+            _count(self.source, throttled_ms=waited * 1000)
+        return run_with_session(func, *args)
+
+    async def call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """func(db, *args) on a worker thread, within this connector's concurrency and rate limits"""
+        async with self._semaphore():
+            started = time.perf_counter()
+            try:
+                return await asyncio.to_thread(self._limited, func, *args)
+            except Exception:
+                _count(self.source, errors=1)
+                raise
+            finally:
+                _count(self.source, calls=1, call_ms=(time.perf_counter() - started) * 1000)
+
+def _run_async(db: Session, method: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    # GmailApiService's methods are async in name only; this runs on call()'s worker thread
+    return asyncio.run(method(db, *args))
+
+class GmailConnector(Connector):
+    """Gmail labels; message bodies are fetched in concurrent batch requests once the id list is known"""
+
+    source = 'gmail'
+    rate_limit = RateLimit(2, 1.0)  # a batch of 20 messages.get is 100 of the 250 quota units per user-second
+    max_concurrency = 4
+
+    async def is_connected(self) -> bool:
+        return await asyncio.to_thread(run_with_session, lambda db: GmailOAuthService(db).is_connected())
+
+    async def list_scopes(self) -> Dict[str, str]:
+        return {label: label for label in settings.gmail_poll_labels}
+
+    async def messages(self, since: datetime, label_ids: Optional[List[str]] = None) -> AsyncIterator[Record]:
+        query = f"after:{int(since.replace(tzinfo=timezone.utc).timestamp())}"
+        ids = await self.call(_run_async, GmailApiService.list_message_ids, settings.brief_connector_max_items, query, label_ids)
+        # One authorized connection and one round trip per batch, not per message
+        chunks = [ids[start:start + GmailApiService.BATCH_SIZE] for start in range(0, len(ids), GmailApiService.BATCH_SIZE)]
+        results = await asyncio.gather(
+            *(self.call(_run_async, GmailApiService.get_messages, chunk) for chunk in chunks), return_exceptions=True
+        )
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, SourceUnavailableError):
+                raise result
+            if isinstance(result, Exception):
+                messages, errors = {}, {message_id: str(result) for message_id in chunk}
+            else:
+                messages, errors = result
+            for message_id in chunk:
+                if message_id in messages:
+                    _count(self.source, records=1)
+                    yield gmail_record(messages[message_id])
+                else:
+                    error = errors.get(message_id, "missing from batch response")
+                    print(f"Error fetching message {message_id}: {error}")
+                    DeadLetterService(self.db).record('gmail', 'message', message_id, error)
+
+    async def fetch_incremental(self, scope: str, label: str, cursor: Dict[str, Any]) -> AsyncIterator[Record]:
+        since, now = self.window(cursor)
+        async for record in self.messages(since, [scope]):
+            yield record
+        cursor['since'] = now.isoformat()
+
+    async def fetch_since(self, since: datetime) -> AsyncIterator[Record]:
+        # All mail, not just the polled labels
+        async for record in self.messages(since):
+            yield record
+
+class SlackConnector(Connector):
+    """Slack channels; a brief run also collects today's mentions"""
+
+    source = 'slack'
+    rate_limit = RateLimit(50, 60.0)  # Tier 3 (conversations.history)
+    max_concurrency = 3
+
+    async def is_connected(self) -> bool:
+        return await asyncio.to_thread(run_with_session, lambda db: SlackOAuthService(db).is_connected())
+
+    async def list_scopes(self) -> Dict[str, str]:
+        channels = await self.call(lambda db: SlackOAuthService(db).get_channels())
+        return {channel['id']: channel['name'] for channel in channels}
+
+    async def fetch_incremental(self, scope: str, label: str, cursor: Dict[str, Any]) -> AsyncIterator[Record]:
+        since, now = self.window(cursor)
+        messages = await self.call(
+            lambda db: SlackOAuthService(db).get_channel_messages(
+                {'id': scope, 'name': label}, since.replace(tzinfo=timezone.utc).timestamp(), settings.brief_connector_max_items
+            )
+        )
+        for message in messages:
+            _count(self.source, records=1)
+            yield slack_record(message)
+        cursor['since'] = now.isoformat()
+
+    async def fetch_since(self, since: datetime) -> AsyncIterator[Record]:
+        messages, mentions = await asyncio.gather(
+            self.call(lambda db: SlackOAuthService(db).get_messages_today(settings.brief_connector_max_items)),
+            self.call(lambda db: SlackOAuthService(db).get_mentions_today()),
+        )
+        # Mentions come last so their permalinks win for messages found by both calls
+        for message in messages + mentions:
+            _count(self.source, records=1)
+            yield slack_record(message)
+
+class GitHubConnector(Connector):
+    """Batches of followed repos (one GraphQL search each) and notifications"""
+
+    source = 'github'
+    rate_limit = RateLimit(80, 60.0)  # GitHub asks integrations to avoid bursts; headroom is also tracked per resource
+    max_concurrency = 2
+
+    async def is_connected(self) -> bool:
+        return SharedAuthService.is_github_configured()
+
+    async def list_scopes(self) -> Dict[str, str]:
+        scopes = {scope: (', '.join(repos) or 'all repos')[:255] for scope, repos in repo_sets().items()}
+        scopes['notifications'] = 'notifications'
+        return scopes
+
+    async def fetch_incremental(self, scope: str, label: str, cursor: Dict[str, Any]) -> AsyncIterator[Record]:
+        since, now = self.window(cursor)
+        if scope == 'notifications':
+            # Last-Modified and the poll interval GitHub asked for are kept in the cursor
+            threads = await self.call(lambda db: GitHubService().get_notifications(since, cursor))
+            records = [github_notification_record(thread) for thread in threads]
+        else:
+            # A batch that no longer exists (repo list changed) drops out at the next scope refresh
+            repos = repo_sets().get(scope)
+            items = await self.call(lambda db: GitHubService().search_items(repos, since)) if repos is not None else []
+            records = [github_record(item) for item in items]
+        for record in records:
+            _count(self.source, records=1)
+            yield record
+        cursor['since'] = now.isoformat()
+
+# Every source the brief syncs and the poller polls, by name
+CONNECTORS: Dict[str, Type[Connector]] = {
+    'gmail': GmailConnector,
+    'slack': SlackConnector,
+    'github': GitHubConnector,
+}
+
+class CheckpointStore:
+    """Cursors of connector scopes, persisted so polls resume where they left off after a restart"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, source: str, scope: str) -> Dict[str, Any]:
+        checkpoint = self.db.query(ConnectorCheckpoint).filter(
+            ConnectorCheckpoint.source == source, ConnectorCheckpoint.scope == scope
+        ).first()
+        return json.loads(checkpoint.cursor_json) if checkpoint else {}
+
+    def save(self, source: str, scope: str, cursor: Dict[str, Any]) -> None:
+        checkpoint = self.db.query(ConnectorCheckpoint).filter(
+            ConnectorCheckpoint.source == source, ConnectorCheckpoint.scope == scope
+        ).first()
+        if checkpoint is None:
+            checkpoint = ConnectorCheckpoint(source=source, scope=scope)
+            self.db.add(checkpoint)
+        checkpoint.cursor_json = json.dumps(cursor, default=str)
+        self.db.commit()
+
+def retry_gmail_message(db: Session, item_id: str, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # The retry worker runs all due items on one session; they share one authorized service
+    service = db.info.get('gmail_service')
+    if service is None:
+        service = db.info['gmail_service'] = asyncio.run(GmailApiService.get_authenticated_service(db))
+    return [gmail_record(GmailApiService.fetch_message(service, item_id))]
+
+def retry_slack_channel(db: Session, item_id: str, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    messages = SlackOAuthService(db).get_channel_messages(
+        {'id': item_id, 'name': payload.get('name', item_id)}, payload.get('oldest', 0), settings.brief_connector_max_items
+    )
+    return [slack_record(message) for message in messages]
+
+# (source, kind) -> fetch a dead-lettered item again as event records; raises if it still fails
+RETRY_HANDLERS: Dict[Tuple[str, str], Callable[[Session, str, Dict[str, Any]], List[Dict[str, Any]]]] = {
+    ('gmail', 'message'): retry_gmail_message,
+    ('slack', 'channel'): retry_slack_channel,
+}
@@ -0,0 +1,188 @@
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.dead_letter import DeadLetter
+from app.services.event_ingest_service import EventIngestService
+from app.utils.resilience import SourceUnavailableError
+
+class DeadLetterService:
+    """Failed connector items and their retries - PRD Section 7.1 Dead letter queue
+
+    Connectors record an item (a Gmail message, a Slack channel's history,
+    ...) when fetching it fails instead of dropping it. The retry worker
+    fetches due items again through the connector's retry handler and ingests
+    the result; each failure doubles the delay up to dead_letter_backoff_max,
+    and after dead_letter_max_attempts the item is abandoned until replayed.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record(self, source: str, kind: str, item_id: str, error: str,
+               payload: Optional[Dict[str, Any]] = None) -> Optional[DeadLetter]:
+        """Add or refresh a failed item; never raises, so connectors can call it from error paths"""
+        try:
+            letter = self.db.query(DeadLetter).filter(
+                DeadLetter.source == source, DeadLetter.kind == kind, DeadLetter.item_id == str(item_id)
+            ).first()
+            if letter is None:
+                letter = DeadLetter(source=source, kind=kind, item_id=str(item_id), attempts=0, status='pending',
+                                    next_retry_at=self._next_retry(0))
+                self.db.add(letter)
+            elif letter.status == 'resolved':
+                # Failed again after an earlier recovery: start over
+                letter.status = 'pending'
+                letter.attempts = 0
+                letter.next_retry_at = self._next_retry(0)
+                letter.resolved_at = None
+
+            letter.error = error[:2000]
+            if payload is not None:
+                letter.payload_json = json.dumps(payload, default=str)
+            self.db.commit()
+            return letter
+        except Exception as e:
+            self.db.rollback()
+            print(f"Failed to record dead letter {source}/{kind}/{item_id}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _next_retry(attempts: int) -> datetime:
+        delay = min(settings.dead_letter_backoff_base * (2 ** attempts), settings.dead_letter_backoff_max)
+        # Jitter keeps items that failed together from retrying in one burst
+        return datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    def retry(self, letter: DeadLetter) -> bool:
+        """Fetch one item again and ingest it; returns whether it succeeded"""
+        # Imported here: the connector services import this module to record failures
+        from app.services.connector_service import RETRY_HANDLERS
+
+        attempted_at = datetime.utcnow()
+        letter.last_attempt_at = attempted_at
+        handler = RETRY_HANDLERS.get((letter.source, letter.kind))
+        try:
+            if handler is None:
+                raise ValueError(f"No retry handler for {letter.source}/{letter.kind}")
+            records = handler(self.db, letter.item_id, json.loads(letter.payload_json or "{}"))
+            EventIngestService(self.db).ingest(records)
+        except SourceUnavailableError as e:
+            # The source is down, not this item: wait for the circuit without using up an attempt
+            self.db.rollback()
+            # The rollback also undid the attempt time
+            letter.last_attempt_at = attempted_at
+            letter.error = str(e)
+            letter.next_retry_at = datetime.utcnow() + timedelta(seconds=max(e.retry_after, 1.0))
+            self.db.commit()
+            return False
+        except Exception as e:
+            self.db.rollback()
+            letter.last_attempt_at = attempted_at
+            letter.attempts = (letter.attempts or 0) + 1
+            letter.error = str(e)[:2000]
+            if letter.attempts >= settings.dead_letter_max_attempts:
+                letter.status = 'abandoned'
+                letter.next_retry_at = None
+            else:
+                letter.next_retry_at = self._next_retry(letter.attempts)
+            self.db.commit()
+            return False
+
+        letter.status = 'resolved'
+        letter.resolved_at = datetime.utcnow()
+        letter.next_retry_at = None
+        self.db.commit()
+        return True
+
+    def retry_due(self) -> Dict[str, int]:
+        """Retry pending items whose backoff has elapsed (retry worker)"""
+        due = self.db.query(DeadLetter).filter(
+            DeadLetter.status == 'pending', DeadLetter.next_retry_at <= datetime.utcnow()
+        ).order_by(DeadLetter.next_retry_at).limit(settings.dead_letter_batch_size).all()
+        return self._retry_all(due)
+
+    def replay(self, ids: Optional[List[int]] = None, source: Optional[str] = None,
+               status: Optional[str] = None) -> Dict[str, int]:
+        """Retry items now regardless of backoff, including abandoned ones (manual replay)"""
+        query = self.db.query(DeadLetter).filter(DeadLetter.status != 'resolved')
+        if ids:
+            query = query.filter(DeadLetter.id.in_(ids))
+        if source:
+            query = query.filter(DeadLetter.source == source)
+        if status:
+            query = query.filter(DeadLetter.status == status)
+
+        letters = query.order_by(DeadLetter.id).limit(settings.dead_letter_batch_size).all()
+        for letter in letters:
+            # A manual replay gets a fresh set of attempts
+            if letter.status == 'abandoned':
+                letter.status = 'pending'
+                letter.attempts = 0
+        self.db.commit()
+        return self._retry_all(letters)
+
+    def _retry_all(self, letters: List[DeadLetter]) -> Dict[str, int]:
+        stats = {"attempted": len(letters), "resolved": 0, "failed": 0, "abandoned": 0}
+        for letter in letters:
+            if self.retry(letter):
+                stats["resolved"] += 1
+            elif letter.status == 'abandoned':
+                stats["abandoned"] += 1
+            else:
+                stats["failed"] += 1
+        return stats
+
+    def list(self, status: Optional[str] = None, source: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        query = self.db.query(DeadLetter)
+        if status:
+            query = query.filter(DeadLetter.status == status)
+        if source:
+            query = query.filter(DeadLetter.source == source)
+        return [{
+            "id": letter.id,
+            "source": letter.source,
+            "kind": letter.kind,
+            "item_id": letter.item_id,
+            "status": letter.status,
+            "attempts": letter.attempts,
+            "error": letter.error,
+            "next_retry_at": letter.next_retry_at.isoformat() if letter.next_retry_at else None,
+            "last_attempt_at": letter.last_attempt_at.isoformat() if letter.last_attempt_at else None,
+            "created_at": letter.created_at.isoformat() if letter.created_at else None,
+        } for letter in query.order_by(DeadLetter.id.desc()).limit(limit)]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"pending": 0, "resolved": 0, "abandoned": 0}
+        for status, in self.db.query(DeadLetter.status):
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def purge_resolved(self, cutoff: datetime) -> int:
+        """Delete items resolved before cutoff (called by retention)"""
+        deleted = self.db.query(DeadLetter).filter(
+            DeadLetter.status == 'resolved', DeadLetter.resolved_at < cutoff
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
+
+def run_dead_letter_job() -> Dict[str, int]:
+    """Scheduled entry point - opens its own session"""
+    db = SessionLocal()
+    try:
+        return DeadLetterService(db).retry_due()
+    finally:
+        db.close()
+
+def run_dead_letter_replay(ids: Optional[List[int]] = None, source: Optional[str] = None,
+                           status: Optional[str] = None) -> Dict[str, int]:
+    """Manual replay on a session of its own - for the API, which runs it on a worker thread"""
+    db = SessionLocal()
+    try:
+        return DeadLetterService(db).replay(ids, source, status)
+    finally:
+        db.close()
@@ -0,0 +1,191 @@
+import json
+from typing import Dict, List, Set, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.events import Event
+from app.models.links import Link, EventUrl
+from app.services.near_duplicate_service import NearDuplicateService
+from app.utils.union_find import UnionFind
+from app.utils.url_canonicalizer import extract_urls, canonicalize_url, url_hash
+
+# raw_json fields that carry message bodies or deep links, per source
+RAW_TEXT_FIELDS = {
+    'gmail': ('body', 'snippet'),
+    'slack': ('text', 'permalink'),
+    'github': ('body', 'html_url'),
+}
+
+class DedupeService:
+    """Canonical URL dedupe engine - PRD Section 9 Dedupe rule (v1)
+
+    Events that share a canonical URL, or whose text is a SimHash near-duplicate,
+    end up in the same cluster (Event.cluster_id), and each cluster becomes one
+    card. Only the new events and the URL hashes they mention are touched, so a
+    batch costs O(new events) indexed lookups rather than a pairwise comparison
+    against the whole events table.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def process_events(self, events: List[Event]) -> Dict[str, int]:
+        """Index freshly ingested (flushed) events and merge them into existing clusters"""
+        stats = {"urls_indexed": 0, "links_created": 0, "near_duplicates": 0, "clusters_merged": 0}
+        if not events:
+            return stats
+
+        # Re-ingested events may already sit in a multi-member cluster, which has to move as a whole
+        prior_clusters = {event.cluster_id for event in events if event.cluster_id is not None}
+        for event in events:
+            if event.cluster_id is None:
+                event.cluster_id = event.id
+
+        # Edges: (event_id, related_event_id, related_cluster_id or None if in batch, reason, url_hash)
+        edges, stats["urls_indexed"] = self._url_edges(events)
+        if settings.near_duplicate_enabled:
+            near_duplicates = NearDuplicateService(self.db).find_duplicates(events)
+            edges.extend((event_id, related_id, cluster_id, 'simhash', None)
+                         for event_id, related_id, cluster_id in near_duplicates)
+            stats["near_duplicates"] = len(near_duplicates)
+
+        # Union-find over cluster ids; existing clusters are seeded with their sizes
+        events_by_id = {event.id: event for event in events}
+        existing_clusters = {cluster_id for _, _, cluster_id, _, _ in edges if cluster_id is not None} | prior_clusters
+        forest = UnionFind(self._cluster_sizes(existing_clusters))
+        for event in events:
+            forest.add(event.cluster_id)
+
+        # Pairs linked when an event was first ingested are not linked again on re-ingest
+        existing_links = set(
+            self.db.query(Link.event_id, Link.related_event_id).filter(Link.event_id.in_(list(events_by_id))).all()
+        )
+        links = set()
+        for event_id, related_id, related_cluster, reason, digest in edges:
+            if related_cluster is None:
+                related_cluster = events_by_id[related_id].cluster_id
+            forest.union(related_cluster, events_by_id[event_id].cluster_id)
+            if (event_id, related_id) not in links and (event_id, related_id) not in existing_links:
+                links.add((event_id, related_id))
+                self.db.add(Link(event_id=event_id, related_event_id=related_id, reason=reason, url_hash=digest))
+
+        stats["links_created"] = len(links)
+        stats["clusters_merged"] = self._apply_clusters(forest, events, existing_clusters)
+        return stats
+
+    def _url_edges(self, events: List[Event]) -> Tuple[List[tuple], int]:
+        """Index canonical URLs for the batch and pair each event with one holder of each URL"""
+        batch_ids = [event.id for event in events]
+        urls_by_event = {event.id: self._canonical_urls(event) for event in events}
+
+        # Re-ingested events replace their previous URL index rows
+        self.db.query(EventUrl).filter(EventUrl.event_id.in_(batch_ids)).delete(synchronize_session=False)
+
+        hashes: Dict[str, List[int]] = {}
+        for event in events:
+            own_url = canonicalize_url(event.url) if event.url else None
+            event.url_hash = url_hash(own_url) if own_url else None
+
+            for canonical_url, digest in urls_by_event[event.id]:
+                self.db.add(EventUrl(event_id=event.id, url_hash=digest, canonical_url=canonical_url))
+                hashes.setdefault(digest, []).append(event.id)
+
+        existing = self._existing_matches(list(hashes.keys()), batch_ids)
+
+        edges = []
+        for digest, member_ids in hashes.items():
+            match = existing.get(digest)
+            fanout = len(member_ids) + (match[2] if match else 0)
+            if fanout > settings.dedupe_max_url_fanout:
+                continue  # Boilerplate URL (footer, unsubscribe link) - not a topic signal
+
+            if match:
+                edges.extend((event_id, match[0], match[1], 'url', digest) for event_id in member_ids)
+            else:
+                edges.extend((event_id, member_ids[0], None, 'url', digest) for event_id in member_ids[1:])
+
+        return edges, sum(len(urls) for urls in urls_by_event.values())
+
+    def _canonical_urls(self, event: Event) -> List[Tuple[str, str]]:
+        """Canonical (url, hash) pairs referenced by an event, including its own deep link"""
+        texts = [event.url, event.title, event.snippet]
+        if event.raw_json:
+            try:
+                raw = json.loads(event.raw_json)
+            except (TypeError, ValueError):
+                raw = {}
+            if isinstance(raw, dict):
+                for field in RAW_TEXT_FIELDS.get(event.source, ()):
+                    if isinstance(raw.get(field), str):
+                        texts.append(raw[field])
+
+        result = {}
+        for text in texts:
+            for url in extract_urls(text):
+                canonical_url = canonicalize_url(url)
+                if canonical_url and self._is_specific(canonical_url):
+                    result.setdefault(canonical_url, url_hash(canonical_url))
+
+        return list(result.items())
+
+    @staticmethod
+    def _is_specific(canonical_url: str) -> bool:
+        """Bare homepages (https://example.com/) say nothing about the topic"""
+        remainder = canonical_url.split('://', 1)[-1]
+        return '/' in remainder.rstrip('/')
+
+    def _existing_matches(self, hashes: List[str], batch_ids: List[int]) -> Dict[str, Tuple[int, int, int]]:
+        """For each hash already indexed: (representative event id, its cluster id, fan-out)"""
+        if not hashes:
+            return {}
+
+        rows = (
+            self.db.query(
+                EventUrl.url_hash,
+                func.min(EventUrl.event_id),
+                func.min(Event.cluster_id),
+                func.count(EventUrl.id),
+            )
+            .join(Event, Event.id == EventUrl.event_id)
+            .filter(EventUrl.url_hash.in_(hashes), EventUrl.event_id.notin_(batch_ids))
+            .group_by(EventUrl.url_hash)
+            .all()
+        )
+
+        return {
+            digest: (event_id, cluster_id if cluster_id is not None else event_id, count)
+            for digest, event_id, cluster_id, count in rows
+        }
+
+    def _cluster_sizes(self, cluster_ids: Set[int]) -> Dict[int, int]:
+        if not cluster_ids:
+            return {}
+        rows = (
+            self.db.query(Event.cluster_id, func.count(Event.id))
+            .filter(Event.cluster_id.in_(cluster_ids))
+            .group_by(Event.cluster_id)
+            .all()
+        )
+        sizes = {cluster_id: 1 for cluster_id in cluster_ids}
+        sizes.update({cluster_id: count for cluster_id, count in rows})
+        return sizes
+
+    def _apply_clusters(self, forest: UnionFind, events: List[Event], existing_clusters: Set[int]) -> int:
+        """Write merged cluster roots back; returns how many clusters were absorbed"""
+        for cluster_id in existing_clusters:
+            root = forest.find(cluster_id)
+            if root != cluster_id:
+                # Union by size means this is always the smaller side of the merge
+                self.db.query(Event).filter(Event.cluster_id == cluster_id).update(
+                    {Event.cluster_id: root}, synchronize_session=False
+                )
+
+        for event in events:
+            event.cluster_id = forest.find(event.cluster_id)
+
+        return sum(1 for cluster_id in forest.parent if forest.find(cluster_id) != cluster_id)
+
+    def get_cluster_events(self, cluster_id: int) -> List[Event]:
+        """All events in a dedupe cluster, oldest first"""
+        return self.db.query(Event).filter(Event.cluster_id == cluster_id).order_by(Event.ts).all()
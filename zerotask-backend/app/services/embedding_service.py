@@ -0,0 +1,258 @@
+import os
+import re
+import json
+import math
+import asyncio
+import hashlib
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.events import Event
+from app.services.llm_service import get_llm_client
+from app.utils.union_find import UnionFind
+from app.utils.vector_index import VectorIndex
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9_\-\.]*[a-z0-9]|[a-z0-9]')
+_STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have i in is it its of on or our that the this to we was were will with you your'.split()
+)
+
+class EmbeddingProvider:
+    """Pluggable text embedding backend"""
+
+    name = "base"
+    dim = 0
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    def add_documents(self, texts: List[str]) -> None:
+        """Count texts about to be indexed for the first time (no-op for model backends)"""
+
+class OllamaEmbeddingProvider(EmbeddingProvider):
+    """Local Ollama embedding model - PRD Section 8 (LLM Option A)"""
+
+    def __init__(self, model: Optional[str] = None, dim: int = 0):
+        self.model = model or settings.ollama_embedding_model
+        self.name = f"ollama-{re.sub(r'[^a-zA-Z0-9_.-]', '_', self.model)}"
+        self.dim = dim
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        # Pooled connection shared with the LLM client
+        response = await get_llm_client().http.post(
+            "/api/embed",
+            json={"model": self.model, "input": texts, "keep_alive": settings.llm_keep_alive},
+            timeout=settings.embedding_timeout,
+        )
+        response.raise_for_status()
+        vectors = np.asarray(response.json()["embeddings"], dtype=np.float32)
+
+        self.dim = vectors.shape[1]
+        return vectors
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """CPU fallback: hashing-trick TF-IDF over unigrams and bigrams
+
+    Document frequencies are kept per hash bucket and persisted next to the
+    index. Only events indexed for the first time update them (add_documents);
+    embed() itself has no side effects, so probes and re-embeds do not skew IDF.
+    """
+
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim or settings.embedding_hashing_dim
+        self.name = f"hashing-{self.dim}"
+        self._df_file = os.path.join(settings.embedding_index_dir, self.name, 'df.npy')
+        self._lock = threading.Lock()
+        if os.path.exists(self._df_file):
+            stored = np.load(self._df_file)
+            self.doc_count, self.df = int(stored[0]), stored[1:]
+        else:
+            self.doc_count, self.df = 0, np.zeros(self.dim, dtype=np.float64)
+
+    def _features(self, text: str) -> Counter:
+        tokens = [token for token in _TOKEN.findall(text.lower()) if token not in _STOP_WORDS]
+        return Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+
+    def _bucket(self, feature: str):
+        digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'little')
+        # Low bits pick the bucket, the top bit picks the sign (reduces collision bias)
+        return digest % self.dim, (1.0 if digest >> 63 else -1.0)
+
+    def _row(self, text: str) -> Dict[int, float]:
+        row: Dict[int, float] = {}
+        for feature, count in self._features(text).items():
+            bucket, sign = self._bucket(feature)
+            row[bucket] = row.get(bucket, 0.0) + sign * (1.0 + math.log(count))
+        return row
+
+    def add_documents(self, texts: List[str]) -> None:
+        rows = [self._row(text) for text in texts]
+        with self._lock:
+            for row in rows:
+                for bucket in row:
+                    self.df[bucket] += 1
+            self.doc_count += len(rows)
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        # Tokenizing and hashing is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self._embed, texts)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        rows = [self._row(text) for text in texts]
+        with self._lock:
+            idf = np.log((1.0 + self.doc_count) / (1.0 + self.df)) + 1.0
+
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, row in enumerate(rows):
+            if row:
+                buckets = np.fromiter(row.keys(), dtype=np.int64, count=len(row))
+                vectors[i, buckets] = np.fromiter(row.values(), dtype=np.float32, count=len(row)) * idf[buckets]
+        return vectors
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self._df_file), exist_ok=True)
+        with self._lock:
+            np.save(self._df_file, np.concatenate([[self.doc_count], self.df]))
+
+_provider: Optional[EmbeddingProvider] = None
+_indexes: Dict[str, VectorIndex] = {}
+_state_lock = threading.Lock()
+
+async def get_embedding_provider() -> EmbeddingProvider:
+    """Resolve the configured provider once per process ('auto' probes Ollama first)"""
+    global _provider
+    if _provider is not None:
+        return _provider
+
+    choice = settings.embedding_provider
+    provider: EmbeddingProvider
+    if choice in ('ollama', 'auto'):
+        provider = OllamaEmbeddingProvider()
+        try:
+            await provider.embed(["zerotask"])
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            if choice == 'ollama':
+                raise ValueError(f"Ollama embedding model unavailable: {str(e)}")
+            print(f"Ollama embeddings unavailable ({str(e)}), using hashing fallback")
+            provider = HashingEmbeddingProvider()
+    else:
+        provider = HashingEmbeddingProvider()
+
+    _provider = provider
+    return provider
+
+def get_vector_index(provider: EmbeddingProvider) -> VectorIndex:
+    """One index per provider/model, since vectors from different models are not comparable"""
+    with _state_lock:
+        if provider.name not in _indexes:
+            _indexes[provider.name] = VectorIndex(settings.embedding_index_dir, provider.name, provider.dim)
+        return _indexes[provider.name]
+
+class EmbeddingService:
+    """Semantic grouping of events across sources - PRD Goal: one card per topic"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def event_text(event: Event) -> str:
+        return f"{event.title or ''}\n{event.snippet or ''}"[:settings.embedding_max_chars]
+
+    async def index_events(self, events: List[Event]) -> Dict[str, int]:
+        """Embed events in batches and upsert them into the vector index"""
+        if not events:
+            return {"embedded": 0}
+
+        provider = await get_embedding_provider()
+        index = get_vector_index(provider)
+        batch_size = max(1, settings.embedding_batch_size)
+
+        for start in range(0, len(events), batch_size):
+            batch = events[start:start + batch_size]
+            texts = [self.event_text(event) for event in batch]
+            # Re-embedding an updated event must not count it as another document
+            await asyncio.to_thread(provider.add_documents, [text for event, text in zip(batch, texts) if event.id not in index])
+            vectors = await provider.embed(texts)
+            index.add([event.id for event in batch], vectors)
+
+        index.save()
+        if isinstance(provider, HashingEmbeddingProvider):
+            provider.save()
+
+        return {"embedded": len(events), "index_size": len(index)}
+
+    async def index_ingested(self, event_ids: List[int]) -> Dict[str, int]:
+        """Index events an ingest inserted or changed; never raises, so ingest callers can await it last"""
+        if not event_ids:
+            return {"embedded": 0}
+        try:
+            events = []
+            for start in range(0, len(event_ids), 900):
+                events.extend(self.db.query(Event).filter(Event.id.in_(event_ids[start:start + 900])).all())
+            return await self.index_events(events)
+        except Exception as e:
+            print(f"Embedding ingested events failed: {str(e)}")
+            return {"embedded": 0, "error": str(e)}
+
+    async def index_missing(self, events: List[Event]) -> Dict[str, int]:
+        """Index events not in the index yet (e.g. ingested by dead letter retries)"""
+        index = get_vector_index(await get_embedding_provider())
+        return await self.index_events([event for event in events if event.id not in index])
+
+    async def find_related(self, event_ids: List[int], k: int = 10, min_score: Optional[float] = None) -> Dict[int, List[tuple]]:
+        """Top-k most similar indexed events per event id: {event_id: [(related_id, score), ...]}"""
+        provider = await get_embedding_provider()
+        index = get_vector_index(provider)
+        found, vectors = index.get(event_ids)
+        if not found:
+            return {}
+
+        threshold = settings.embedding_group_threshold if min_score is None else min_score
+        neighbor_ids, scores = index.search(vectors, k + 1)
+
+        related: Dict[int, List[tuple]] = {}
+        for event_id, row_ids, row_scores in zip(found, neighbor_ids, scores):
+            related[event_id] = [
+                (int(other), float(score)) for other, score in zip(row_ids, row_scores)
+                if other >= 0 and other != event_id and score >= threshold
+            ][:k]
+        return related
+
+    async def group_events(self, event_ids: List[int], min_score: Optional[float] = None) -> List[List[int]]:
+        """Partition the given events into topic groups (connected components above min_score)"""
+        related = await self.find_related(event_ids, min_score=min_score)
+        wanted = set(event_ids)
+        forest = UnionFind()
+        for event_id in event_ids:
+            forest.add(event_id)
+        for event_id, neighbors in related.items():
+            for other, _ in neighbors:
+                if other in wanted:
+                    forest.union(event_id, other)
+
+        return sorted(forest.groups().values(), key=len, reverse=True)
+
+    def remove_events(self, event_ids: List[int]) -> int:
+        """Drop deleted events from every on-disk index (used by retention)"""
+        if not event_ids or not os.path.isdir(settings.embedding_index_dir):
+            return 0
+
+        removed = 0
+        for name in sorted(os.listdir(settings.embedding_index_dir)):
+            meta_file = os.path.join(settings.embedding_index_dir, name, 'meta.json')
+            if not os.path.exists(meta_file):
+                continue
+            with _state_lock:
+                if name not in _indexes:
+                    with open(meta_file) as f:
+                        _indexes[name] = VectorIndex(settings.embedding_index_dir, name, json.load(f)['dim'])
+                index = _indexes[name]
+            removed += index.remove(event_ids)
+            index.save()
+        return removed
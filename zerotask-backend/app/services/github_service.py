@@ -0,0 +1,292 @@
+import time
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.services.shared_auth_service import SharedAuthService
+from app.utils.resilience import http_request, SourceUnavailableError
+
+# Assigned issues/PRs and review requests in one document; a search is left out
+# (@include) once its pages are exhausted, so pagination never re-fetches it
+SEARCH_QUERY = """
+query($assigned: String!, $reviews: String!, $first: Int!, $assignedCursor: String, $reviewsCursor: String,
+      $withAssigned: Boolean!, $withReviews: Boolean!) {
+  rateLimit { cost remaining limit resetAt }
+  assigned: search(type: ISSUE, query: $assigned, first: $first, after: $assignedCursor) @include(if: $withAssigned) {
+    pageInfo { hasNextPage endCursor }
+    nodes { ...Item }
+  }
+  reviews: search(type: ISSUE, query: $reviews, first: $first, after: $reviewsCursor) @include(if: $withReviews) {
+    pageInfo { hasNextPage endCursor }
+    nodes { ...Item }
+  }
+}
+
+fragment Item on SearchResultItem {
+  ... on Issue {
+    number title url bodyText state createdAt updatedAt
+    author { login }
+    repository { nameWithOwner }
+    assignees(first: 10) { nodes { login } }
+    labels(first: 10) { nodes { name } }
+    comments { totalCount }
+  }
+  ... on PullRequest {
+    number title url bodyText state createdAt updatedAt
+    author { login }
+    repository { nameWithOwner }
+    assignees(first: 10) { nodes { login } }
+    labels(first: 10) { nodes { name } }
+    comments { totalCount }
+    isDraft reviewDecision mergeable additions deletions changedFiles headRefOid headRefName baseRefName
+    reviewRequests(first: 10) { nodes { requestedReviewer { ... on User { login } ... on Team { name } } } }
+  }
+}
+"""
+
+SEARCHES = ('assigned', 'reviews')
+
+# File-level stats only: no patches, so even a 500-file PR is a few small pages
+PR_FILES_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $first: Int!, $cursor: String) {
+  rateLimit { cost remaining limit resetAt }
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      headRefOid
+      files(first: $first, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes { path additions deletions changeType }
+      }
+    }
+  }
+}
+"""
+
+class GitHubRateLimits:
+    """Rate-limit headroom per GitHub API resource (graphql, core), from response headers and GraphQL rateLimit
+
+    Calls are refused with SourceUnavailableError while a resource is below
+    github_rate_limit_reserve, until its window resets.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limits: Dict[str, Dict[str, Any]] = {}
+
+    def update(self, resource: str, remaining: Any, limit: Any, reset_at: Optional[float], cost: Optional[int] = None) -> None:
+        if remaining is None:
+            return
+        with self._lock:
+            self._limits[resource] = {
+                "remaining": int(remaining),
+                "limit": int(limit) if limit is not None else None,
+                "reset_at": reset_at,
+                "last_cost": cost,
+            }
+
+    def update_from_headers(self, headers: Any) -> None:
+        reset = headers.get("x-ratelimit-reset")
+        self.update(
+            headers.get("x-ratelimit-resource", "core"),
+            headers.get("x-ratelimit-remaining"),
+            headers.get("x-ratelimit-limit"),
+            float(reset) if reset else None,
+        )
+
+    def check(self, resource: str) -> None:
+        with self._lock:
+            state = self._limits.get(resource)
+        if not state or state["remaining"] > settings.github_rate_limit_reserve:
+            return
+        retry_after = (state["reset_at"] or 0) - time.time()
+        if retry_after > 0:
+            raise SourceUnavailableError('github', resource, retry_after, reason="rate limit reserve reached")
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                resource: {**state, "reset_at": datetime.utcfromtimestamp(state["reset_at"]).isoformat() if state["reset_at"] else None}
+                for resource, state in self._limits.items()
+            }
+
+# Global rate-limit state shared by every GitHub caller
+github_rate_limits = GitHubRateLimits()
+
+def repo_sets() -> Dict[str, List[str]]:
+    """Stable id -> repos for each batch of followed repos ("all" when none are configured)"""
+    repos = sorted({repo.strip().lower() for repo in settings.github_repos if repo.strip()})
+    if not repos:
+        return {"all": []}
+    size = max(1, settings.github_repos_per_query)
+    batches = [repos[start:start + size] for start in range(0, len(repos), size)]
+    return {f"repos:{hashlib.sha1(','.join(batch).encode()).hexdigest()[:12]}": batch for batch in batches}
+
+class GitHubService:
+    """GitHub ingestion with the IT-managed service account token - PRD Section 8
+
+    Assigned issues/PRs, review requests and the PR details the brief needs
+    come from one paginated GraphQL document per batch of repos. Notifications
+    are polled over REST with If-Modified-Since, so an unchanged poll is a 304
+    that does not count against the rate limit, and X-Poll-Interval is honored.
+    """
+
+    def __init__(self):
+        self.token = SharedAuthService.get_github_token()
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+
+    def graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a GraphQL query and record the rate-limit cost it reports"""
+        github_rate_limits.check("graphql")
+        response = http_request(
+            'github', 'graphql', 'POST', f"{settings.github_api_url}/graphql",
+            headers=self._headers(), json={"query": query, "variables": variables},
+        )
+        github_rate_limits.update_from_headers(response.headers)
+        if response.status_code != 200:
+            raise ValueError(f"GitHub GraphQL error {response.status_code}: {response.text[:200]}")
+
+        payload = response.json()
+        data = payload.get("data")
+        if payload.get("errors") and not data:
+            raise ValueError(f"GitHub GraphQL error: {payload['errors'][0].get('message')}")
+
+        rate = (data or {}).get("rateLimit")
+        if rate:
+            reset_at = datetime.fromisoformat(rate["resetAt"].replace("Z", "+00:00")).timestamp()
+            github_rate_limits.update("graphql", rate["remaining"], rate["limit"], reset_at, rate["cost"])
+        return data or {}
+
+    def search_items(self, repos: List[str], since: datetime) -> List[Dict[str, Any]]:
+        """Open issues/PRs assigned to the user or awaiting their review, updated since `since`"""
+        updated = since.replace(tzinfo=timezone.utc, microsecond=0).isoformat().replace("+00:00", "Z")
+        qualifiers = f"is:open updated:>={updated} archived:false " + " ".join(f"repo:{repo}" for repo in repos)
+        variables: Dict[str, Any] = {
+            "assigned": f"assignee:@me {qualifiers}".strip(),
+            "reviews": f"is:pr review-requested:@me {qualifiers}".strip(),
+            "first": settings.github_page_size,
+            "assignedCursor": None,
+            "reviewsCursor": None,
+            "withAssigned": True,
+            "withReviews": True,
+        }
+
+        items: Dict[str, Dict[str, Any]] = {}
+        for _ in range(settings.github_max_pages):
+            data = self.graphql(SEARCH_QUERY, variables)
+            for search in SEARCHES:
+                result = data.get(search)
+                if not result:
+                    continue
+                for node in result["nodes"]:
+                    if not node:
+                        continue
+                    key = f"{node['repository']['nameWithOwner']}#{node['number']}"
+                    item = items.setdefault(key, {**node, "reasons": []})
+                    item["reasons"].append("assigned" if search == "assigned" else "review_requested")
+
+                page = result["pageInfo"]
+                variables[f"{search}Cursor"] = page["endCursor"]
+                variables[f"with{search.capitalize()}"] = page["hasNextPage"]
+            if not (variables["withAssigned"] or variables["withReviews"]):
+                break
+        return list(items.values())
+
+    def get_notifications(self, since: datetime, state: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Unread notification threads, or [] when nothing changed since the last poll (304)
+
+        `state` (the scope's checkpoint cursor) carries the previous 200's
+        Last-Modified and the time X-Poll-Interval allows the next poll, and
+        is updated in place, so both survive a restart.
+        """
+        state = state if state is not None else {}
+        if time.time() < state.get("poll_after", 0.0):
+            return []
+
+        headers = self._headers()
+        params: Dict[str, Any] = {"per_page": 50}
+        if state.get("last_modified"):
+            # Same URL on every poll so the conditional request can match
+            headers["If-Modified-Since"] = state["last_modified"]
+        else:
+            params["since"] = since.replace(tzinfo=timezone.utc, microsecond=0).isoformat().replace("+00:00", "Z")
+
+        github_rate_limits.check("core")
+        response = http_request(
+            'github', 'notifications', 'GET', f"{settings.github_api_url}/notifications", headers=headers, params=params,
+        )
+        github_rate_limits.update_from_headers(response.headers)
+        poll_interval = response.headers.get("x-poll-interval")
+        if poll_interval:
+            state["poll_after"] = time.time() + int(poll_interval)
+
+        if response.status_code == 304:
+            return []
+        if response.status_code != 200:
+            raise ValueError(f"GitHub notifications error {response.status_code}: {response.text[:200]}")
+        if response.headers.get("last-modified"):
+            state["last_modified"] = response.headers["last-modified"]
+        return response.json()
+
+    def get_pr_files(self, repo: str, number: int) -> Tuple[str, List[Dict[str, Any]]]:
+        """Head SHA and per-file stats (path, additions, deletions, changeType) of a PR, page by page"""
+        owner, name = repo.split('/', 1)
+        variables: Dict[str, Any] = {
+            "owner": owner, "name": name, "number": number, "first": settings.github_files_page_size, "cursor": None,
+        }
+        head_sha, files = "", []
+        for _ in range(settings.github_files_max_pages):
+            pull = ((self.graphql(PR_FILES_QUERY, variables).get("repository") or {}).get("pullRequest"))
+            if pull is None:
+                raise ValueError(f"Pull request {repo}#{number} not found")
+            head_sha = pull["headRefOid"]
+            files.extend(node for node in pull["files"]["nodes"] if node)
+            page = pull["files"]["pageInfo"]
+            if not page["hasNextPage"]:
+                break
+            variables["cursor"] = page["endCursor"]
+        return head_sha, files
+
+    def get_pr_patches(self, repo: str, number: int, positions: Dict[str, int]) -> Dict[str, str]:
+        """Patches of the files at the given positions in the PR's file list
+
+        GitHub has no per-file patch endpoint, so only the REST files pages that
+        hold the wanted positions are fetched, with github_patch_page_size kept
+        small to limit the unwanted patches that come along. The REST order
+        normally matches the GraphQL list the positions come from; a path not on
+        its page is looked for one page either side, and left out if still not
+        found.
+        """
+        per_page = max(1, settings.github_patch_page_size)
+        expected = {path: position // per_page + 1 for path, position in positions.items()}
+        patches: Dict[str, str] = {}
+        fetched: Set[int] = set()
+
+        def fetch(pages: Set[int]) -> None:
+            for page in sorted(pages - fetched):
+                fetched.add(page)
+                github_rate_limits.check("core")
+                response = http_request(
+                    'github', 'pulls.files', 'GET', f"{settings.github_api_url}/repos/{repo}/pulls/{number}/files",
+                    headers=self._headers(), params={"per_page": per_page, "page": page},
+                )
+                github_rate_limits.update_from_headers(response.headers)
+                if response.status_code != 200:
+                    raise ValueError(f"GitHub files error {response.status_code}: {response.text[:200]}")
+                for item in response.json():
+                    if item.get("filename") in positions:
+                        # Binary and very large files come without a patch
+                        patches[item["filename"]] = item.get("patch") or ""
+
+        fetch(set(expected.values()))
+        missing = [path for path in positions if path not in patches]
+        if missing:
+            fetch({expected[path] + offset for path in missing for offset in (-1, 1) if expected[path] + offset >= 1})
+        return patches
@@ -20,32 +20,67 @@ from typing import Optional, List, Dict, Any, Tuple
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-import httpx
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
 from sqlalchemy.orm import Session
 
 from app.services.gmail_oauth_service import GmailOAuthService
+from app.services.dead_letter_service import DeadLetterService
+from app.utils.resilience import circuit_breakers, call_timeout, SourceUnavailableError
 
 
 class GmailApiService:
     """Gmail API service for email reading and draft creation - PRD Section 8"""
+
+    BATCH_SIZE = 20  # messages.get per batch request (5 quota units each)
     
     @staticmethod
     async def get_authenticated_service(db: Session):
         """Get authenticated Gmail API service"""
-        credentials = await GmailOAuthService.get_valid_credentials(db)
+        credentials = GmailOAuthService(db).get_valid_credentials()
         
         if not credentials:
             raise ValueError("Gmail not authenticated. Please complete OAuth flow first.")
         
         try:
-            service = build('gmail', 'v1', credentials=credentials)
+            # Initial socket timeout; _execute narrows it to what is left of the deadline before each call
+            http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=call_timeout()))
+            service = build('gmail', 'v1', http=http)
             return service
         except Exception as e:
             raise ValueError(f"Failed to build Gmail service: {str(e)}")
     
+    @staticmethod
+    def _apply_timeout(http: AuthorizedHttp, timeout: float) -> None:
+        """Set the socket timeout for the next call, including kept-alive connections opened earlier"""
+        http.http.timeout = timeout
+        for connection in http.http.connections.values():
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+
+    @staticmethod
+    def _execute(endpoint: str, request) -> Dict[str, Any]:
+        """Execute an API request through the Gmail endpoint's circuit breaker, timed out by the caller's deadline"""
+        def send(timeout: float) -> Dict[str, Any]:
+            GmailApiService._apply_timeout(request.http, timeout)
+            return request.execute()
+
+        return circuit_breakers.call('gmail', endpoint, send)
+
+    @staticmethod
+    def _execute_batch(endpoint: str, batch: BatchHttpRequest, http: AuthorizedHttp) -> None:
+        """Execute a batch request like _execute; per-request errors go to the batch callback"""
+        def send(timeout: float) -> None:
+            GmailApiService._apply_timeout(http, timeout)
+            batch.execute(http=http)
+
+        circuit_breakers.call('gmail', endpoint, send)
+    
     @staticmethod
     async def get_user_profile(db: Session) -> Dict[str, Any]:
         """
@@ -57,7 +92,7 @@ class GmailApiService:
         try:
             service = await GmailApiService.get_authenticated_service(db)
             
-            profile = service.users().getProfile(userId='me').execute()
+            profile = GmailApiService._execute('users.getProfile', service.users().getProfile(userId='me'))
             
             return {
                 "email_address": profile.get('emailAddress'),
@@ -106,33 +141,103 @@ class GmailApiService:
                 list_params['labelIds'] = label_ids
                 
             # Get message list
-            messages_result = service.users().messages().list(**list_params).execute()
+            messages_result = GmailApiService._execute('messages.list', service.users().messages().list(**list_params))
             messages = messages_result.get('messages', [])
             
             # Fetch detailed information for each message
             detailed_messages = []
             for message in messages:
                 try:
-                    msg = service.users().messages().get(
+                    msg = GmailApiService._execute('messages.get', service.users().messages().get(
                         userId='me',
                         id=message['id'],
                         format='full'
-                    ).execute()
+                    ))
                     
                     parsed_message = GmailApiService._parse_message(msg)
                     detailed_messages.append(parsed_message)
                     
                 except HttpError as e:
                     print(f"Error fetching message {message['id']}: {e}")
+                    DeadLetterService(db).record('gmail', 'message', message['id'], str(e))
                     continue
             
             return detailed_messages
             
+        except SourceUnavailableError:
+            raise
         except HttpError as e:
             raise ValueError(f"Gmail API error: {e}")
         except Exception as e:
             raise ValueError(f"Error getting recent messages: {str(e)}")
     
+    @staticmethod
+    async def list_message_ids(
+        db: Session,
+        max_results: int = 50,
+        query: Optional[str] = None,
+        label_ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """Ids of matching messages, newest first (fetch each with get_message)"""
+        try:
+            service = await GmailApiService.get_authenticated_service(db)
+            list_params = {'userId': 'me', 'maxResults': max_results, 'includeSpamTrash': False}
+            if query:
+                list_params['q'] = query
+            if label_ids:
+                list_params['labelIds'] = label_ids
+            
+            messages_result = GmailApiService._execute('messages.list', service.users().messages().list(**list_params))
+            return [message['id'] for message in messages_result.get('messages', [])]
+            
+        except HttpError as e:
+            raise ValueError(f"Gmail API error: {e}")
+    
+    @staticmethod
+    def fetch_message(service, message_id: str) -> Dict[str, Any]:
+        """One Gmail message by id on an already authorized service"""
+        try:
+            msg = GmailApiService._execute('messages.get', service.users().messages().get(userId='me', id=message_id, format='full'))
+            return GmailApiService._parse_message(msg)
+
+        except HttpError as e:
+            raise ValueError(f"Gmail API error: {e}")
+
+    @staticmethod
+    async def get_message(db: Session, message_id: str) -> Dict[str, Any]:
+        """Get one Gmail message by id"""
+        service = await GmailApiService.get_authenticated_service(db)
+        return GmailApiService.fetch_message(service, message_id)
+
+    @staticmethod
+    async def get_messages(db: Session, message_ids: List[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """Many messages on one authorized connection, BATCH_SIZE per batch request
+
+        Returns (parsed message by id, error by id); a failed batch as a whole raises.
+        """
+        service = await GmailApiService.get_authenticated_service(db)
+        messages: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+
+        def collect(message_id: str, response: Optional[Dict[str, Any]], exception: Optional[Exception]) -> None:
+            if exception is not None:
+                errors[message_id] = f"Gmail API error: {exception}"
+                return
+            try:
+                messages[message_id] = GmailApiService._parse_message(response)
+            except Exception as e:
+                errors[message_id] = f"Error parsing message: {str(e)}"
+
+        for start in range(0, len(message_ids), GmailApiService.BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=collect)
+            http = None
+            for message_id in message_ids[start:start + GmailApiService.BATCH_SIZE]:
+                request = service.users().messages().get(userId='me', id=message_id, format='full')
+                http = request.http
+                batch.add(request, request_id=message_id)
+            GmailApiService._execute_batch('messages.get', batch, http)
+        return messages, errors
+
     @staticmethod
     async def get_today_messages(db: Session, max_results: int = 50) -> List[Dict[str, Any]]:
         """
@@ -211,11 +316,11 @@ class GmailApiService:
         try:
             service = await GmailApiService.get_authenticated_service(db)
             
-            thread = service.users().threads().get(
+            thread = GmailApiService._execute('threads.get', service.users().threads().get(
                 userId='me',
                 id=thread_id,
                 format='full'
-            ).execute()
+            ))
             
             messages = []
             for msg in thread.get('messages', []):
@@ -337,11 +442,11 @@ class GmailApiService:
             service = await GmailApiService.get_authenticated_service(db)
             
             # Get original message for reply context
-            original_msg = service.users().messages().get(
+            original_msg = GmailApiService._execute('messages.get', service.users().messages().get(
                 userId='me',
                 id=message_id,
                 format='full'
-            ).execute()
+            ))
             
             original_headers = {
                 h['name'].lower(): h['value'] 
@@ -373,10 +478,10 @@ class GmailApiService:
                 }
             }
             
-            draft = service.users().drafts().create(
+            draft = GmailApiService._execute('drafts.create', service.users().drafts().create(
                 userId='me',
                 body=draft_message
-            ).execute()
+            ))
             
             return {
                 'success': True,
@@ -434,7 +539,7 @@ class GmailApiService:
         try:
             service = await GmailApiService.get_authenticated_service(db)
             
-            labels_result = service.users().labels().list(userId='me').execute()
+            labels_result = GmailApiService._execute('labels.list', service.users().labels().list(userId='me'))
             labels = labels_result.get('labels', [])
             
             return [
@@ -3,13 +3,17 @@ import json
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
+from google.auth import exceptions as google_auth_exceptions
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import Flow
 from google.oauth2.credentials import Credentials
 
 from app.models.tokens import OAuthToken
 from app.config import settings
+from app.database import SessionLocal
 from app.utils.encryption import token_encryption
+from app.utils.token_cache import token_cache
+from app.utils.refresh_coordinator import refresh_coordinator
 
 class GmailOAuthService:
     """Gmail OAuth 2.0 service for secure token management - PRD Section 8"""
@@ -129,52 +133,122 @@ class GmailOAuthService:
                 self.db.add(new_token)
             
             self.db.commit()
+            token_cache.invalidate('oauth:gmail')
             
         except Exception as e:
             self.db.rollback()
             raise ValueError(f"Failed to store OAuth tokens: {str(e)}")
     
     def get_valid_credentials(self) -> Optional[Credentials]:
-        """Get valid Gmail credentials, refreshing if necessary - PRD Section 8"""
-        token_record = self.db.query(OAuthToken).filter(
-            OAuthToken.provider == 'gmail',
-            OAuthToken.is_active == True
-        ).first()
+        """Get valid Gmail credentials, refreshing if necessary - PRD Section 8
+        
+        Tokens close to expiry are refreshed on a background thread while the
+        current token is still returned; only an expired token makes the caller
+        wait, and then on the single in-flight refresh shared by all callers.
+        """
+        cached = token_cache.get('oauth:gmail')
+        if cached:
+            secrets, metadata = cached
+            credentials = self._build_credentials(
+                secrets['access_token'], secrets.get('refresh_token'), metadata['scope'], metadata['expires_at']
+            )
+        else:
+            version = token_cache.version('oauth:gmail')
+            token_record = self._get_active_token()
+            if not token_record:
+                return None
+            credentials = self._decrypt_credentials(token_record)
+            self._cache_credentials(credentials, token_record.scope, version)
         
+        if not credentials.refresh_token or not credentials.expiry:
+            return credentials
+        
+        remaining = (credentials.expiry - datetime.utcnow()).total_seconds()
+        if remaining <= settings.token_expiry_margin:
+            return refresh_coordinator.run('gmail', self.refresh_credentials)
+        if remaining <= settings.token_refresh_ahead:
+            refresh_coordinator.run_in_background('gmail', refresh_gmail_token)
+        return credentials
+    
+    def refresh_credentials(self, force: bool = False) -> Optional[Credentials]:
+        """Refresh the stored token - call through refresh_coordinator so only one refresh runs"""
+        retry_at = refresh_coordinator.retry_at('gmail')
+        if retry_at:
+            raise ValueError(f"Gmail token refresh is backing off until {retry_at.isoformat()}")
+        
+        token_record = self._get_active_token()
         if not token_record:
             return None
         
+        credentials = self._decrypt_credentials(token_record)
+        if not credentials.refresh_token:
+            return credentials
+        if not force and credentials.expiry and \
+                (credentials.expiry - datetime.utcnow()).total_seconds() > settings.token_refresh_ahead:
+            # Already refreshed by another worker
+            return credentials
+        
+        try:
+            credentials.refresh(Request())
+        except Exception as e:
+            if _is_transient_refresh_error(e):
+                retry_at = refresh_coordinator.record_failure('gmail')
+                raise ValueError(f"Gmail token refresh failed, retrying after {retry_at.isoformat()}: {str(e)}")
+            # Revoked or invalid grant: the user has to reconnect
+            self._deactivate_token(token_record)
+            raise ValueError(f"Failed to refresh Gmail token: {str(e)}")
+        
+        self._update_refreshed_token(token_record, credentials)
+        refresh_coordinator.record_success('gmail')
+        self._cache_credentials(credentials, token_record.scope, token_cache.version('oauth:gmail'))
+        return credentials
+    
+    def _get_active_token(self) -> Optional[OAuthToken]:
+        # populate_existing: another session may have refreshed the row since it was loaded
+        return self.db.query(OAuthToken).populate_existing().filter(
+            OAuthToken.provider == 'gmail',
+            OAuthToken.is_active == True
+        ).first()
+    
+    def _decrypt_credentials(self, token_record: OAuthToken) -> Credentials:
         try:
-            # Decrypt tokens
             access_token = token_encryption.decrypt_token(token_record.encrypted_access_token)
             refresh_token = None
             if token_record.encrypted_refresh_token:
                 refresh_token = token_encryption.decrypt_token(token_record.encrypted_refresh_token)
-            
-            # Create credentials object
-            credentials = Credentials(
-                token=access_token,
-                refresh_token=refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=settings.google_client_id,
-                client_secret=settings.google_client_secret,
-                scopes=token_record.scope.split(' ') if token_record.scope else self.SCOPES
-            )
-            
-            # Check if token needs refresh
-            if credentials.expired and credentials.refresh_token:
-                credentials.refresh(Request())
-                
-                # Update stored tokens with refreshed values
-                self._update_refreshed_token(token_record, credentials)
-            
-            return credentials
-            
         except Exception as e:
-            # Mark token as inactive if decryption/refresh fails
-            token_record.is_active = False
-            self.db.commit()
+            # Mark token as inactive if decryption fails
+            self._deactivate_token(token_record)
             raise ValueError(f"Failed to get valid credentials: {str(e)}")
+        
+        return self._build_credentials(access_token, refresh_token, token_record.scope, token_record.expires_at)
+    
+    def _cache_credentials(self, credentials: Credentials, scope: Optional[str], version: int) -> None:
+        token_cache.put(
+            'oauth:gmail',
+            {'access_token': credentials.token, 'refresh_token': credentials.refresh_token},
+            expires_at=credentials.expiry,
+            version=version,
+            metadata={'scope': scope, 'expires_at': credentials.expiry},
+        )
+    
+    def _deactivate_token(self, token_record: OAuthToken) -> None:
+        token_record.is_active = False
+        self.db.commit()
+        token_cache.invalidate('oauth:gmail')
+    
+    def _build_credentials(self, access_token: str, refresh_token: Optional[str], scope: Optional[str],
+                           expires_at: Optional[datetime]) -> Credentials:
+        """Credentials object from decrypted tokens (expiry is naive UTC, as google-auth expects)"""
+        return Credentials(
+            token=access_token,
+            refresh_token=refresh_token,
+            token_uri="https://oauth2.googleapis.com/token",
+            client_id=settings.google_client_id,
+            client_secret=settings.google_client_secret,
+            scopes=scope.split(' ') if scope else self.SCOPES,
+            expiry=expires_at.replace(tzinfo=None) if expires_at else None
+        )
     
     def _update_refreshed_token(self, token_record: OAuthToken, credentials: Credentials) -> None:
         """Update database with refreshed token - PRD Section 8"""
@@ -191,6 +265,7 @@ class GmailOAuthService:
             token_record.updated_at = datetime.now(timezone.utc)
             
             self.db.commit()
+            token_cache.invalidate('oauth:gmail')
             
         except Exception as e:
             self.db.rollback()
@@ -212,6 +287,7 @@ class GmailOAuthService:
             if token_record:
                 self.db.delete(token_record)
                 self.db.commit()
+            token_cache.invalidate('oauth:gmail')
             
             return True
             
@@ -257,4 +333,40 @@ class GmailOAuthService:
                 'status': 'Connection error',
                 'scopes': None,
                 'expires_at': None
-            }
\ No newline at end of file
+            }
+
+def _is_transient_refresh_error(error: Exception) -> bool:
+    """Network errors and retryable token endpoint responses (5xx) are worth retrying"""
+    if isinstance(error, google_auth_exceptions.TransportError):
+        return True
+    if isinstance(error, google_auth_exceptions.RefreshError):
+        return bool(getattr(error, 'retryable', False))
+    return False
+
+def refresh_gmail_token(force: bool = False) -> Optional[Credentials]:
+    """Refresh entry point for background threads - opens its own session"""
+    db = SessionLocal()
+    try:
+        return GmailOAuthService(db).refresh_credentials(force=force)
+    finally:
+        db.close()
+
+def run_token_refresh_job() -> None:
+    """Scheduled job: refresh the Gmail token ahead of expiry"""
+    db = SessionLocal()
+    try:
+        expires_at = db.query(OAuthToken.expires_at).filter(
+            OAuthToken.provider == 'gmail',
+            OAuthToken.is_active == True,
+            OAuthToken.encrypted_refresh_token.isnot(None)
+        ).scalar()
+    finally:
+        db.close()
+    
+    if not expires_at or refresh_coordinator.retry_at('gmail'):
+        return
+    if (expires_at.replace(tzinfo=None) - datetime.utcnow()).total_seconds() <= settings.token_refresh_ahead:
+        try:
+            refresh_coordinator.run('gmail', refresh_gmail_token)
+        except Exception as e:
+            print(f"Scheduled Gmail token refresh failed: {str(e)}")
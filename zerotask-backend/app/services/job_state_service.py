@@ -0,0 +1,135 @@
+import json
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.job_state import JobState
+
+class JobStateService:
+    """Bookkeeping for scheduled jobs - PRD Section 7.4 (connector status, processing times)"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, job_id: str) -> Optional[JobState]:
+        return self.db.query(JobState).filter(JobState.job_id == job_id).first()
+
+    def record(self, job_id: str, started_at: datetime, duration_ms: float, result: Any = None,
+               error: Optional[str] = None) -> None:
+        """Store the outcome of one run"""
+        try:
+            state = self.get(job_id)
+            if state is None:
+                state = JobState(job_id=job_id, consecutive_failures=0, run_count=0)
+                self.db.add(state)
+
+            state.last_started_at = started_at
+            state.last_finished_at = datetime.utcnow()
+            state.last_duration_ms = round(duration_ms, 1)
+            state.run_count = (state.run_count or 0) + 1
+            state.last_error = error
+            if error is None:
+                state.last_status = 'success'
+                state.last_success_at = started_at
+                state.consecutive_failures = 0
+                state.last_result_json = json.dumps(result, default=str) if isinstance(result, dict) else None
+            else:
+                state.last_status = 'failed'
+                state.consecutive_failures = (state.consecutive_failures or 0) + 1
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Failed to record job state: {str(e)}")
+
+    def recent_result(self, job_id: str, max_age_seconds: float) -> Optional[Dict[str, Any]]:
+        """Result of the last run if it succeeded within max_age_seconds"""
+        state = self.get(job_id)
+        if state is None or state.last_status != 'success' or not state.last_success_at:
+            return None
+        if datetime.utcnow() - state.last_success_at.replace(tzinfo=None) > timedelta(seconds=max_age_seconds):
+            return None
+        return json.loads(state.last_result_json or "{}")
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """All job states for the health endpoint, flagging jobs past the alert threshold"""
+        return [{
+            "job_id": state.job_id,
+            "last_status": state.last_status,
+            "last_success_at": state.last_success_at.isoformat() if state.last_success_at else None,
+            "last_duration_ms": state.last_duration_ms,
+            "last_error": state.last_error,
+            "consecutive_failures": state.consecutive_failures,
+            "run_count": state.run_count,
+            "alert": (state.consecutive_failures or 0) > settings.job_alert_failures,
+        } for state in self.db.query(JobState).order_by(JobState.job_id)]
+
+# Jobs currently executing, so shutdown can wait for them
+_running_jobs: Dict[str, int] = {}
+_running_changed = threading.Condition()
+
+@contextmanager
+def _tracking(job_id: str) -> Iterator[Dict[str, Any]]:
+    outcome: Dict[str, Any] = {}
+    started_at = datetime.utcnow()
+    started = time.perf_counter()
+    with _running_changed:
+        _running_jobs[job_id] = _running_jobs.get(job_id, 0) + 1
+    try:
+        yield outcome
+    except BaseException as e:
+        outcome["error"] = str(e) or type(e).__name__
+        if not isinstance(e, Exception):
+            raise
+        print(f"Job {job_id} failed: {outcome['error']}")
+    finally:
+        db = SessionLocal()
+        try:
+            JobStateService(db).record(
+                job_id, started_at, (time.perf_counter() - started) * 1000, outcome.get("result"), outcome.get("error")
+            )
+        except ValueError as e:
+            print(str(e))
+        finally:
+            db.close()
+        with _running_changed:
+            _running_jobs[job_id] -= 1
+            if not _running_jobs[job_id]:
+                del _running_jobs[job_id]
+            _running_changed.notify_all()
+
+def tracked_job(job_id: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a scheduler job so each run's outcome and duration land in job_state
+
+    Failures are recorded and logged instead of propagating to the scheduler.
+    Coroutine jobs stay coroutine functions so APScheduler runs them on the loop.
+    """
+    if asyncio.iscoroutinefunction(func):
+        async def run_async(*args, **kwargs):
+            with _tracking(job_id) as outcome:
+                outcome["result"] = await func(*args, **kwargs)
+            return outcome.get("result")
+        return run_async
+
+    def run(*args, **kwargs):
+        with _tracking(job_id) as outcome:
+            outcome["result"] = func(*args, **kwargs)
+        return outcome.get("result")
+    return run
+
+def wait_for_running_jobs(timeout: float) -> List[str]:
+    """Block until running jobs finish or timeout passes; returns the ids still running"""
+    deadline = time.monotonic() + timeout
+    with _running_changed:
+        while _running_jobs:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _running_changed.wait(remaining)
+        return list(_running_jobs)
@@ -0,0 +1,134 @@
+import json
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from cryptography.fernet import InvalidToken
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.runs import Run
+from app.models.tokens import Token, OAuthToken
+from app.utils.encryption import token_encryption
+
+# Every model column holding Fernet ciphertext; new encrypted payloads register here
+ENCRYPTED_COLUMNS: Tuple[Tuple[Any, Tuple[str, ...]], ...] = (
+    (Token, ('encrypted_token',)),
+    (OAuthToken, ('encrypted_access_token', 'encrypted_refresh_token')),
+)
+
+class KeyRotationService:
+    """Online re-encryption of stored secrets under the current key - PRD Section 7.5 Key Rotation
+
+    Rows are walked in primary-key order in small batches. Each value is
+    re-encrypted with MultiFernet.rotate and written back with a compare-and-swap
+    UPDATE, so a token the API rewrites mid-rotation (already under the new key)
+    is never clobbered. The last id per table is checkpointed in the Run's
+    stats_json after every batch; an interrupted rotation resumes from there.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.batch_size = max(1, settings.key_rotation_batch_size)
+
+    def _find_run(self, statuses: Tuple[str, ...]) -> Optional[Run]:
+        runs = (
+            self.db.query(Run)
+            .filter(Run.kind == 'key_rotation', Run.status.in_(statuses))
+            .order_by(Run.started_at.desc())
+            .all()
+        )
+        for run in runs:
+            if json.loads(run.stats_json or '{}').get('key_id') == token_encryption.key_id:
+                return run
+        return None
+
+    def is_pending(self) -> bool:
+        """Old secrets are configured and no rotation to the current key has completed"""
+        return bool(settings.previous_app_secrets) and self._find_run(('completed',)) is None
+
+    def run(self) -> Dict[str, Any]:
+        """Re-encrypt every registered column, resuming from the last checkpoint"""
+        run = self._find_run(('running', 'failed'))
+        if run is None:
+            run = Run(kind='key_rotation', status='running')
+            run.stats_json = json.dumps({"key_id": token_encryption.key_id, "checkpoints": {}})
+            self.db.add(run)
+        run.status = 'running'
+        run.error_message = None
+        self.db.commit()
+
+        stats = json.loads(run.stats_json)
+        stats.setdefault("rotated", 0)
+        stats.setdefault("skipped", 0)
+        stats.setdefault("undecryptable", 0)
+
+        try:
+            for model, columns in ENCRYPTED_COLUMNS:
+                self._rotate_table(run, stats, model, columns)
+            run.status = 'completed'
+        except Exception as e:
+            self.db.rollback()
+            run.status = 'failed'
+            run.error_message = str(e)
+            print(f"Key rotation failed: {str(e)}")
+
+        run.finished_at = datetime.utcnow()
+        run.stats_json = json.dumps(stats)
+        self.db.commit()
+        return stats
+
+    def _rotate_table(self, run: Run, stats: Dict[str, Any], model, columns: Tuple[str, ...]) -> None:
+        table = model.__tablename__
+        last_id = stats["checkpoints"].get(table, 0)
+        while True:
+            rows = self.db.execute(
+                select(model.id, *[getattr(model, column) for column in columns])
+                .where(model.id > last_id)
+                .order_by(model.id)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                break
+
+            for row in rows:
+                for column, value in zip(columns, row[1:]):
+                    if not value:
+                        continue
+                    try:
+                        rotated = token_encryption.rotate_token(value)
+                    except InvalidToken:
+                        # Written under a key that is no longer configured
+                        stats["undecryptable"] += 1
+                        continue
+                    result = self.db.execute(
+                        update(model)
+                        .where(model.id == row[0], getattr(model, column) == value)
+                        .values({column: rotated})
+                    )
+                    stats["rotated" if result.rowcount else "skipped"] += 1
+
+            last_id = rows[-1][0]
+            stats["checkpoints"][table] = last_id
+            run.stats_json = json.dumps(stats)
+            self.db.commit()
+
+            if len(rows) < self.batch_size:
+                break
+            time.sleep(settings.key_rotation_pause)
+
+def run_key_rotation_job() -> Dict[str, Any]:
+    """Scheduled entry point - opens its own session"""
+    db = SessionLocal()
+    try:
+        service = KeyRotationService(db)
+        if not service.is_pending():
+            return {}
+        stats = service.run()
+        print(f"Key rotation: {stats.get('rotated', 0)} values re-encrypted, "
+              f"{stats.get('undecryptable', 0)} undecryptable")
+        return stats
+    finally:
+        db.close()
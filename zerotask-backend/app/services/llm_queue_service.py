@@ -0,0 +1,236 @@
+import time
+import heapq
+import asyncio
+import weakref
+import itertools
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.config import settings
+
+PRIORITIES = {"interactive": 0, "brief": 1, "prefetch": 2}
+
+class QueueFullError(Exception):
+    """Raised when a priority class is at its queue-depth limit (backpressure)"""
+
+    def __init__(self, priority: str, depth: int, retry_after: float):
+        super().__init__(f"LLM queue for '{priority}' jobs is full ({depth} waiting)")
+        self.priority = priority
+        self.depth = depth
+        self.retry_after = retry_after
+
+class LLMJob:
+    """A queued LLM call; await it for the result"""
+
+    def __init__(self, priority: str, factory: Callable[[], Awaitable[Any]], group: Optional[str],
+                 deadline: Optional[float]):
+        self.priority = priority
+        self.factory = factory
+        self.group = group
+        self.deadline = deadline
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None
+        self.expiry: Optional[asyncio.TimerHandle] = None
+        self.enqueued_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+
+    def __await__(self):
+        return self.future.__await__()
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self) -> bool:
+        """Cancel a queued or running job"""
+        if self.task is not None:
+            return self.task.cancel()
+        return self.future.cancel()
+
+class LLMJobQueue:
+    """Priority queue with a concurrency limit in front of the local LLM
+
+    Jobs run in priority order (interactive, then brief, then prefetch) with at
+    most llm_queue_concurrency in flight. When concurrency allows it, slots are
+    held back for interactive jobs so a draft reply never waits behind a full
+    brief run. Each class has a depth limit; submitting beyond it raises
+    QueueFullError, which the API turns into 429 + Retry-After.
+    """
+
+    SAMPLE_SIZE = 256
+
+    def __init__(self, concurrency: Optional[int] = None, max_depth: Optional[Dict[str, int]] = None):
+        self.concurrency = max(1, concurrency or settings.llm_queue_concurrency)
+        self.reserved = min(settings.llm_queue_interactive_reserved, self.concurrency - 1)
+        self.max_depth = {**settings.llm_queue_max_depth, **(max_depth or {})}
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._depth = {name: 0 for name in PRIORITIES}
+        self._running: Dict[str, int] = {name: 0 for name in PRIORITIES}
+        self._active: set = set()
+        self._waits: Dict[str, Deque[float]] = {name: deque(maxlen=self.SAMPLE_SIZE) for name in PRIORITIES}
+        self._services: Dict[str, Deque[float]] = {name: deque(maxlen=self.SAMPLE_SIZE) for name in PRIORITIES}
+        self._counters: Dict[str, Dict[str, int]] = {
+            name: {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "expired": 0, "rejected": 0}
+            for name in PRIORITIES
+        }
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    def submit(self, priority: str, factory: Callable[[], Awaitable[Any]], group: Optional[str] = None,
+               timeout: Optional[float] = None) -> LLMJob:
+        """Queue a job; `factory` creates the coroutine only when a slot is free
+
+        `timeout` bounds the time spent waiting in the queue; a job still queued
+        after it is dropped as stale and fails with TimeoutError, on a timer of
+        its own rather than at the next dispatch.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown LLM job priority: {priority}")
+
+        depth = self._depth[priority]
+        if depth >= self.max_depth.get(priority, 0):
+            self._counters[priority]["rejected"] += 1
+            raise QueueFullError(priority, depth, self.estimated_wait(priority))
+
+        deadline = time.perf_counter() + timeout if timeout else None
+        job = LLMJob(priority, factory, group, deadline)
+        job.future.add_done_callback(lambda future, job=job: self._dequeued(job))
+        if timeout:
+            job.expiry = asyncio.get_running_loop().call_later(timeout, self._expire, job)
+        heapq.heappush(self._heap, (PRIORITIES[priority], next(self._sequence), job))
+        self._depth[priority] += 1
+        self._counters[priority]["submitted"] += 1
+        self._dispatch()
+        return job
+
+    async def run(self, priority: str, factory: Callable[[], Awaitable[Any]], group: Optional[str] = None,
+                  timeout: Optional[float] = None) -> Any:
+        """Submit and wait; cancelling the caller cancels the job"""
+        job = self.submit(priority, factory, group, timeout)
+        try:
+            return await job
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+
+    def cancel_group(self, group: str) -> int:
+        """Cancel every queued or running job of a group (e.g. a superseded brief run)"""
+        cancelled = 0
+        for _, _, job in list(self._heap):
+            if job.group == group and job.cancel():
+                cancelled += 1
+        for job in list(self._active):
+            if job.group == group and job.cancel():
+                cancelled += 1
+        return cancelled
+
+    def _can_start(self, priority: str) -> bool:
+        if priority == "interactive":
+            return self.running < self.concurrency
+        return self.running < self.concurrency - self.reserved
+
+    def _dispatch(self) -> None:
+        now = time.perf_counter()
+        while self._heap:
+            _, _, job = self._heap[0]
+            if job.done:
+                # Cancelled or expired while queued (already counted)
+                heapq.heappop(self._heap)
+                continue
+            if not self._can_start(job.priority):
+                break
+
+            heapq.heappop(self._heap)
+            self._start(job, now)
+
+    def _expire(self, job: LLMJob) -> None:
+        """Timer callback: fail a job still queued after its timeout (it leaves the heap at the next dispatch)"""
+        if job.started_at is None and not job.done:
+            self._counters[job.priority]["expired"] += 1
+            job.future.set_exception(TimeoutError("LLM job expired while queued"))
+
+    def _dequeued(self, job: LLMJob) -> None:
+        """Future callback: release the queue slot of a job that never started"""
+        if job.expiry is not None:
+            job.expiry.cancel()
+        if job.started_at is None:
+            self._depth[job.priority] -= 1
+            if job.future.cancelled():
+                self._counters[job.priority]["cancelled"] += 1
+
+    def _start(self, job: LLMJob, now: float) -> None:
+        if job.expiry is not None:
+            job.expiry.cancel()
+        job.started_at = now
+        self._depth[job.priority] -= 1
+        self._waits[job.priority].append(now - job.enqueued_at)
+        self._running[job.priority] += 1
+        self._active.add(job)
+        job.task = asyncio.ensure_future(job.factory())
+        job.task.add_done_callback(lambda task, job=job: self._finish(job, task))
+
+    def _finish(self, job: LLMJob, task: asyncio.Task) -> None:
+        self._running[job.priority] -= 1
+        self._active.discard(job)
+        counters = self._counters[job.priority]
+        if task.cancelled():
+            counters["cancelled"] += 1
+            if not job.future.done():
+                job.future.cancel()
+        elif task.exception() is not None:
+            counters["failed"] += 1
+            if not job.future.done():
+                job.future.set_exception(task.exception())
+        else:
+            counters["completed"] += 1
+            self._services[job.priority].append(time.perf_counter() - job.started_at)
+            if not job.future.done():
+                job.future.set_result(task.result())
+        self._dispatch()
+
+    @staticmethod
+    def _percentile(samples: Deque[float], fraction: float) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 1)
+
+    def estimated_wait(self, priority: str) -> float:
+        """Seconds until a new job of this class would likely start (Retry-After hint)"""
+        service = self._percentile(self._services[priority], 0.5) or 1000.0
+        ahead = sum(self._depth[name] for name, rank in PRIORITIES.items() if rank <= PRIORITIES[priority])
+        slots = self.concurrency if priority == "interactive" else max(1, self.concurrency - self.reserved)
+        return round(max(1.0, ahead * service / 1000 / slots), 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "reserved_interactive": self.reserved,
+            "running": self.running,
+            "classes": {
+                name: {
+                    "depth": self._depth[name],
+                    "max_depth": self.max_depth.get(name, 0),
+                    "running": self._running[name],
+                    **self._counters[name],
+                    "wait_p50_ms": self._percentile(self._waits[name], 0.5),
+                    "wait_p95_ms": self._percentile(self._waits[name], 0.95),
+                    "service_p50_ms": self._percentile(self._services[name], 0.5),
+                    "service_p95_ms": self._percentile(self._services[name], 0.95),
+                }
+                for name in PRIORITIES
+            },
+        }
+
+_queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMJobQueue]" = weakref.WeakKeyDictionary()
+
+def get_llm_queue() -> LLMJobQueue:
+    """Queue for the running event loop (futures are loop-bound, like the HTTP pool)"""
+    loop = asyncio.get_running_loop()
+    queue = _queues.get(loop)
+    if queue is None:
+        queue = _queues[loop] = LLMJobQueue()
+    return queue
@@ -0,0 +1,249 @@
+import json
+import time
+import asyncio
+import weakref
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+
+class LLMStream:
+    """Token stream from Ollama; `metrics` is filled in once the stream completes
+
+    Iterating yields text chunks as the model produces them. The whole call,
+    including connection setup and model load, must finish within `timeout`.
+    """
+
+    def __init__(self, client: "OllamaClient", path: str, payload: Dict[str, Any], timeout: float):
+        self._client = client
+        self._path = path
+        self._payload = payload
+        self._timeout = timeout
+        self.text = ""
+        self.metrics: Dict[str, Any] = {}
+
+    @staticmethod
+    def _chunk(message: Dict[str, Any]) -> str:
+        if "message" in message:
+            return message["message"].get("content", "")
+        return message.get("response", "")
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._timeout
+        started = time.perf_counter()
+        first_token_at = None
+        chunks: List[str] = []
+
+        def remaining() -> float:
+            left = deadline - loop.time()
+            if left <= 0:
+                raise TimeoutError(f"LLM call exceeded its {self._timeout:.1f}s deadline")
+            return left
+
+        try:
+            request = self._client.http.build_request("POST", self._path, json=self._payload)
+            response = await asyncio.wait_for(self._client.http.send(request, stream=True), remaining())
+            try:
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise ValueError(f"Ollama returned {response.status_code}: {response.text[:200]}")
+
+                lines = response.aiter_lines()
+                while True:
+                    try:
+                        line = await asyncio.wait_for(lines.__anext__(), remaining())
+                    except StopAsyncIteration:
+                        break
+                    if not line:
+                        continue
+
+                    message = json.loads(line)
+                    if message.get("error"):
+                        raise ValueError(f"Ollama error: {message['error']}")
+
+                    chunk = self._chunk(message)
+                    if chunk:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        chunks.append(chunk)
+                        yield chunk
+
+                    if message.get("done"):
+                        self.metrics = self._summarize(message, started, first_token_at)
+                        break
+            finally:
+                await response.aclose()
+        except asyncio.TimeoutError:
+            self._client.record_error()
+            raise TimeoutError(f"LLM call exceeded its {self._timeout:.1f}s deadline")
+        except (httpx.HTTPError, ValueError):
+            self._client.record_error()
+            raise
+
+        self.text = "".join(chunks)
+        if self.metrics:
+            self._client.record(self.metrics)
+
+    def _summarize(self, final: Dict[str, Any], started: float, first_token_at: Optional[float]) -> Dict[str, Any]:
+        """Client-side latency plus Ollama's own counters (durations are in nanoseconds)"""
+        eval_count = final.get("eval_count", 0)
+        eval_seconds = final.get("eval_duration", 0) / 1e9
+        return {
+            "model": final.get("model", self._payload.get("model")),
+            "ttft_ms": round((first_token_at - started) * 1000, 1) if first_token_at else None,
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            "load_ms": round(final.get("load_duration", 0) / 1e6, 1),
+            "prompt_tokens": final.get("prompt_eval_count", 0),
+            "tokens": eval_count,
+            "tokens_per_sec": round(eval_count / eval_seconds, 1) if eval_seconds else None,
+        }
+
+class OllamaClient:
+    """Async Ollama client on a pooled httpx connection - PRD Section 8 (LLM Option A)
+
+    One AsyncClient per event loop keeps connections alive across calls, and
+    keep_alive tells Ollama to keep the model resident between summaries, so
+    neither a TCP handshake nor a cold model load lands on the brief path.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, model: Optional[str] = None):
+        self.base_url = base_url or settings.ollama_base_url
+        self.model = model or settings.ollama_model
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self.stats: Dict[str, Any] = {"calls": 0, "errors": 0, "ttft_ms": None, "tokens_per_sec": None, "last": None}
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared AsyncClient for the running event loop (httpx pools are loop-bound)"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(settings.llm_timeout, connect=settings.llm_connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.llm_max_connections,
+                    max_keepalive_connections=settings.llm_max_connections,
+                    keepalive_expiry=settings.llm_keepalive_expiry,
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    def _payload(self, model: Optional[str], options: Optional[Dict[str, Any]], keep_alive: Optional[str], **fields) -> Dict[str, Any]:
+        payload = {
+            "model": model or self.model,
+            "stream": True,
+            "keep_alive": keep_alive or settings.llm_keep_alive,
+            **{key: value for key, value in fields.items() if value is not None},
+        }
+        if options:
+            payload["options"] = options
+        return payload
+
+    def stream_generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[str] = None,
+        timeout: Optional[float] = None,
+        format: Optional[str] = None,
+    ) -> LLMStream:
+        """Stream a completion from /api/generate (format='json' constrains output to JSON)"""
+        payload = self._payload(model, options, keep_alive, prompt=prompt, system=system, format=format)
+        return LLMStream(self, "/api/generate", payload, timeout or settings.llm_timeout)
+
+    def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[str] = None,
+        timeout: Optional[float] = None,
+        format: Optional[str] = None,
+    ) -> LLMStream:
+        """Stream an assistant reply from /api/chat"""
+        payload = self._payload(model, options, keep_alive, messages=messages, format=format)
+        return LLMStream(self, "/api/chat", payload, timeout or settings.llm_timeout)
+
+    async def generate(self, prompt: str, **kwargs) -> LLMStream:
+        """Run a completion to the end; the returned stream holds text and metrics"""
+        stream = self.stream_generate(prompt, **kwargs)
+        async for _ in stream:
+            pass
+        return stream
+
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> LLMStream:
+        stream = self.stream_chat(messages, **kwargs)
+        async for _ in stream:
+            pass
+        return stream
+
+    async def warm_up(self, model: Optional[str] = None) -> None:
+        """Load the model into memory ahead of the first brief (empty prompt = load only)"""
+        response = await self.http.post(
+            "/api/generate",
+            json={"model": model or self.model, "keep_alive": settings.llm_keep_alive},
+            timeout=settings.llm_warmup_timeout,
+        )
+        response.raise_for_status()
+
+    async def health(self) -> Dict[str, Any]:
+        """Reachability, model availability and whether the model is loaded"""
+        try:
+            tags, loaded = await asyncio.gather(
+                self.http.get("/api/tags", timeout=settings.llm_health_timeout),
+                self.http.get("/api/ps", timeout=settings.llm_health_timeout),
+            )
+            tags.raise_for_status()
+        except httpx.HTTPError as e:
+            return {"status": f"error: {str(e) or type(e).__name__}"}
+
+        names = {model.get("name") for model in tags.json().get("models", [])}
+        running = {model.get("name") for model in loaded.json().get("models", [])} if loaded.is_success else set()
+        wanted = {self.model, f"{self.model}:latest"}
+        return {
+            "status": "healthy" if names & wanted else "model_missing",
+            "model_loaded": bool(running & wanted),
+            "ttft_ms": self.stats["ttft_ms"],
+            "tokens_per_sec": self.stats["tokens_per_sec"],
+        }
+
+    def record(self, metrics: Dict[str, Any]) -> None:
+        """Fold one call's metrics into exponentially weighted averages"""
+        self.stats["calls"] += 1
+        self.stats["last"] = metrics
+        for key in ("ttft_ms", "tokens_per_sec"):
+            value = metrics.get(key)
+            if value is None:
+                continue
+            current = self.stats[key]
+            self.stats[key] = value if current is None else round(0.8 * current + 0.2 * value, 1)
+
+    def record_error(self) -> None:
+        self.stats["errors"] += 1
+
+    async def aclose(self) -> None:
+        # Clients bound to other (finished) loops cannot be awaited here; just drop them
+        loop = asyncio.get_running_loop()
+        for client_loop, client in list(self._clients.items()):
+            if client_loop is loop:
+                await client.aclose()
+        self._clients.clear()
+
+_llm_client: Optional[OllamaClient] = None
+
+def get_llm_client() -> OllamaClient:
+    """Process-wide Ollama client"""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = OllamaClient()
+    return _llm_client
+
+async def close_llm_client() -> None:
+    if _llm_client is not None:
+        await _llm_client.aclose()
@@ -0,0 +1,93 @@
+import math
+from typing import Dict, List, Tuple
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.events import Event
+from app.models.links import SimhashBand
+from app.utils.simhash import SIGNATURE_BITS, simhash, band_keys, hamming_distance, to_signed, from_signed
+
+class NearDuplicateService:
+    """SimHash near-duplicate detection over Event.title + snippet
+
+    Signatures are split into (max_distance + 1) LSH bands, so by the pigeonhole
+    principle any two signatures within max_distance bits share at least one
+    band. Candidates come from indexed band lookups and are verified by exact
+    Hamming distance; there are no pairwise comparisons across the table.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.max_distance = max(0, math.floor((1.0 - settings.near_duplicate_threshold) * SIGNATURE_BITS))
+        self.bands = self.max_distance + 1
+
+    def find_duplicates(self, events: List[Event]) -> List[Tuple[int, int, int]]:
+        """Sign and index events; returns (event_id, related_event_id, related_cluster_id) matches
+
+        related_cluster_id is None when the related event is part of the same batch.
+        """
+        batch_ids = [event.id for event in events]
+        self.db.query(SimhashBand).filter(SimhashBand.event_id.in_(batch_ids)).delete(synchronize_session=False)
+
+        signed: Dict[int, Tuple[int, List[str]]] = {}
+        for event in events:
+            signature = simhash(f"{event.title or ''} {event.snippet or ''}", settings.near_duplicate_min_tokens)
+            event.simhash = to_signed(signature) if signature is not None else None
+            if signature is not None:
+                signed[event.id] = (signature, band_keys(signature, self.bands))
+
+        if not signed:
+            return []
+
+        all_keys = {key for _, keys in signed.values() for key in keys}
+        candidates = self._existing_candidates(list(all_keys), batch_ids)
+
+        matches: List[Tuple[int, int, int]] = []
+        batch_buckets: Dict[str, List[int]] = {}
+        for event_id, (signature, keys) in signed.items():
+            best = None  # (distance, related_event_id, related_cluster_id)
+            seen = set()
+            for key in keys:
+                for related_id, related_signature, related_cluster in candidates.get(key, ()):
+                    if related_id in seen:
+                        continue
+                    seen.add(related_id)
+                    distance = hamming_distance(signature, related_signature)
+                    if distance <= self.max_distance and (best is None or distance < best[0]):
+                        best = (distance, related_id, related_cluster)
+
+                # Earlier events of this batch
+                for related_id in batch_buckets.get(key, ()):
+                    if related_id in seen:
+                        continue
+                    seen.add(related_id)
+                    distance = hamming_distance(signature, signed[related_id][0])
+                    if distance <= self.max_distance and (best is None or distance < best[0]):
+                        best = (distance, related_id, None)
+
+            if best:
+                matches.append((event_id, best[1], best[2]))
+
+            for key in keys:
+                batch_buckets.setdefault(key, []).append(event_id)
+                self.db.add(SimhashBand(event_id=event_id, band_key=key))
+
+        return matches
+
+    def _existing_candidates(self, keys: List[str], batch_ids: List[int]) -> Dict[str, List[Tuple[int, int, int]]]:
+        """Band key -> [(event id, unsigned signature, cluster id)] for already indexed events"""
+        rows = (
+            self.db.query(SimhashBand.band_key, Event.id, Event.simhash, Event.cluster_id)
+            .join(Event, Event.id == SimhashBand.event_id)
+            .filter(SimhashBand.band_key.in_(keys), SimhashBand.event_id.notin_(batch_ids))
+            .all()
+        )
+
+        candidates: Dict[str, List[Tuple[int, int, int]]] = {}
+        for key, event_id, signature, cluster_id in rows:
+            if signature is None:
+                continue
+            candidates.setdefault(key, []).append(
+                (event_id, from_signed(signature), cluster_id if cluster_id is not None else event_id)
+            )
+        return candidates
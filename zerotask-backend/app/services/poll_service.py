@@ -0,0 +1,224 @@
+import time
+import asyncio
+import threading
+import weakref
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.poll_schedule import PollSchedule
+from app.services.connector_service import CONNECTORS, CheckpointStore, Connector
+from app.services.event_ingest_service import EventIngestService
+from app.services.embedding_service import EmbeddingService
+from app.services.priority_service import PriorityScoringService
+from app.utils.resilience import SourceUnavailableError
+
+# Channel/label lists per source, refreshed every poll_scope_refresh seconds
+_scope_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+_last_reset = 0.0
+_reset_lock = threading.Lock()
+# One poll per source at a time, scheduled or started by a brief run (asyncio locks are per event loop)
+_poll_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = weakref.WeakKeyDictionary()
+_poll_locks_lock = threading.Lock()
+
+def poll_job_id(source: str) -> str:
+    return f"poll_{source}"
+
+def poll_lock(source: str) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    with _poll_locks_lock:
+        return _poll_locks.setdefault(loop, {}).setdefault(source, asyncio.Lock())
+
+class PollService:
+    """Adaptive connector polling - PRD Section 7.1 Incremental sync
+
+    Every scope of a source (Slack channel, Gmail label, GitHub repo) has its
+    own interval. An EWMA of the scope's new/changed items per minute decides
+    how soon it is polled again: busy scopes approach poll_min_interval, and
+    each poll that finds nothing multiplies the interval by
+    poll_backoff_factor up to poll_max_interval. The scheduler ticks every
+    poll_tick_seconds and only due scopes cost an API call, fetched
+    concurrently within the connector's limits. Each scope resumes from its
+    checkpointed cursor, which is saved only after its records are ingested.
+    User activity pulls backed-off scopes back to the source's base interval.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def base_interval(source: str) -> float:
+        """Starting interval in seconds (the source's *_poll_interval setting)"""
+        return float(getattr(settings, f"{source}_poll_interval") * 60)
+
+    async def scopes(self, connector: Connector) -> Optional[Dict[str, str]]:
+        """Scope id -> label for a source, or None if it is not connected"""
+        cached = _scope_cache.get(connector.source)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        if not await connector.is_connected():
+            return None
+
+        scopes = await connector.list_scopes()
+        _scope_cache[connector.source] = (time.monotonic() + settings.poll_scope_refresh, scopes)
+        return scopes
+
+    def due(self, source: str, scopes: Dict[str, str], now: datetime) -> List[PollSchedule]:
+        """Schedules of the scopes due for a poll, most overdue first (new scopes start due)"""
+        existing = {schedule.scope: schedule for schedule in self.db.query(PollSchedule).filter(PollSchedule.source == source)}
+        for scope, label in scopes.items():
+            schedule = existing.get(scope)
+            if schedule is None:
+                self.db.add(PollSchedule(
+                    source=source, scope=scope, label=label, interval_seconds=self.base_interval(source),
+                    idle_polls=0, next_poll_at=now,
+                ))
+            elif schedule.label != label:
+                schedule.label = label
+        self.db.commit()
+
+        return self.db.query(PollSchedule).filter(
+            PollSchedule.source == source,
+            PollSchedule.scope.in_(list(scopes)),
+            PollSchedule.next_poll_at <= now,
+        ).order_by(PollSchedule.next_poll_at).limit(settings.poll_max_scopes_per_tick).all()
+
+    def observe(self, schedule: PollSchedule, changed: int, since: datetime, now: datetime, failed: bool = False) -> None:
+        """Update the scope's item rate and pick its next poll time"""
+        interval = schedule.interval_seconds
+        if failed:
+            interval *= settings.poll_backoff_factor
+        else:
+            minutes = max((now - since).total_seconds() / 60, 1 / 60)
+            observed = changed / minutes
+            alpha = settings.poll_ewma_alpha
+            rate = observed if schedule.item_rate is None else alpha * observed + (1 - alpha) * schedule.item_rate
+            schedule.item_rate = round(rate, 6)
+            schedule.last_items = changed
+            schedule.last_polled_at = now
+            if changed:
+                schedule.idle_polls = 0
+                # Poll about every poll_target_items new items, never slower than the base interval
+                interval = min(self.base_interval(schedule.source), settings.poll_target_items / rate * 60)
+            else:
+                schedule.idle_polls = (schedule.idle_polls or 0) + 1
+                interval *= settings.poll_backoff_factor
+
+        schedule.interval_seconds = min(max(interval, settings.poll_min_interval), settings.poll_max_interval)
+        schedule.next_poll_at = now + timedelta(seconds=schedule.interval_seconds)
+        self.db.commit()
+
+    async def fetch(self, connector: Connector, schedule: PollSchedule, cursor: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """One scope's records since its cursor (advanced in place)"""
+        return [record async for record in connector.fetch_incremental(schedule.scope, schedule.label or schedule.scope, cursor)]
+
+    async def poll(self, source: str) -> Dict[str, Any]:
+        """Fetch and ingest the due scopes of one source"""
+        connector = CONNECTORS[source](self.db)
+        scopes = await self.scopes(connector)
+        if scopes is None:
+            return {"status": "not_connected"}
+
+        now = datetime.utcnow()
+        window_start = now - timedelta(hours=settings.brief_window_hours)
+        due = self.due(source, scopes, now)
+        checkpoints = CheckpointStore(self.db)
+        cursors = []
+        for schedule in due:
+            cursor = checkpoints.load(source, schedule.scope)
+            if not cursor and schedule.last_polled_at:
+                # Scope polled before checkpoints existed
+                cursor = {"since": schedule.last_polled_at.replace(tzinfo=None).isoformat()}
+            cursors.append(cursor)
+        results = await asyncio.gather(
+            *(self.fetch(connector, schedule, cursor) for schedule, cursor in zip(due, cursors)), return_exceptions=True
+        )
+
+        stats = {"status": "ok", "scopes": len(scopes), "polled": len(due), "errors": 0, "inserted": 0, "updated": 0}
+        unavailable: Optional[SourceUnavailableError] = None
+        ingested: List[int] = []
+        for schedule, cursor, result in zip(due, cursors, results):
+            last_polled = schedule.last_polled_at.replace(tzinfo=None) if schedule.last_polled_at else None
+            since = max(window_start, last_polled - timedelta(seconds=settings.poll_overlap)) if last_polled else window_start
+            if isinstance(result, SourceUnavailableError):
+                # Circuit open or rate limited: the scope stays due and is tried again once the source recovers
+                unavailable = result
+                continue
+            try:
+                if isinstance(result, BaseException):
+                    raise result
+                ingest = EventIngestService(self.db).ingest(result)
+                checkpoints.save(source, schedule.scope, cursor)
+            except Exception as e:
+                print(f"Poll of {source} scope {schedule.label or schedule.scope} failed: {str(e)}")
+                stats["errors"] += 1
+                self.db.rollback()
+                self.observe(schedule, 0, since, now, failed=True)
+                continue
+
+            stats["inserted"] += ingest["inserted"]
+            stats["updated"] += ingest["updated"]
+            ingested.extend(ingest.get("event_ids", []))
+            self.observe(schedule, ingest["inserted"] + ingest["updated"], last_polled or since, now)
+
+        await EmbeddingService(self.db).index_ingested(ingested)
+        if ingested:
+            # New activity can change existing cards' priority (mentions, recency, thread activity)
+            try:
+                stats["rescored"] = PriorityScoringService(self.db).rescore_cards()["cards_updated"]
+            except ValueError as e:
+                print(f"Rescoring cards after {source} poll failed: {str(e)}")
+        if unavailable is not None:
+            raise unavailable
+        if due and stats["errors"] == len(due):
+            raise ValueError(f"Every {source} scope failed to poll")
+        return stats
+
+    def reset(self, source: Optional[str] = None) -> int:
+        """The user is looking: bring backed-off scopes back to their base interval"""
+        now = datetime.utcnow()
+        query = self.db.query(PollSchedule)
+        if source:
+            query = query.filter(PollSchedule.source == source)
+
+        reset = 0
+        for schedule in query:
+            base = self.base_interval(schedule.source)
+            if schedule.interval_seconds <= base:
+                continue
+            schedule.interval_seconds = base
+            schedule.idle_polls = 0
+            due_at = (schedule.last_polled_at.replace(tzinfo=None) if schedule.last_polled_at else now) + timedelta(seconds=base)
+            schedule.next_poll_at = min(schedule.next_poll_at.replace(tzinfo=None), max(due_at, now))
+            reset += 1
+        self.db.commit()
+        return reset
+
+async def run_poll_job(source: str) -> Dict[str, Any]:
+    """Scheduled entry point (also used by brief runs) - opens its own session
+
+    Waits for a poll of the same source already in progress, so two polls
+    never fetch the same scopes or write the same checkpoints at once.
+    """
+    async with poll_lock(source):
+        db = SessionLocal()
+        try:
+            return await PollService(db).poll(source)
+        finally:
+            db.close()
+
+def reset_polling_on_interaction(db: Session) -> None:
+    """Called when the user opens the brief; at most once per poll_min_interval"""
+    global _last_reset
+    with _reset_lock:
+        if time.monotonic() - _last_reset < settings.poll_min_interval:
+            return
+        _last_reset = time.monotonic()
+    try:
+        PollService(db).reset()
+    except Exception as e:
+        db.rollback()
+        print(f"Poll reset failed: {str(e)}")
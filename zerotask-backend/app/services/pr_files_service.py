@@ -0,0 +1,179 @@
+import json
+import posixpath
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.pr_files import PullRequestFiles
+from app.services.github_service import GitHubService
+
+# Paths whose diffs say little about the change itself
+NOISE_NAMES = {'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'poetry.lock', 'Pipfile.lock', 'Cargo.lock', 'go.sum'}
+NOISE_SUFFIXES = ('.min.js', '.min.css', '.snap', '.map', '.svg', '.png', '.jpg', '.gif', '.pdf')
+NOISE_DIRS = ('vendor/', 'dist/', 'build/', 'node_modules/', '__snapshots__/')
+
+# Top-level directories that hold one component per subdirectory
+CONTAINER_DIRS = {'src', 'lib', 'app', 'apps', 'packages', 'services', 'libs', 'modules', 'cmd', 'internal', 'pkg'}
+
+def component_of(path: str) -> str:
+    """Component a file belongs to: tests, docs, or its leading directories (github_component_depth)"""
+    parts = path.split('/')
+    lowered = path.lower()
+    if any(part in ('test', 'tests', '__tests__', 'spec') for part in parts[:-1]) or '/test_' in f"/{lowered}" or '.test.' in lowered or '.spec.' in lowered:
+        return 'tests'
+    if parts[0] in ('docs', 'doc') or lowered.endswith(('.md', '.rst')):
+        return 'docs'
+    if len(parts) == 1:
+        return '(root)'
+    depth = settings.github_component_depth if parts[0] in CONTAINER_DIRS else 1
+    return '/'.join(parts[:min(depth, len(parts) - 1)])
+
+def is_noise(path: str) -> bool:
+    return (posixpath.basename(path) in NOISE_NAMES or path.endswith(NOISE_SUFFIXES)
+            or any(f"/{directory}" in f"/{path}" for directory in NOISE_DIRS))
+
+class PullRequestFilesService:
+    """Changed-files digest of a pull request for the brief - PRD Section 8 (GitHub PR details)
+
+    Stage 1 fetches only file-level stats, in pages, and groups paths into
+    components locally. Stage 2 runs when a card is summarized: patches of the
+    github_patch_files files with the most churn (lockfiles, generated and
+    binary files skipped) are fetched and truncated. Both are cached per head
+    SHA, so a PR costs API calls again only after a new push.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, repo: str, number: int, head_sha: Optional[str] = None) -> PullRequestFiles:
+        """Cached stats for the PR's head commit, fetched if missing"""
+        if head_sha:
+            entry = self._cached(repo, number, head_sha)
+            if entry is not None:
+                return entry
+
+        # The event's head SHA may be older than the PR; the query returns the current one
+        head_sha, files = GitHubService().get_pr_files(repo, number)
+        entry = self._cached(repo, number, head_sha)
+        if entry is not None:
+            return entry
+
+        try:
+            entry = PullRequestFiles(
+                repo=repo,
+                number=number,
+                head_sha=head_sha,
+                file_count=len(files),
+                additions=sum(item['additions'] for item in files),
+                deletions=sum(item['deletions'] for item in files),
+                files_json=json.dumps([[item['path'], item['additions'], item['deletions'], item['changeType']] for item in files]),
+                last_used_at=datetime.utcnow(),
+            )
+            self.db.add(entry)
+            self.db.commit()
+            return entry
+        except IntegrityError:
+            # Another worker cached the same head commit first
+            self.db.rollback()
+            entry = self._cached(repo, number, head_sha)
+            if entry is not None:
+                return entry
+            raise ValueError(f"Failed to cache files of {repo}#{number}: head {head_sha} not found after conflict")
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Failed to cache files of {repo}#{number}: {str(e)}")
+
+    def _cached(self, repo: str, number: int, head_sha: str) -> Optional[PullRequestFiles]:
+        return self.db.query(PullRequestFiles).filter(
+            PullRequestFiles.repo == repo, PullRequestFiles.number == number, PullRequestFiles.head_sha == head_sha
+        ).first()
+
+    @staticmethod
+    def files(entry: PullRequestFiles) -> List[Tuple[str, int, int, str]]:
+        return [tuple(item) for item in json.loads(entry.files_json)]
+
+    @staticmethod
+    def group(files: List[Tuple[str, int, int, str]]) -> List[Dict[str, Any]]:
+        """Files rolled up per component, most churn first"""
+        groups: Dict[str, Dict[str, Any]] = {}
+        for path, additions, deletions, _ in files:
+            group = groups.setdefault(component_of(path), {"files": 0, "additions": 0, "deletions": 0})
+            group["files"] += 1
+            group["additions"] += additions
+            group["deletions"] += deletions
+        return sorted(
+            ({"component": name, **group} for name, group in groups.items()),
+            key=lambda group: group["additions"] + group["deletions"], reverse=True,
+        )
+
+    @staticmethod
+    def top_files(files: List[Tuple[str, int, int, str]], count: int) -> Dict[str, int]:
+        """Path -> position in the file list of the `count` non-noise files with the most churn"""
+        ranked = sorted(
+            ((position, item) for position, item in enumerate(files) if not is_noise(item[0]) and item[3] != 'DELETED'),
+            key=lambda entry: entry[1][1] + entry[1][2], reverse=True,
+        )
+        return {item[0]: position for position, item in ranked[:count]}
+
+    def patches(self, entry: PullRequestFiles) -> Dict[str, str]:
+        """Truncated patches of the top files, fetched on first use
+
+        Cached only when every wanted file was found, so a file list that
+        shifted between the two APIs is fetched again next time.
+        """
+        if entry.patches_json is not None:
+            return json.loads(entry.patches_json)
+
+        wanted = self.top_files(self.files(entry), settings.github_patch_files)
+        patches = GitHubService().get_pr_patches(entry.repo, entry.number, wanted) if wanted else {}
+        patches = {path: patch[:settings.github_patch_max_chars] for path, patch in patches.items()}
+        if len(patches) == len(wanted):
+            entry.patches_json = json.dumps(patches)
+            self.db.commit()
+        return patches
+
+    def digest(self, repo: str, number: int, head_sha: Optional[str] = None, with_patches: bool = True) -> str:
+        """Compact changed-files text for the summarizer"""
+        entry = self.load(repo, number, head_sha)
+        files = self.files(entry)
+        groups = self.group(files)
+        lines = [f"Changed files: {entry.file_count} (+{entry.additions} -{entry.deletions}) in {len(groups)} components"]
+        for group in groups[:8]:
+            lines.append(f"- {group['component']}: {group['files']} files +{group['additions']} -{group['deletions']}")
+        if len(groups) > 8:
+            lines.append(f"- {len(groups) - 8} more components")
+
+        if with_patches:
+            stats = {path: (additions, deletions) for path, additions, deletions, _ in files}
+            patches = self.patches(entry)
+            for path in sorted(patches, key=lambda path: sum(stats.get(path, (0, 0))), reverse=True):
+                patch = patches[path]
+                additions, deletions = stats.get(path, (0, 0))
+                lines.append(f"--- {path} (+{additions} -{deletions})")
+                if patch:
+                    lines.append(patch)
+
+        entry.last_used_at = datetime.utcnow()
+        self.db.commit()
+        return "\n".join(lines)
+
+    def purge_unused(self, cutoff: datetime) -> int:
+        """Delete cached PRs not summarized since cutoff (called by retention)"""
+        deleted = self.db.query(PullRequestFiles).filter(
+            PullRequestFiles.last_used_at < cutoff
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
+
+def pull_request_digest(source_id: str, head_sha: Optional[str] = None) -> str:
+    """Digest for a GitHub event source_id ("owner/name#123") on a session of its own - for worker threads"""
+    repo, number = source_id.rsplit('#', 1)
+    db = SessionLocal()
+    try:
+        return PullRequestFilesService(db).digest(repo, int(number), head_sha)
+    finally:
+        db.close()
@@ -0,0 +1,236 @@
+import re
+import json
+import math
+import hashlib
+from email.utils import getaddresses
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.events import Event
+from app.models.cards import Card
+from app.models.tokens import OAuthToken
+
+JULIAN_UNIX_EPOCH = 2440587.5  # julianday('1970-01-01')
+
+FEATURES = ('mention', 'ownership', 'due', 'recency', 'affinity', 'activity')
+
+_DUE_PATTERN = re.compile(
+    r'\b(due|deadline|eod|eow|asap|urgent|blocker|blocking|today|tonight|tomorrow|by (monday|tuesday|wednesday|thursday|friday))\b',
+    re.IGNORECASE,
+)
+
+# raw_json fields that name the people an item is assigned or addressed to
+OWNER_FIELDS = ('assignees', 'review_requested')
+OWNER_REASONS = {'assigned', 'assign', 'review_requested'}  # search reasons and notification reasons
+
+# Text-derived flags per (event id, digest of title/snippet/raw_json, identities)
+_flag_cache: Dict[Tuple[int, bytes, int], Tuple[bool, bool, bool]] = {}
+_FLAG_CACHE_LIMIT = 200_000
+
+class PriorityScoringService:
+    """Vectorized priority scoring for Card.priority_score - PRD: mention + ownership + due date + recency
+
+    Feature columns are built for every candidate event at once as NumPy arrays,
+    reduced per dedupe cluster, and combined with configurable weights in one
+    pass. Text flags are cached per event content, so re-ranking after every
+    poll only rescans events whose title, snippet or payload changed.
+    """
+
+    LOAD_CHUNK = 900  # SQLite variable limit for IN (...)
+
+    def __init__(self, db: Session, weights: Optional[Dict[str, float]] = None, identities: Optional[List[str]] = None):
+        self.db = db
+        self.weights = {**settings.priority_weights, **(weights or {})}
+        self.identities = [identity.lower() for identity in (identities or self._load_identities()) if identity]
+        self._identity_key = hash(frozenset(self.identities))
+        # @handle only as a whole handle: "@al" must not match "@alice" or "@al-bot"
+        self._mention_pattern = re.compile(
+            r'@(?:' + '|'.join(re.escape(identity) for identity in sorted(self.identities, key=len, reverse=True)) + r')(?![\w-]|\.\w)'
+        ) if self.identities else None
+
+    def _load_identities(self) -> List[str]:
+        """Names the user is known by: configured identities plus connected account profiles"""
+        identities = list(settings.user_identities)
+        for token in self.db.query(OAuthToken).filter(OAuthToken.is_active == True).all():
+            if not token.user_info:
+                continue
+            try:
+                info = json.loads(token.user_info)
+            except ValueError:
+                continue
+            for key in ('user_id', 'email', 'login', 'name'):
+                if info.get(key):
+                    identities.append(str(info[key]))
+        return identities
+
+    def _is_owner(self, raw_json: Optional[str]) -> bool:
+        """Whether the raw payload assigns the item to the user, requests their review or is addressed To them"""
+        if not raw_json or not self.identities:
+            return False
+        try:
+            raw = json.loads(raw_json)
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(raw, dict):
+            return False
+
+        identities = set(self.identities)
+        for field in OWNER_FIELDS:
+            if any(str(name).lower() in identities for name in raw.get(field) or [] if name):
+                return True
+        reasons = raw.get('reasons') or [raw.get('reason')]
+        if any(reason in OWNER_REASONS for reason in reasons):
+            return True
+        # Direct recipients only (not Cc/lists); name or address must equal an identity
+        to = raw.get('to')
+        if isinstance(to, str) and to:
+            return any(name.lower() in identities or address.lower() in identities for name, address in getaddresses([to]))
+        return False
+
+    @staticmethod
+    def _content_digest(title: Optional[str], snippet: Optional[str], raw_json: Optional[str]) -> bytes:
+        content = "\x1f".join((title or '', snippet or '', raw_json or ''))
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    def _text_flags(self, ids: np.ndarray, authors: List[Optional[str]]) -> np.ndarray:
+        """(n, 3) bool matrix of mention / ownership / due flags, from cache where the event is unchanged"""
+        flags = np.zeros((len(ids), 3), dtype=bool)
+        row_of = {event_id: row for row, event_id in enumerate(ids.tolist())}
+        event_ids = list(row_of)
+        for start in range(0, len(event_ids), self.LOAD_CHUNK):
+            chunk = event_ids[start:start + self.LOAD_CHUNK]
+            rows = self.db.query(Event.id, Event.title, Event.snippet, Event.raw_json).filter(Event.id.in_(chunk)).all()
+            for event_id, title, snippet, raw_json in rows:
+                row = row_of[event_id]
+                key = (event_id, self._content_digest(title, snippet, raw_json), self._identity_key)
+                cached = _flag_cache.get(key)
+                if cached is not None:
+                    flags[row] = cached
+                    continue
+
+                text = f"{title or ''} {snippet or ''}".lower()
+                mention = bool(self._mention_pattern and self._mention_pattern.search(text))
+                is_mine = authors[row] in self.identities
+                ownership = not is_mine and self._is_owner(raw_json)
+                due = bool(_DUE_PATTERN.search(text))
+
+                flags[row] = (mention, ownership, due)
+                if len(_flag_cache) >= _FLAG_CACHE_LIMIT:
+                    _flag_cache.clear()
+                _flag_cache[key] = (mention, ownership, due)
+
+        return flags
+
+    def build_features(self, since: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """Per-event feature columns for every event since the scoring window start"""
+        now = datetime.utcnow()
+        since = since or now - timedelta(days=settings.priority_window_days)
+        # julianday() keeps datetime parsing out of Python for large windows
+        rows = self.db.execute(
+            select(Event.id, func.lower(Event.author), func.julianday(Event.ts), Event.cluster_id)
+            .where(Event.ts >= since)
+        ).all()
+        count = len(rows)
+        if not count:
+            return {"event_id": np.zeros(0, dtype=np.int64), "cluster": np.zeros(0, dtype=np.int64),
+                    **{name: np.zeros(0) for name in FEATURES}}
+
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+        authors = [row[1] or '' for row in rows]
+        ts_seconds = (np.array([row[2] for row in rows], dtype=np.float64) - JULIAN_UNIX_EPOCH) * 86400.0
+        clusters = np.fromiter((row[3] if row[3] is not None else row[0] for row in rows), dtype=np.int64, count=count)
+
+        flags = self._text_flags(ids, authors)
+
+        # Recency: exponential decay with a configurable half-life
+        now_seconds = (now - datetime(1970, 1, 1)).total_seconds()
+        age_hours = np.maximum(now_seconds - np.nan_to_num(ts_seconds, nan=now_seconds), 0.0) / 3600.0
+        recency = np.exp(-math.log(2) * age_hours / max(settings.priority_half_life_hours, 0.1))
+
+        # Thread activity: dedupe cluster size (log-scaled)
+        _, cluster_index, cluster_sizes = np.unique(clusters, return_inverse=True, return_counts=True)
+        activity = np.log1p(cluster_sizes[cluster_index] - 1)
+        if activity.max() > 0:
+            activity /= activity.max()
+
+        # Author affinity: how many of the user's own threads each author takes part in
+        author_keys = np.array(authors)
+        is_mine = np.isin(author_keys, self.identities) if self.identities else np.zeros(count, dtype=bool)
+        in_my_threads = np.isin(clusters, clusters[is_mine])
+        _, author_index = np.unique(author_keys, return_inverse=True)
+        shared = np.bincount(author_index, weights=(in_my_threads & ~is_mine).astype(np.float64))
+        affinity = np.log1p(shared[author_index])
+        if affinity.max() > 0:
+            affinity /= affinity.max()
+
+        return {
+            "event_id": ids,
+            "cluster": clusters,
+            "mention": flags[:, 0].astype(np.float64),
+            "ownership": flags[:, 1].astype(np.float64),
+            "due": flags[:, 2].astype(np.float64),
+            "recency": recency,
+            "affinity": affinity,
+            "activity": activity,
+        }
+
+    def score(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """Weighted sum of feature columns, normalized to 0.0-1.0"""
+        total_weight = sum(max(self.weights.get(name, 0.0), 0.0) for name in FEATURES) or 1.0
+        scores = np.zeros(len(features["event_id"]), dtype=np.float64)
+        for name in FEATURES:
+            weight = max(self.weights.get(name, 0.0), 0.0)
+            if weight:
+                scores += weight * features[name]
+        return np.clip(scores / total_weight, 0.0, 1.0)
+
+    def score_clusters(self, features: Dict[str, np.ndarray]) -> Dict[int, float]:
+        """Cluster score = each feature's max over the cluster's events, then weighted"""
+        if not len(features["event_id"]):
+            return {}
+
+        cluster_ids, cluster_index = np.unique(features["cluster"], return_inverse=True)
+        reduced = {"event_id": cluster_ids}
+        for name in FEATURES:
+            column = np.zeros(len(cluster_ids), dtype=np.float64)
+            np.maximum.at(column, cluster_index, features[name])
+            reduced[name] = column
+
+        return dict(zip(cluster_ids.tolist(), self.score(reduced).tolist()))
+
+    def rescore_cards(self) -> Dict[str, Any]:
+        """Recompute priority_score for all live cards and write changed scores in bulk"""
+        started = datetime.utcnow()
+        cluster_scores = self.score_clusters(self.build_features())
+
+        cards = (
+            self.db.query(Card.id, Card.priority_score, Event.cluster_id, Event.id)
+            .join(Event, Event.id == Card.primary_event_id)
+            .all()
+        )
+
+        updates = []
+        for card_id, current, cluster_id, event_id in cards:
+            new_score = cluster_scores.get(cluster_id if cluster_id is not None else event_id)
+            if new_score is not None and abs((current or 0.0) - new_score) > 1e-4:
+                updates.append({"id": card_id, "priority_score": round(new_score, 4)})
+
+        try:
+            if updates:
+                self.db.bulk_update_mappings(Card, updates)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Failed to update card priorities: {str(e)}")
+
+        return {
+            "clusters_scored": len(cluster_scores),
+            "cards": len(cards),
+            "cards_updated": len(updates),
+            "duration_ms": round((datetime.utcnow() - started).total_seconds() * 1000, 1),
+        }
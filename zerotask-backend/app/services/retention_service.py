@@ -0,0 +1,193 @@
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+from sqlalchemy import text, or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.events import Event
+from app.models.cards import Card
+from app.models.runs import Run
+from app.models.brief_snapshot import BriefSnapshot
+from app.models.links import Link, EventUrl, SimhashBand
+from app.services.summary_cache_service import SummaryCacheService
+from app.services.dead_letter_service import DeadLetterService
+from app.services.pr_files_service import PullRequestFilesService
+
+class RetentionService:
+    """Retention and compaction for events, cards and runs - PRD Section 7.5 Data Governance
+
+    Rows are deleted in small batches that walk the timestamp indexes
+    (idx_events_ts, idx_cards_created, idx_runs_started) and commit after every
+    batch, so SQLite never holds the write lock for long.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.batch_size = max(1, settings.retention_batch_size)
+
+    def run(self) -> Dict[str, Any]:
+        """Run a full retention pass and record it as a Run"""
+        run = Run(kind='retention', status='running')
+        self.db.add(run)
+        self.db.commit()
+
+        now = datetime.utcnow()
+        stats: Dict[str, Any] = {
+            "event_cutoff": (now - timedelta(days=settings.event_retention_days)).isoformat(),
+            "card_cutoff": (now - timedelta(days=settings.card_retention_days)).isoformat(),
+            "run_cutoff": (now - timedelta(days=settings.run_retention_days)).isoformat(),
+        }
+
+        try:
+            stats["cards_deleted"] = self.purge_cards(now - timedelta(days=settings.card_retention_days))
+            event_stats = self.purge_events(now - timedelta(days=settings.event_retention_days))
+            stats.update(event_stats)
+            stats["runs_deleted"] = self.purge_runs(now - timedelta(days=settings.run_retention_days))
+            stats["snapshots_deleted"] = self.purge_snapshots(now - timedelta(days=settings.card_retention_days))
+            stats["pr_files_deleted"] = PullRequestFilesService(self.db).purge_unused(now - timedelta(days=settings.card_retention_days))
+            stats["dead_letters_deleted"] = DeadLetterService(self.db).purge_resolved(now - timedelta(days=settings.dead_letter_retention_days))
+            stats["llm_cache_deleted"] = SummaryCacheService(self.db).purge_stale(now)
+            stats["vacuum"] = self.incremental_vacuum()
+
+            run.status = 'completed'
+        except Exception as e:
+            self.db.rollback()
+            run.status = 'failed'
+            run.error_message = str(e)
+            print(f"Retention run failed: {str(e)}")
+
+        run.finished_at = datetime.utcnow()
+        run.stats_json = json.dumps(stats)
+        self.db.commit()
+
+        return stats
+
+    def purge_cards(self, cutoff: datetime) -> int:
+        """Delete cards created before cutoff, oldest first"""
+        deleted = 0
+        while True:
+            ids = self._scalar_ids(
+                self.db.query(Card.id)
+                .filter(Card.created_at < cutoff)
+                .order_by(Card.created_at)
+                .limit(self.batch_size)
+            )
+            if not ids:
+                return deleted
+
+            self.db.query(Card).filter(Card.id.in_(ids)).delete(synchronize_session=False)
+            self.db.commit()
+            deleted += len(ids)
+
+    def purge_events(self, cutoff: datetime) -> Dict[str, int]:
+        """Delete events older than cutoff together with the rows that reference them"""
+        totals = {"events_deleted": 0, "event_cards_deleted": 0, "links_deleted": 0}
+        deleted_ids: List[int] = []
+        while True:
+            ids = self._scalar_ids(
+                self.db.query(Event.id)
+                .filter(Event.ts < cutoff)
+                .order_by(Event.ts)
+                .limit(self.batch_size)
+            )
+            if not ids:
+                # Imported lazily so the scheduler does not pull NumPy into app startup
+                from app.services.embedding_service import EmbeddingService
+                totals["vectors_deleted"] = EmbeddingService(self.db).remove_events(deleted_ids)
+                return totals
+
+            deleted_ids.extend(ids)
+
+            for key, count in self._delete_event_batch(ids).items():
+                totals[key] = totals.get(key, 0) + count
+            self.db.commit()
+
+    def _delete_event_batch(self, ids: List[int]) -> Dict[str, int]:
+        """Delete one batch of events and their dependent rows (caller commits)"""
+        links_deleted = self.db.query(Link).filter(
+            or_(Link.event_id.in_(ids), Link.related_event_id.in_(ids))
+        ).delete(synchronize_session=False)
+        self.db.query(EventUrl).filter(EventUrl.event_id.in_(ids)).delete(synchronize_session=False)
+        self.db.query(SimhashBand).filter(SimhashBand.event_id.in_(ids)).delete(synchronize_session=False)
+        cards_deleted = self.db.query(Card).filter(
+            Card.primary_event_id.in_(ids)
+        ).delete(synchronize_session=False)
+        events_deleted = self.db.query(Event).filter(
+            Event.id.in_(ids)
+        ).delete(synchronize_session=False)
+
+        return {
+            "events_deleted": events_deleted,
+            "event_cards_deleted": cards_deleted,
+            "links_deleted": links_deleted,
+        }
+
+    def purge_runs(self, cutoff: datetime) -> int:
+        """Delete finished runs started before cutoff"""
+        deleted = 0
+        while True:
+            ids = self._scalar_ids(
+                self.db.query(Run.id)
+                .filter(Run.started_at < cutoff, Run.status != 'running')
+                .order_by(Run.started_at)
+                .limit(self.batch_size)
+            )
+            if not ids:
+                return deleted
+
+            self.db.query(Run).filter(Run.id.in_(ids)).delete(synchronize_session=False)
+            self.db.commit()
+            deleted += len(ids)
+
+    def purge_snapshots(self, cutoff: datetime) -> int:
+        """Delete brief snapshots created before cutoff, always keeping the newest"""
+        newest = self.db.query(BriefSnapshot.id).order_by(BriefSnapshot.id.desc()).limit(1).scalar()
+        if newest is None:
+            return 0
+
+        deleted = self.db.query(BriefSnapshot).filter(
+            BriefSnapshot.created_at < cutoff, BriefSnapshot.id != newest
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
+
+    def incremental_vacuum(self) -> Dict[str, Any]:
+        """Return freed SQLite pages to the filesystem a chunk at a time"""
+        bind = self.db.get_bind()
+        if bind.dialect.name != 'sqlite':
+            return {"skipped": True}
+
+        # VACUUM and auto_vacuum changes cannot run inside a transaction
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+            if mode != 2:
+                # Switching an existing database to incremental mode needs one full VACUUM
+                conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+                conn.execute(text("VACUUM"))
+                return {"mode_changed": True, "pages_freed": 0}
+
+            free_before = conn.execute(text("PRAGMA freelist_count")).scalar() or 0
+            # executescript() steps the pragma to completion; execute() would free a single page
+            conn.connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({int(settings.retention_vacuum_pages)});"
+            )
+            free_after = conn.execute(text("PRAGMA freelist_count")).scalar() or 0
+
+        return {"mode_changed": False, "pages_freed": free_before - free_after}
+
+    @staticmethod
+    def _scalar_ids(query) -> List[int]:
+        return [row[0] for row in query.all()]
+
+def run_retention_job() -> Dict[str, Any]:
+    """Scheduled entry point - opens its own session"""
+    db = SessionLocal()
+    try:
+        stats = RetentionService(db).run()
+        print(f"Retention completed: {stats.get('events_deleted', 0)} events, "
+              f"{stats.get('cards_deleted', 0)} cards, {stats.get('runs_deleted', 0)} runs deleted")
+        return stats
+    finally:
+        db.close()
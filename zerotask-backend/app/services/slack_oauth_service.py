@@ -3,11 +3,13 @@ import json
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
-import httpx
 
 from app.models.tokens import OAuthToken
 from app.config import settings
 from app.utils.encryption import token_encryption
+from app.utils.token_cache import token_cache
+from app.utils.resilience import http_request, SourceUnavailableError
+from app.services.dead_letter_service import DeadLetterService
 
 class SlackOAuthService:
     """Slack OAuth 2.0 service for individual user connections"""
@@ -62,7 +64,7 @@ class SlackOAuthService:
             'redirect_uri': 'https://1012d16f9d68.ngrok-free.app/oauth2/slack/callback'
         }
         
-        response = httpx.post(token_url, data=data)
+        response = http_request('slack', 'oauth.v2.access', 'POST', token_url, data=data)
         response.raise_for_status()
         
         token_data = response.json()
@@ -107,8 +109,8 @@ class SlackOAuthService:
         try:
             # Use users.info API to get user profile
             profile_url = 'https://slack.com/api/users.info'
-            response = httpx.get(
-                profile_url,
+            response = http_request(
+                'slack', 'users.info', 'GET', profile_url,
                 headers={'Authorization': f'Bearer {access_token}'},
                 params={'user': user_id}
             )
@@ -175,6 +177,7 @@ class SlackOAuthService:
                 self.db.add(new_token)
             
             self.db.commit()
+            token_cache.invalidate('oauth:slack')
             
         except Exception as e:
             self.db.rollback()
@@ -182,6 +185,11 @@ class SlackOAuthService:
     
     def get_valid_credentials(self) -> Optional[str]:
         """Get valid Slack credentials (access token)"""
+        cached = token_cache.get('oauth:slack')
+        if cached:
+            return cached[0]['access_token']
+        
+        version = token_cache.version('oauth:slack')
         token_record = self.db.query(OAuthToken).filter(
             OAuthToken.provider == 'slack',
             OAuthToken.is_active == True
@@ -193,12 +201,14 @@ class SlackOAuthService:
         try:
             # Decrypt token
             access_token = token_encryption.decrypt_token(token_record.encrypted_access_token)
+            token_cache.put('oauth:slack', {'access_token': access_token}, expires_at=token_record.expires_at, version=version)
             return access_token
             
         except Exception as e:
             # Mark token as inactive if decryption fails
             token_record.is_active = False
             self.db.commit()
+            token_cache.invalidate('oauth:slack')
             raise ValueError(f"Failed to get valid credentials: {str(e)}")
     
     def revoke_tokens(self) -> bool:
@@ -209,7 +219,7 @@ class SlackOAuthService:
             if access_token:
                 # Revoke token with Slack
                 revoke_url = 'https://slack.com/api/auth.revoke'
-                response = httpx.post(revoke_url, headers={'Authorization': f'Bearer {access_token}'})
+                response = http_request('slack', 'auth.revoke', 'POST', revoke_url, headers={'Authorization': f'Bearer {access_token}'})
                 # Note: Slack auth.revoke might not be available for user tokens, but we'll try
             
             # Remove from database
@@ -217,6 +227,7 @@ class SlackOAuthService:
             if token_record:
                 self.db.delete(token_record)
                 self.db.commit()
+            token_cache.invalidate('oauth:slack')
             
             return True
             
@@ -288,8 +299,8 @@ class SlackOAuthService:
             raise ValueError("Not authenticated with Slack")
         
         try:
-            response = httpx.get(
-                'https://slack.com/api/conversations.list',
+            response = http_request(
+                'slack', 'conversations.list', 'GET', 'https://slack.com/api/conversations.list',
                 headers={'Authorization': f'Bearer {access_token}'},
                 params={'types': 'public_channel,private_channel'}
             )
@@ -312,9 +323,50 @@ class SlackOAuthService:
             
             return channels
             
+        except SourceUnavailableError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to fetch channels: {str(e)}")
     
+    def get_channel_messages(self, channel: Dict[str, Any], oldest: float, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get messages posted in one channel since the `oldest` timestamp"""
+        access_token = self.get_valid_credentials()
+        if not access_token:
+            raise ValueError("Not authenticated with Slack")
+        
+        response = http_request(
+            'slack', 'conversations.history', 'GET', 'https://slack.com/api/conversations.history',
+            headers={'Authorization': f'Bearer {access_token}'},
+            params={
+                'channel': channel['id'],
+                'oldest': oldest,
+                'limit': limit
+            }
+        )
+        response.raise_for_status()
+        
+        data = response.json()
+        if not data.get('ok'):
+            raise ValueError(f"Slack API error for #{channel['name']}: {data.get('error', 'Unknown error')}")
+        
+        messages = []
+        for message in data.get('messages', []):
+            # Skip messages from bots unless they mention the user
+            if message.get('subtype') == 'bot_message':
+                continue
+                
+            messages.append({
+                'channel_id': channel['id'],
+                'channel_name': channel['name'],
+                'timestamp': message.get('ts'),
+                'user': message.get('user'),
+                'text': message.get('text', ''),
+                'thread_ts': message.get('thread_ts'),
+                'reply_count': message.get('reply_count', 0),
+                'is_thread_reply': message.get('thread_ts') and message.get('thread_ts') != message.get('ts')
+            })
+        return messages
+    
     def get_messages_today(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get messages from today across channels the user has access to"""
         access_token = self.get_valid_credentials()
@@ -337,42 +389,18 @@ class SlackOAuthService:
             for channel in accessible_channels:
                 try:
                     print(f"Fetching messages from #{channel['name']} (is_member: {channel.get('is_member')})")
-                    response = httpx.get(
-                        'https://slack.com/api/conversations.history',
-                        headers={'Authorization': f'Bearer {access_token}'},
-                        params={
-                            'channel': channel['id'],
-                            'oldest': today_timestamp,
-                            'limit': 20
-                        }
-                    )
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    if data.get('ok'):
-                        messages = data.get('messages', [])
-                        print(f"  -> Found {len(messages)} messages in #{channel['name']}")
-                        for message in messages:
-                            # Skip messages from bots unless they mention the user
-                            if message.get('subtype') == 'bot_message':
-                                continue
-                                
-                            message_data = {
-                                'channel_id': channel['id'],
-                                'channel_name': channel['name'],
-                                'timestamp': message.get('ts'),
-                                'user': message.get('user'),
-                                'text': message.get('text', ''),
-                                'thread_ts': message.get('thread_ts'),
-                                'reply_count': message.get('reply_count', 0),
-                                'is_thread_reply': message.get('thread_ts') and message.get('thread_ts') != message.get('ts')
-                            }
-                            all_messages.append(message_data)
-                    else:
-                        print(f"  -> API Error for #{channel['name']}: {data.get('error', 'Unknown error')}")
+                    messages = self.get_channel_messages(channel, today_timestamp)
+                    print(f"  -> Found {len(messages)} messages in #{channel['name']}")
+                    all_messages.extend(messages)
                             
+                except SourceUnavailableError:
+                    # Slack is down, not this channel: the whole fetch fails fast
+                    raise
                 except Exception as e:
                     print(f"  -> Exception fetching messages from #{channel['name']}: {str(e)}")
+                    DeadLetterService(self.db).record(
+                        'slack', 'channel', channel['id'], str(e), {'name': channel['name'], 'oldest': today_timestamp}
+                    )
                     continue
             
             # Sort by timestamp (most recent first)
@@ -380,6 +408,8 @@ class SlackOAuthService:
             
             return all_messages[:limit]
             
+        except SourceUnavailableError:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to fetch messages: {str(e)}")
     
@@ -400,8 +430,8 @@ class SlackOAuthService:
             today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
             today_str = today.strftime('%Y-%m-%d')
             
-            response = httpx.get(
-                'https://slack.com/api/search.messages',
+            response = http_request(
+                'slack', 'search.messages', 'GET', 'https://slack.com/api/search.messages',
                 headers={'Authorization': f'Bearer {access_token}'},
                 params={
                     'query': f'<@{user_id}> after:{today_str}',
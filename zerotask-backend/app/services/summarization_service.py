@@ -0,0 +1,182 @@
+import re
+import json
+import time
+import asyncio
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.llm_service import OllamaClient, get_llm_client
+from app.services.llm_queue_service import get_llm_queue
+from app.services.summary_cache_service import SummaryCacheService
+from app.utils.token_budget import estimate_tokens, truncate_to_tokens, first_fit_decreasing, fill_ratio
+
+SUMMARY_TEMPLATE_VERSION = "batch-v1"  # bump when the prompt changes; invalidates cached summaries
+
+SYSTEM_PROMPT = (
+    "You write a busy engineer's daily brief. Be terse and concrete: who, what, "
+    "and what the reader needs to do, if anything. Never invent details."
+)
+
+SUMMARY_INSTRUCTION = "Summarize each numbered item below in one or two sentences."
+
+RESPONSE_FORMAT = (
+    'Respond with JSON only: {"summaries": [{"id": <item number>, "summary": "<text>"}]}, '
+    "with exactly one entry per item.\n"
+)
+
+ITEM_OVERHEAD_TOKENS = 8  # "### ITEM n" header and separators
+RESPONSE_OVERHEAD_TOKENS = 32  # JSON envelope of the reply
+
+_NUMBERED_LINE = re.compile(r'^\s*(?:item\s*)?#?(\d+)\s*[\.:\)\-]\s*(.+)$', re.IGNORECASE)
+
+class SummarizationService:
+    """Batched LLM summarization - PRD Section 14 (several items per call)
+
+    Items are sized with a local token estimate, truncated to a per-item cap and
+    packed into prompts that fit the model's context window (first-fit
+    decreasing). Batches go through the LLM job queue at this service's priority
+    and each reply is split back into per-item summaries; items the model
+    skipped are retried on their own. Per-item results go through the summary
+    cache, written as each batch finishes so a run cut short by its deadline
+    keeps the work already done. Items the LLM still fails on are served from
+    expired cache entries when there are any; their keys end up in `stale`.
+    """
+
+    def __init__(self, db: Session, client: Optional[OllamaClient] = None,
+                 instruction: str = SUMMARY_INSTRUCTION, template_version: str = SUMMARY_TEMPLATE_VERSION,
+                 priority: str = "brief", group: Optional[str] = None):
+        self.db = db
+        self.priority = priority
+        self.group = group
+        self.client = client or get_llm_client()
+        self.cache = SummaryCacheService(db)
+        self.prompt_header = f"{instruction}\n{RESPONSE_FORMAT}"
+        self.template_version = template_version
+        self.stats: Dict[str, Any] = {}
+        self.stale: Set[Hashable] = set()
+
+    @property
+    def batch_capacity(self) -> int:
+        """Prompt + output tokens available to items in one call"""
+        fixed = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(self.prompt_header) + RESPONSE_OVERHEAD_TOKENS
+        return max(settings.llm_context_tokens - fixed, settings.llm_summary_tokens + ITEM_OVERHEAD_TOKENS)
+
+    def plan(self, items: Dict[Hashable, str]) -> Tuple[List[List[Hashable]], Dict[Hashable, str], Dict[Hashable, int]]:
+        """Bins of item keys, the (truncated) text per item and each item's token cost"""
+        capacity = self.batch_capacity
+        item_budget = min(settings.llm_item_max_tokens, capacity - settings.llm_summary_tokens - ITEM_OVERHEAD_TOKENS)
+        texts = {key: truncate_to_tokens(text, item_budget) for key, text in items.items()}
+        sizes = {
+            key: estimate_tokens(text) + ITEM_OVERHEAD_TOKENS + settings.llm_summary_tokens
+            for key, text in texts.items()
+        }
+        return first_fit_decreasing(sizes, capacity, settings.llm_batch_max_items), texts, sizes
+
+    async def summarize(self, items: Dict[Hashable, str], bypass_cache: bool = False,
+                        on_result: Optional[Callable[[Dict[Hashable, str]], None]] = None) -> Dict[Hashable, str]:
+        """Summaries keyed like `items`; items that could not be summarized are left out
+
+        `on_result` is called with partial results as they become available
+        (cache hits first, then each finished batch).
+        """
+        started = time.perf_counter()
+        model = self.client.model
+        results = self.cache.get_many(model, self.template_version, items, bypass=bypass_cache)
+        if results and on_result:
+            on_result(results)
+        pending = {key: text for key, text in items.items() if key not in results}
+
+        bins, texts, sizes = self.plan(pending)
+        generated = await self._run_batches(bins, texts, pending, on_result)
+
+        # Items the model skipped or garbled get one retry on their own
+        missing = [key for key in pending if key not in generated]
+        if missing:
+            generated.update(await self._run_batches([[key] for key in missing], texts, pending, on_result))
+        results.update(generated)
+
+        # LLM down or failing: an expired summary of the same input beats none
+        failed = {key: text for key, text in pending.items() if key not in generated}
+        stale = self.cache.get_many(model, self.template_version, failed, allow_stale=True) if failed and not bypass_cache else {}
+        if stale and on_result:
+            on_result(stale)
+        results.update(stale)
+        self.stale = set(stale)
+
+        self.stats = {
+            "items": len(items),
+            "cached": len(items) - len(pending),
+            "batches": len(bins),
+            "fill_ratio": round(fill_ratio(bins, sizes, self.batch_capacity), 3),
+            "retried": len(missing),
+            "failed": len(pending) - len(generated),
+            "stale": len(stale),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        return results
+
+    async def _run_batches(self, bins: List[List[Hashable]], texts: Dict[Hashable, str], items: Dict[Hashable, str],
+                           on_result: Optional[Callable[[Dict[Hashable, str]], None]] = None) -> Dict[Hashable, str]:
+        """Run the bins concurrently; each batch's summaries are cached (keyed by the item's full text) as it finishes"""
+        queue = get_llm_queue()
+        model = self.client.model
+
+        async def run(batch: List[Hashable]) -> Dict[Hashable, str]:
+            try:
+                outcome = await queue.run(self.priority, lambda: self._summarize_batch(batch, texts), group=self.group)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Summary batch of {len(batch)} items failed: {str(e)}")
+                return {}
+            if outcome:
+                self.cache.put_many(model, self.template_version, {items[key]: summary for key, summary in outcome.items()})
+                if on_result:
+                    on_result(outcome)
+            return outcome
+
+        summaries: Dict[Hashable, str] = {}
+        for outcome in await asyncio.gather(*(run(batch) for batch in bins)):
+            summaries.update(outcome)
+        return summaries
+
+    async def _summarize_batch(self, batch: List[Hashable], texts: Dict[Hashable, str]) -> Dict[Hashable, str]:
+        prompt = self.prompt_header + "".join(
+            f"\n### ITEM {number}\n{texts[key]}\n" for number, key in enumerate(batch, start=1)
+        )
+        stream = await self.client.generate(
+            prompt,
+            system=SYSTEM_PROMPT,
+            format="json",
+            options={
+                "num_ctx": settings.llm_context_tokens,
+                "num_predict": settings.llm_summary_tokens * len(batch) + RESPONSE_OVERHEAD_TOKENS,
+                "temperature": 0.2,
+            },
+        )
+        by_number = self.parse_output(stream.text)
+        return {key: by_number[number] for number, key in enumerate(batch, start=1) if by_number.get(number)}
+
+    @staticmethod
+    def parse_output(output: str) -> Dict[int, str]:
+        """Item number -> summary from the model's JSON reply (numbered lines as fallback)"""
+        try:
+            data = json.loads(output)
+            entries = data.get("summaries", []) if isinstance(data, dict) else data
+            parsed = {}
+            for entry in entries:
+                if isinstance(entry, dict) and str(entry.get("id", "")).strip().isdigit() and entry.get("summary"):
+                    parsed[int(str(entry["id"]).strip())] = str(entry["summary"]).strip()
+            if parsed:
+                return parsed
+        except (ValueError, AttributeError, TypeError):
+            pass
+
+        parsed = {}
+        for line in output.splitlines():
+            match = _NUMBERED_LINE.match(line)
+            if match:
+                parsed[int(match.group(1))] = match.group(2).strip()
+        return parsed
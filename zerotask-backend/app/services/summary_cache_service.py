@@ -0,0 +1,199 @@
+import re
+import hashlib
+import threading
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.llm_cache import LLMCacheEntry
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Process-wide counters, reported by stats()
+_counters = {"hits": 0, "stale_hits": 0, "misses": 0, "bypassed": 0, "evicted": 0}
+_counters_lock = threading.Lock()
+
+def _count(name: str, amount: int = 1) -> None:
+    with _counters_lock:
+        _counters[name] += amount
+
+def normalize_input(text: str) -> str:
+    """Canonical form of LLM input so cosmetic differences do not defeat the cache"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text or '')).strip()
+
+def make_cache_key(model: str, template_version: str, text: str) -> str:
+    payload = "\x1f".join((model, template_version, normalize_input(text)))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class SummaryCacheService:
+    """Persistent LLM response cache keyed by content hash - PRD Section 7.3
+
+    Entries are fresh for llm_cache_ttl_hours. Expired entries are no longer
+    served to normal runs but stay available to offline briefs (allow_stale)
+    until retention purges them. The table is capped at llm_cache_max_entries
+    by evicting the least recently used rows.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, model: str, template_version: str, text: str, allow_stale: bool = False,
+            bypass: bool = False) -> Optional[str]:
+        """Cached response, or None on a miss"""
+        if bypass or not settings.llm_cache_enabled:
+            _count("bypassed")
+            return None
+
+        now = datetime.utcnow()
+        entry = self.db.query(LLMCacheEntry).filter(
+            LLMCacheEntry.cache_key == make_cache_key(model, template_version, text)
+        ).first()
+        if entry is None or (entry.expires_at.replace(tzinfo=None) <= now and not allow_stale):
+            _count("misses")
+            return None
+
+        _count("hits" if entry.expires_at.replace(tzinfo=None) > now else "stale_hits")
+        entry.hits = (entry.hits or 0) + 1
+        entry.last_used_at = now
+        self.db.commit()
+        return entry.response
+
+    def get_many(self, model: str, template_version: str, texts: Dict[Hashable, str],
+                 bypass: bool = False, allow_stale: bool = False) -> Dict[Hashable, str]:
+        """Fresh cached responses for many inputs with one lookup and one commit
+
+        With allow_stale, expired entries are served too; this is the fallback
+        for inputs the LLM could not summarize, already counted as misses.
+        """
+        if bypass or not settings.llm_cache_enabled:
+            _count("bypassed", len(texts))
+            return {}
+
+        now = datetime.utcnow()
+        keys_by_hash: Dict[str, list] = {}
+        for key, text in texts.items():
+            keys_by_hash.setdefault(make_cache_key(model, template_version, text), []).append(key)
+
+        found: Dict[Hashable, str] = {}
+        hit_ids = []
+        hashes = list(keys_by_hash)
+        for start in range(0, len(hashes), 900):
+            query = self.db.query(LLMCacheEntry.id, LLMCacheEntry.cache_key, LLMCacheEntry.response).filter(
+                LLMCacheEntry.cache_key.in_(hashes[start:start + 900])
+            )
+            if not allow_stale:
+                query = query.filter(LLMCacheEntry.expires_at > now)
+            rows = query.all()
+            for entry_id, cache_key, response in rows:
+                hit_ids.append(entry_id)
+                for key in keys_by_hash[cache_key]:
+                    found[key] = response
+
+        if hit_ids:
+            for start in range(0, len(hit_ids), 900):
+                self.db.query(LLMCacheEntry).filter(LLMCacheEntry.id.in_(hit_ids[start:start + 900])).update(
+                    {LLMCacheEntry.hits: LLMCacheEntry.hits + 1, LLMCacheEntry.last_used_at: now},
+                    synchronize_session=False,
+                )
+            self.db.commit()
+
+        if allow_stale:
+            _count("stale_hits", len(found))
+        else:
+            _count("hits", len(found))
+            _count("misses", len(texts) - len(found))
+        return found
+
+    def put(self, model: str, template_version: str, text: str, response: str) -> None:
+        """Insert or refresh an entry, then enforce the size cap"""
+        self.put_many(model, template_version, {text: response})
+
+    def put_many(self, model: str, template_version: str, responses: Dict[str, str]) -> None:
+        """Upsert responses keyed by input text in one transaction, then enforce the size cap"""
+        if not settings.llm_cache_enabled or not responses:
+            return
+
+        now = datetime.utcnow()
+        expires_at = now + timedelta(hours=settings.llm_cache_ttl_hours)
+        try:
+            for text, response in responses.items():
+                statement = insert(LLMCacheEntry).values(
+                    cache_key=make_cache_key(model, template_version, text),
+                    model=model,
+                    template_version=template_version,
+                    response=response,
+                    hits=0,
+                    last_used_at=now,
+                    expires_at=expires_at,
+                )
+                statement = statement.on_conflict_do_update(
+                    index_elements=[LLMCacheEntry.cache_key],
+                    set_={"response": response, "last_used_at": now, "expires_at": expires_at},
+                )
+                self.db.execute(statement)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Failed to cache LLM response: {str(e)}")
+
+        self.evict()
+
+    async def get_or_generate(
+        self,
+        model: str,
+        template_version: str,
+        text: str,
+        generate: Callable[[], Awaitable[str]],
+        bypass: bool = False,
+    ) -> str:
+        """Serve from cache or call the LLM; falls back to a stale entry if the LLM is unavailable"""
+        cached = self.get(model, template_version, text, bypass=bypass)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await generate()
+        except Exception:
+            stale = None if bypass else self.get(model, template_version, text, allow_stale=True)
+            if stale is None:
+                raise
+            return stale
+
+        self.put(model, template_version, text, response)
+        return response
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond llm_cache_max_entries"""
+        excess = self.db.query(LLMCacheEntry.id).count() - settings.llm_cache_max_entries
+        if excess <= 0:
+            return 0
+
+        ids = [row[0] for row in self.db.query(LLMCacheEntry.id).order_by(LLMCacheEntry.last_used_at).limit(excess)]
+        self.db.query(LLMCacheEntry).filter(LLMCacheEntry.id.in_(ids)).delete(synchronize_session=False)
+        self.db.commit()
+        _count("evicted", len(ids))
+        return len(ids)
+
+    def purge_stale(self, now: Optional[datetime] = None) -> int:
+        """Delete entries past the offline grace period (called by retention)"""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=settings.llm_cache_stale_days)
+        deleted = self.db.query(LLMCacheEntry).filter(
+            LLMCacheEntry.expires_at < cutoff
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        with _counters_lock:
+            counters = dict(_counters)
+        # Stale hits come from a second lookup of items that already missed
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "entries": self.db.query(LLMCacheEntry.id).count(),
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else None,
+        }
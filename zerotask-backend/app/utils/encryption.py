@@ -1,46 +1,146 @@
 import os
+import hmac
+import json
 import base64
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import hashlib
+import threading
+from typing import Optional
 from app.config import settings
 
+KDF_SALT = b'zerotask-salt-v1'  # Static salt for consistent key derivation
+KDF_ITERATIONS = 100000  # Strong iteration count
+KEYRING_SERVICE = "zerotask"
+
 class TokenEncryption:
-    """Secure token encryption utility - PRD Section 7.5 Data Governance"""
-    
+    """Secure token encryption utility - PRD Section 7.5 Data Governance
+
+    The PBKDF2 key is derived lazily on first use instead of at import time, and
+    cached in a protected key file (or the OS keyring) together with an HMAC
+    fingerprint of the machine_id/app_secret inputs. A changed secret or machine
+    id invalidates the cache and triggers a fresh derivation.
+
+    Keys derived from settings.previous_app_secrets stay valid for decryption
+    (MultiFernet), so tokens written under an old secret remain readable until
+    the key rotation job has re-encrypted them with the current key.
+    """
+
     def __init__(self):
-        self.key = self._derive_key()
-        self.fernet = Fernet(self.key)
-    
-    def _derive_key(self) -> bytes:
-        """Derive encryption key from machine-specific data + app secret"""
+        self._key = None
+        self._fernet = None
+        self._key_id = None
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> bytes:
+        if self._key is None:
+            with self._lock:
+                if self._key is None:
+                    self._key = self._load_or_derive_key()
+        return self._key
+
+    @property
+    def fernet(self):
+        if self._fernet is None:
+            from cryptography.fernet import Fernet, MultiFernet
+            # Current key first: it encrypts, and most tokens decrypt on the first try
+            keys = [Fernet(self.key)]
+            keys += [Fernet(self._derive_key(self._password(secret))) for secret in settings.previous_app_secrets]
+            self._fernet = MultiFernet(keys)
+        return self._fernet
+
+    @property
+    def key_id(self) -> str:
+        """Short non-secret identifier of the current key (used to checkpoint rotations)"""
+        if self._key_id is None:
+            self._key_id = hashlib.sha256(self.key).hexdigest()[:16]
+        return self._key_id
+
+    @staticmethod
+    def _password(secret: Optional[str] = None) -> bytes:
         # Use machine ID and app secret from settings
-        machine_id = settings.machine_id
-        app_secret = settings.app_secret
-        
-        password = f"{machine_id}:{app_secret}".encode()
-        salt = b'zerotask-salt-v1'  # Static salt for consistent key derivation
-        
+        return f"{settings.machine_id}:{secret or settings.app_secret}".encode()
+
+    def _derive_key(self, password: Optional[bytes] = None) -> bytes:
+        """Derive encryption key from machine-specific data + app secret"""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
-            salt=salt,
-            iterations=100000,  # Strong iteration count
+            salt=KDF_SALT,
+            iterations=KDF_ITERATIONS,
         )
-        key = base64.urlsafe_b64encode(kdf.derive(password))
+        key = base64.urlsafe_b64encode(kdf.derive(password or self._password()))
         return key
-    
+
+    def _fingerprint(self, key: bytes) -> str:
+        """Bind a cached key to its KDF inputs without storing them"""
+        message = self._password() + KDF_SALT + str(KDF_ITERATIONS).encode()
+        return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+    def _load_or_derive_key(self) -> bytes:
+        cached = self._read_cache()
+        if cached:
+            key = cached.get("key", "").encode()
+            if key and hmac.compare_digest(cached.get("fingerprint", ""), self._fingerprint(key)):
+                return key
+
+        key = self._derive_key()
+        self._write_cache({"key": key.decode(), "fingerprint": self._fingerprint(key)})
+        return key
+
+    def _read_cache(self) -> dict:
+        backend = settings.encryption_key_cache
+        try:
+            if backend == "keyring":
+                import keyring
+                value = keyring.get_password(KEYRING_SERVICE, settings.machine_id)
+                return json.loads(value) if value else {}
+            if backend == "file" and os.path.exists(settings.encryption_key_file):
+                with open(settings.encryption_key_file) as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable encryption key cache: {str(e)}")
+        return {}
+
+    def _write_cache(self, entry: dict) -> None:
+        backend = settings.encryption_key_cache
+        try:
+            if backend == "keyring":
+                import keyring
+                keyring.set_password(KEYRING_SERVICE, settings.machine_id, json.dumps(entry))
+            elif backend == "file":
+                path = settings.encryption_key_file
+                directory = os.path.dirname(path) or "."
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                # Owner-only permissions from the moment the file exists
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            # Caching is an optimization; derivation still works without it
+            print(f"Could not cache encryption key ({backend}): {str(e)}")
+
     def encrypt_token(self, token: str) -> str:
         """Encrypt API token for secure storage"""
         if not token:
             raise ValueError("Token cannot be empty")
         return self.fernet.encrypt(token.encode()).decode()
-    
+
     def decrypt_token(self, encrypted_token: str) -> str:
         """Decrypt stored token for API calls"""
         if not encrypted_token:
             raise ValueError("Encrypted token cannot be empty")
         return self.fernet.decrypt(encrypted_token.encode()).decode()
 
-# Global encryption instance
-token_encryption = TokenEncryption()
\ No newline at end of file
+    def rotate_token(self, encrypted_token: str) -> str:
+        """Re-encrypt a stored token under the current key (accepts any known key)"""
+        if not encrypted_token:
+            raise ValueError("Encrypted token cannot be empty")
+        return self.fernet.rotate(encrypted_token.encode()).decode()
+
+# Global encryption instance (key is derived on first encrypt/decrypt)
+token_encryption = TokenEncryption()
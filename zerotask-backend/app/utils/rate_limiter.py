@@ -0,0 +1,46 @@
+import time
+import threading
+from typing import Optional
+
+class TokenBucket:
+    """Thread-safe token bucket: `calls` per `per_seconds`, with bursts of up to `calls`
+
+    acquire() blocks the calling (worker) thread until a token is free and
+    returns how long it waited; with max_wait it gives up instead of waiting
+    longer and returns None.
+    """
+
+    def __init__(self, calls: int, per_seconds: float):
+        self.capacity = float(max(calls, 1))
+        self.rate = self.capacity / max(per_seconds, 0.001)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, possibly borrowing ahead; returns the wait until it is really available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def _release(self) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def delay(self) -> float:
+        """Seconds until a token is free, without taking it"""
+        with self._lock:
+            tokens = min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+            return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def acquire(self, max_wait: Optional[float] = None) -> Optional[float]:
+        wait = self._reserve()
+        if max_wait is not None and wait > max_wait:
+            self._release()
+            return None
+        if wait > 0:
+            time.sleep(wait)
+        return wait
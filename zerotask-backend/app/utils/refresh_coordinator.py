@@ -0,0 +1,88 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class RefreshCoordinator:
+    """Single-flight token refresh with exponential backoff on transient failures
+
+    The first caller for a key runs the refresh; callers arriving while it is in
+    flight wait for and share its result instead of refreshing again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._failures: Dict[str, Tuple[int, datetime]] = {}
+
+    def run(self, key: str, refresh: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if leader:
+            try:
+                flight.result = refresh()
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.done.set()
+        elif not flight.done.wait(timeout or settings.token_refresh_wait_timeout):
+            raise TimeoutError(f"Timed out waiting for {key} token refresh")
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def run_in_background(self, key: str, refresh: Callable[[], Any]) -> bool:
+        """Start a refresh on a daemon thread unless one is in flight or backing off"""
+        with self._lock:
+            if key in self._flights:
+                return False
+        if self.retry_at(key):
+            return False
+
+        def target():
+            try:
+                self.run(key, refresh)
+            except Exception as e:
+                print(f"Background {key} token refresh failed: {str(e)}")
+
+        threading.Thread(target=target, name=f"token-refresh-{key}", daemon=True).start()
+        return True
+
+    def retry_at(self, key: str) -> Optional[datetime]:
+        """When the next attempt is allowed, or None if not backing off"""
+        with self._lock:
+            failure = self._failures.get(key)
+        if failure and failure[1] > datetime.utcnow():
+            return failure[1]
+        return None
+
+    def record_failure(self, key: str) -> datetime:
+        with self._lock:
+            count = self._failures.get(key, (0, None))[0] + 1
+            delay = min(settings.token_refresh_backoff_base * 2 ** (count - 1), settings.token_refresh_backoff_max)
+            retry_at = datetime.utcnow() + timedelta(seconds=delay)
+            self._failures[key] = (count, retry_at)
+        return retry_at
+
+    def record_success(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+
+# Global refresh coordinator shared by OAuth services
+refresh_coordinator = RefreshCoordinator()
@@ -0,0 +1,198 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+import httpx
+
+from app.config import settings
+
+T = TypeVar("T")
+
+class SourceUnavailableError(Exception):
+    """Raised instead of calling a source whose circuit breaker is open (or whose API budget is spent)"""
+
+    def __init__(self, source: str, endpoint: str, retry_after: float, reason: str = "circuit open"):
+        super().__init__(f"{source} is unavailable ({endpoint} {reason}, retry in {retry_after:.0f}s)")
+        self.source = source
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+# Absolute time.monotonic() by which the current request/run must be done; set per task/thread context
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+@contextmanager
+def deadline_scope(seconds: float, inherit: bool = True) -> Iterator[float]:
+    """Bound outbound calls made in this context (and tasks/threads started from it) to `seconds`
+
+    A nested scope can only shorten an inherited deadline. `inherit=False` starts
+    a fresh one, for work that outlives the request that started it.
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if inherit and current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+def time_remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def call_timeout(default: Optional[float] = None) -> float:
+    """Timeout for one outbound call: the per-call default, cut short by the current deadline"""
+    timeout = default or settings.connector_timeout
+    remaining = time_remaining()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise TimeoutError("Deadline exceeded before the call was made")
+    return min(timeout, remaining)
+
+def is_timeout(error: BaseException) -> bool:
+    return isinstance(error, (httpx.TimeoutException, TimeoutError))
+
+def is_outage(error: BaseException) -> bool:
+    """Whether an error means the source is struggling (timeouts, connection errors, 429/5xx)"""
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    else:
+        # googleapiclient's HttpError keeps the status on .resp
+        status = getattr(getattr(error, "resp", None), "status", None)
+    try:
+        return status is not None and (int(status) == 429 or int(status) >= 500)
+    except (TypeError, ValueError):
+        return False
+
+class CircuitBreaker:
+    """Closed -> open after circuit_failure_threshold outages in a row -> half-open after circuit_open_seconds
+
+    While open every call fails fast. Half-open lets circuit_half_open_probes
+    calls through: one success closes the circuit, one outage re-opens it.
+    Errors that are not outages (bad request, auth) count as the source being up.
+    A timeout only counts when the call had the endpoint's full timeout; one cut
+    short by the caller's deadline says nothing about the source.
+    """
+
+    def __init__(self, source: str, endpoint: str):
+        self.source = source
+        self.endpoint = endpoint
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.last_error: Optional[str] = None
+
+    def retry_after(self) -> float:
+        return max(self.opened_at + settings.circuit_open_seconds - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open":
+                if self.retry_after() > 0:
+                    return False
+                self.state = "half_open"
+                self.probes = 0
+            if self.state == "half_open":
+                if self.probes >= settings.circuit_half_open_probes:
+                    return False
+                self.probes += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.probes = 0
+
+    def release(self) -> None:
+        """Return a half-open probe slot without judging the source"""
+        with self._lock:
+            if self.state == "half_open" and self.probes > 0:
+                self.probes -= 1
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)[:500]
+            if self.state == "half_open" or self.failures >= settings.circuit_failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.probes = 0
+
+    def call(self, func: Callable[[float], T], timeout: Optional[float] = None) -> T:
+        """Run func(timeout) through the breaker; timeout comes from the current deadline"""
+        # An already expired deadline is the caller's problem: raised before the breaker sees the call
+        applied = call_timeout(timeout)
+        shortened = applied < (timeout or settings.connector_timeout)
+        if not self.allow():
+            raise SourceUnavailableError(self.source, self.endpoint, self.retry_after())
+        try:
+            result = func(applied)
+        except BaseException as e:
+            if shortened and is_timeout(e):
+                self.release()
+            elif is_outage(e):
+                self.record_failure(e)
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+class CircuitBreakerRegistry:
+    """One breaker per (source, endpoint), shared by every caller in the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, source: str, endpoint: str) -> CircuitBreaker:
+        key = f"{source}:{endpoint}"
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(source, endpoint)
+        return breaker
+
+    def call(self, source: str, endpoint: str, func: Callable[[float], T], timeout: Optional[float] = None) -> T:
+        return self.get(source, endpoint).call(func, timeout)
+
+    def open_endpoints(self, source: str) -> List[str]:
+        """Endpoints of a source that currently fail fast"""
+        with self._lock:
+            breakers = [breaker for breaker in self._breakers.values() if breaker.source == source]
+        return [breaker.endpoint for breaker in breakers if breaker.state == "open" and breaker.retry_after() > 0]
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [{
+            "source": breaker.source,
+            "endpoint": breaker.endpoint,
+            "state": breaker.state,
+            "failures": breaker.failures,
+            "retry_after": round(breaker.retry_after(), 1) if breaker.state == "open" else None,
+            "last_error": breaker.last_error,
+        } for breaker in breakers if breaker.state != "closed" or breaker.failures]
+
+# Global breakers shared by the connector services
+circuit_breakers = CircuitBreakerRegistry()
+
+def http_request(source: str, endpoint: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """httpx request through the (source, endpoint) breaker, timed out by the current deadline"""
+    def send(timeout: float) -> httpx.Response:
+        response = httpx.request(method, url, timeout=timeout, **kwargs)
+        if response.status_code == 429 or response.status_code >= 500:
+            response.raise_for_status()
+        return response
+
+    return circuit_breakers.call(source, endpoint, send)
@@ -0,0 +1,60 @@
+import re
+import hashlib
+from typing import List, Optional
+
+import numpy as np
+
+SIGNATURE_BITS = 64
+
+_SLACK_MARKUP = re.compile(r'<[@#!][^>]*>|<https?://[^>]*>')
+_URL = re.compile(r'https?://\S+')
+_REPLY_MARKER = re.compile(r'\b(re|fw|fwd)\s*:', re.IGNORECASE)
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens with URLs, Slack markup and Re:/Fwd: markers removed"""
+    text = _REPLY_MARKER.sub('', text or '')
+    text = _URL.sub(' ', _SLACK_MARKUP.sub(' ', text))
+    return _TOKEN.findall(text.lower())
+
+def _feature_hashes(tokens: List[str]) -> np.ndarray:
+    """Stable 64-bit hashes of word bigrams (unigrams for one-word texts)"""
+    if len(tokens) > 1:
+        features = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    else:
+        features = tokens
+    digests = b''.join(hashlib.blake2b(f.encode(), digest_size=8).digest() for f in features)
+    return np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8)
+
+def simhash(text: str, min_tokens: int = 1) -> Optional[int]:
+    """64-bit SimHash signature, or None when the text is too short to be meaningful"""
+    tokens = tokenize(text)
+    if len(tokens) < max(1, min_tokens):
+        return None
+
+    # One row of 64 bits per feature; each bit votes +1/-1 and the majority wins
+    bits = np.unpackbits(_feature_hashes(tokens), axis=1)
+    majority = bits.sum(axis=0, dtype=np.int32) * 2 > bits.shape[0]
+    return int.from_bytes(np.packbits(majority).tobytes(), 'big')
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+def band_keys(signature: int, bands: int) -> List[str]:
+    """Split a signature into LSH bands; signatures within (bands - 1) bits share at least one band"""
+    bands = max(1, min(bands, SIGNATURE_BITS))
+    keys = []
+    start = 0
+    for index in range(bands):
+        width = SIGNATURE_BITS // bands + (1 if index < SIGNATURE_BITS % bands else 0)
+        value = (signature >> (SIGNATURE_BITS - start - width)) & ((1 << width) - 1)
+        keys.append(f"{index}:{value:x}")
+        start += width
+    return keys
+
+def to_signed(signature: int) -> int:
+    """Store unsigned 64-bit signatures in SQLite's signed INTEGER"""
+    return signature - (1 << 64) if signature >= (1 << 63) else signature
+
+def from_signed(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
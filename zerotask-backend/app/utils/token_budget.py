@@ -0,0 +1,65 @@
+import re
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+_PIECE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+def estimate_tokens(text: str) -> int:
+    """Fast BPE-style token estimate without loading a tokenizer
+
+    Words split into roughly one token per 4 letters (common words are a
+    single token), digit runs into one per 3 digits, and every punctuation
+    mark or symbol counts as its own token. Errs on the high side, which is
+    what a context-window budget wants.
+    """
+    if not text:
+        return 0
+    tokens = 0
+    for piece in _PIECE.findall(text):
+        if piece.isalpha():
+            tokens += 1 + (len(piece) - 1) // 4
+        elif piece.isdigit():
+            tokens += 1 + (len(piece) - 1) // 3
+        else:
+            tokens += 1
+    return tokens
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text so estimate_tokens(result) <= max_tokens (keeps the beginning)"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip() + " ..."
+
+def first_fit_decreasing(
+    sizes: Dict[Hashable, int],
+    capacity: int,
+    max_items: int = 0,
+) -> List[List[Hashable]]:
+    """Pack items into as few bins of `capacity` as possible (first-fit decreasing)
+
+    Items larger than the capacity get a bin of their own; callers truncate
+    before packing. `max_items` optionally caps the number of items per bin.
+    """
+    bins: List[Tuple[int, List[Hashable]]] = []
+    for key in sorted(sizes, key=sizes.get, reverse=True):
+        size = sizes[key]
+        for index, (used, members) in enumerate(bins):
+            if used + size <= capacity and (not max_items or len(members) < max_items):
+                members.append(key)
+                bins[index] = (used + size, members)
+                break
+        else:
+            bins.append((size, [key]))
+    return [members for _, members in bins]
+
+def fill_ratio(bins: Sequence[Sequence[Hashable]], sizes: Dict[Hashable, int], capacity: int) -> float:
+    """Average share of each bin's capacity that is used"""
+    if not bins:
+        return 0.0
+    return sum(sum(sizes[key] for key in members) for members in bins) / (len(bins) * capacity)
@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple, Any
+
+from app.config import settings
+
+CacheKey = Tuple[str, str]
+
+class _CacheEntry:
+    __slots__ = ("secrets", "metadata", "expires_at")
+
+    def __init__(self, secrets: Dict[str, bytearray], metadata: Dict[str, Any], expires_at: datetime):
+        self.secrets = secrets
+        self.metadata = metadata
+        self.expires_at = expires_at
+
+    def wipe(self) -> None:
+        """Overwrite secret buffers in place before dropping them"""
+        for buffer in self.secrets.values():
+            buffer[:] = b"\x00" * len(buffer)
+        self.secrets.clear()
+
+class SecureTokenCache:
+    """Bounded in-memory cache of decrypted tokens keyed by (provider, account)
+
+    Entries live until the token's expires_at (minus a safety margin), the
+    configured TTL, or until store/revoke/refresh bumps the key's version.
+    Secrets are held as bytearrays and zeroed on eviction; strings handed to
+    callers are unavoidable copies, so this is best-effort hygiene, not a vault.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.token_cache_size
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._versions: Dict[CacheKey, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, provider: str, account: str = "default") -> int:
+        """Current version; pass it back to put() so stale reads are not cached"""
+        with self._lock:
+            return self._versions.get((provider, account), 0)
+
+    def get(self, provider: str, account: str = "default") -> Optional[Tuple[Dict[str, str], Dict[str, Any]]]:
+        """Return (secrets, metadata) if cached and still valid"""
+        key = (provider, account)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if datetime.utcnow() >= entry.expires_at:
+                self._evict(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            secrets = {name: buffer.decode() for name, buffer in entry.secrets.items()}
+            return secrets, dict(entry.metadata)
+
+    def put(
+        self,
+        provider: str,
+        secrets: Dict[str, Optional[str]],
+        expires_at: Optional[datetime] = None,
+        account: str = "default",
+        version: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Cache decrypted secrets; ignored if the key was invalidated since `version` was read"""
+        key = (provider, account)
+        ttl_expiry = datetime.utcnow() + timedelta(seconds=settings.token_cache_ttl)
+        if expires_at is not None:
+            expires_at = expires_at.replace(tzinfo=None) - timedelta(seconds=settings.token_expiry_margin)
+            expires_at = min(expires_at, ttl_expiry)
+        else:
+            expires_at = ttl_expiry
+
+        if expires_at <= datetime.utcnow():
+            return False
+
+        entry = _CacheEntry(
+            {name: bytearray(value.encode()) for name, value in secrets.items() if value},
+            metadata or {},
+            expires_at,
+        )
+        with self._lock:
+            if version is not None and self._versions.get(key, 0) != version:
+                entry.wipe()
+                return False
+
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)))
+        return True
+
+    def invalidate(self, provider: str, account: str = "default") -> None:
+        """Drop the entry and bump the version (call on store, revoke and refresh)"""
+        key = (provider, account)
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            if key in self._entries:
+                self._evict(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._evict(key)
+
+    def _evict(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.wipe()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+# Global decrypted-token cache
+token_cache = SecureTokenCache()
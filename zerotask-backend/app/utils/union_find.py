@@ -0,0 +1,49 @@
+from typing import Dict, Hashable, List, Optional
+
+class UnionFind:
+    """Disjoint-set forest with path compression and union by size"""
+
+    def __init__(self, sizes: Optional[Dict[Hashable, int]] = None):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+        for item, size in (sizes or {}).items():
+            self.add(item, size)
+
+    def add(self, item: Hashable, size: int = 1) -> None:
+        """Register an item as its own singleton set (no-op if already known)"""
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = max(1, size)
+
+    def find(self, item: Hashable) -> Hashable:
+        """Return the root of the set containing item"""
+        self.add(item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+
+        # Path compression
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+
+        return root
+
+    def union(self, a: Hashable, b: Hashable) -> Hashable:
+        """Merge the sets containing a and b, returning the surviving root"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+    def groups(self) -> Dict[Hashable, List[Hashable]]:
+        """Map each root to the members of its set"""
+        result: Dict[Hashable, List[Hashable]] = {}
+        for item in self.parent:
+            result.setdefault(self.find(item), []).append(item)
+        return result
@@ -0,0 +1,138 @@
+import re
+import html
+import hashlib
+from typing import List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Slack wraps links as <https://example.com|label> or <https://example.com>
+SLACK_LINK_PATTERN = re.compile(r'<(https?://[^>|\s]+)(?:\|[^>]*)?>')
+PLAIN_URL_PATTERN = re.compile(r'https?://[^\s<>"\'`\]\)]+', re.IGNORECASE)
+TRAILING_PUNCTUATION = '.,;:!?*_~'
+
+# Query parameters that never change the target document. Generic names such as
+# 'ref' and 'source' are kept: they select content on some sites (GitHub ?ref=branch)
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'si',
+    '_hsenc', '_hsmi', 'mkt_tok', 'ref_src', 'ref_url', 'trk',
+    'notification_referrer_id', 'email_token', 'email_source',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+# Redirect wrappers that carry the real destination in a query parameter
+REDIRECT_WRAPPERS = {
+    'google.com': ('/url', ('q', 'url')),
+    'slack-redir.net': ('/link', ('url',)),
+    'l.facebook.com': ('/l.php', ('u',)),
+    'lm.facebook.com': ('/l.php', ('u',)),
+    'safelinks.protection.outlook.com': ('/', ('url',)),
+    'urldefense.com': ('/v3/__', ()),
+}
+
+GITHUB_HOSTS = {'github.com', 'api.github.com'}
+GITHUB_ITEM_PATTERN = re.compile(
+    r'^/(?:repos/)?(?P<owner>[^/]+)/(?P<repo>[^/]+)/(?P<kind>pull|pulls|issues)/(?P<number>\d+)'
+)
+
+def extract_urls(text: Optional[str]) -> List[str]:
+    """Extract URLs from Slack markup, HTML and plain text, in order of appearance"""
+    if not text:
+        return []
+
+    text = html.unescape(text)
+    urls = [match.group(1) for match in SLACK_LINK_PATTERN.finditer(text)]
+    remainder = SLACK_LINK_PATTERN.sub(' ', text)
+
+    for match in PLAIN_URL_PATTERN.finditer(remainder):
+        urls.append(match.group(0).rstrip(TRAILING_PUNCTUATION))
+
+    seen = set()
+    return [url for url in urls if not (url in seen or seen.add(url))]
+
+def _unwrap_redirect(url: str, max_hops: int = 3) -> str:
+    """Follow known query-parameter redirect wrappers without any network calls"""
+    for _ in range(max_hops):
+        parts = urlsplit(url)
+        host = (parts.hostname or '').lower()
+        wrapper = None
+        for wrapper_host, spec in REDIRECT_WRAPPERS.items():
+            if host == wrapper_host or host.endswith('.' + wrapper_host) or host == 'www.' + wrapper_host:
+                wrapper = spec
+                break
+        if not wrapper:
+            return url
+
+        path_prefix, param_names = wrapper
+        if not parts.path.startswith(path_prefix):
+            return url
+
+        if host.endswith('urldefense.com'):
+            # Proofpoint v3: https://urldefense.com/v3/__<url>__;...
+            inner = parts.path[len('/v3/__'):].split('__;', 1)[0].split('__', 1)[0]
+            if not inner.startswith('http'):
+                return url
+            url = inner
+            continue
+
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        target = next((params[name] for name in param_names if params.get(name)), None)
+        if not target or not target.lower().startswith('http'):
+            return url
+        url = target
+
+    return url
+
+def _canonical_github_path(path: str) -> Optional[str]:
+    """Collapse /pull/12/files, /pulls/12 (API) and similar onto /owner/repo/pull/12"""
+    match = GITHUB_ITEM_PATTERN.match(path)
+    if not match:
+        return None
+    kind = 'pull' if match.group('kind') in ('pull', 'pulls') else 'issues'
+    return f"/{match.group('owner').lower()}/{match.group('repo').lower()}/{kind}/{match.group('number')}"
+
+def canonicalize_url(url: str) -> Optional[str]:
+    """Normalize a URL so that links to the same document compare equal"""
+    if not url:
+        return None
+
+    url = _unwrap_redirect(url.strip())
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https'):
+        return None
+
+    host = (parts.hostname or '').lower()
+    if not host:
+        return None
+    if host.startswith('www.'):
+        host = host[4:]
+
+    if host in GITHUB_HOSTS:
+        github_path = _canonical_github_path(parts.path)
+        if github_path:
+            # Fragments and sub-pages (files, commits, comments) all point at the same PR/issue
+            return f"https://github.com{github_path}"
+        host = 'github.com'
+
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query_params = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query = urlencode(sorted(query_params))
+
+    # Scheme is normalized to https so http/https variants dedupe together
+    return urlunsplit(('https', netloc, path, query, ''))
+
+def url_hash(canonical_url: str) -> str:
+    """Consistent hash for canonical URL identification - PRD Section 7.2"""
+    return hashlib.sha256(canonical_url.encode('utf-8')).hexdigest()
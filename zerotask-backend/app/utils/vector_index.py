@@ -0,0 +1,170 @@
+import os
+import json
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+class VectorIndex:
+    """Float32 vectors in a NumPy memmap keyed by event id, with batched cosine top-k search
+
+    Layout on disk (under directory/name):
+      vectors.f32  - row-major float32 matrix, capacity x dim, rows L2-normalized
+      ids.npy      - int64 event id per row (-1 marks a deleted row)
+      meta.json    - dim, count, capacity
+    100k events at 384 dims is ~150MB, so the whole matrix stays in the page cache
+    and a query is a single blocked matrix multiply.
+    """
+
+    INITIAL_CAPACITY = 1024
+    SEARCH_BLOCK_ROWS = 32768  # bounds the temporary score matrix
+
+    def __init__(self, directory: str, name: str, dim: int):
+        self.path = os.path.join(directory, name)
+        self.dim = dim
+        self.count = 0
+        self.capacity = 0
+        self._lock = threading.RLock()
+        os.makedirs(self.path, exist_ok=True)
+        self._load()
+
+    @property
+    def _vectors_file(self) -> str:
+        return os.path.join(self.path, 'vectors.f32')
+
+    @property
+    def _ids_file(self) -> str:
+        return os.path.join(self.path, 'ids.npy')
+
+    @property
+    def _meta_file(self) -> str:
+        return os.path.join(self.path, 'meta.json')
+
+    def _load(self) -> None:
+        if os.path.exists(self._meta_file):
+            with open(self._meta_file) as f:
+                meta = json.load(f)
+            if meta.get('dim') != self.dim:
+                raise ValueError(f"Vector index {self.path} has dim {meta.get('dim')}, expected {self.dim}")
+            self.count = meta['count']
+            self.capacity = meta['capacity']
+            self.vectors = np.memmap(self._vectors_file, dtype=np.float32, mode='r+', shape=(self.capacity, self.dim))
+            self.ids = np.load(self._ids_file)
+            if len(self.ids) < self.capacity:
+                self.ids = np.concatenate([self.ids, np.full(self.capacity - len(self.ids), -1, dtype=np.int64)])
+        else:
+            self.capacity = self.INITIAL_CAPACITY
+            self.vectors = np.memmap(self._vectors_file, dtype=np.float32, mode='w+', shape=(self.capacity, self.dim))
+            self.ids = np.full(self.capacity, -1, dtype=np.int64)
+
+        self._rows: Dict[int, int] = {int(event_id): row for row, event_id in enumerate(self.ids[:self.count]) if event_id >= 0}
+
+    def _grow(self, needed: int) -> None:
+        new_capacity = self.capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        if new_capacity == self.capacity:
+            return
+
+        self.vectors.flush()
+        del self.vectors
+        with open(self._vectors_file, 'r+b') as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self.vectors = np.memmap(self._vectors_file, dtype=np.float32, mode='r+', shape=(new_capacity, self.dim))
+        self.ids = np.concatenate([self.ids, np.full(new_capacity - self.capacity, -1, dtype=np.int64)])
+        self.capacity = new_capacity
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, event_id: int) -> bool:
+        return int(event_id) in self._rows
+
+    def add(self, event_ids: Iterable[int], vectors: np.ndarray) -> None:
+        """Insert or overwrite vectors (rows are L2-normalized on the way in)"""
+        event_ids = [int(event_id) for event_id in event_ids]
+        vectors = normalize(np.asarray(vectors, dtype=np.float32).reshape(len(event_ids), self.dim))
+
+        with self._lock:
+            new_ids = [event_id for event_id in dict.fromkeys(event_ids) if event_id not in self._rows]
+            self._grow(self.count + len(new_ids))
+            for event_id in new_ids:
+                self._rows[event_id] = self.count
+                self.ids[self.count] = event_id
+                self.count += 1
+
+            rows = np.fromiter((self._rows[event_id] for event_id in event_ids), dtype=np.int64, count=len(event_ids))
+            self.vectors[rows] = vectors
+
+    def remove(self, event_ids: Iterable[int]) -> int:
+        """Tombstone rows; space is reclaimed by compact()"""
+        removed = 0
+        with self._lock:
+            for event_id in event_ids:
+                row = self._rows.pop(int(event_id), None)
+                if row is not None:
+                    self.ids[row] = -1
+                    self.vectors[row] = 0.0
+                    removed += 1
+        return removed
+
+    def get(self, event_ids: Iterable[int]) -> Tuple[List[int], np.ndarray]:
+        """Vectors for the ids that are indexed, in request order"""
+        found = [int(event_id) for event_id in event_ids if int(event_id) in self._rows]
+        rows = [self._rows[event_id] for event_id in found]
+        return found, np.array(self.vectors[rows], dtype=np.float32).reshape(len(found), self.dim)
+
+    def search(self, queries: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """Batched cosine top-k: returns (event ids, scores), each shaped (n_queries, k)
+
+        Missing slots (fewer than k live rows) have id -1 and score -inf.
+        """
+        queries = normalize(np.asarray(queries, dtype=np.float32).reshape(-1, self.dim))
+        n_queries = queries.shape[0]
+        best_scores = np.full((n_queries, k), -np.inf, dtype=np.float32)
+        best_ids = np.full((n_queries, k), -1, dtype=np.int64)
+
+        with self._lock:
+            for start in range(0, self.count, self.SEARCH_BLOCK_ROWS):
+                stop = min(start + self.SEARCH_BLOCK_ROWS, self.count)
+                block_ids = self.ids[start:stop]
+                scores = queries @ self.vectors[start:stop].T
+                scores[:, block_ids < 0] = -np.inf
+
+                # Merge this block's candidates with the running top-k
+                merged_scores = np.concatenate([best_scores, scores], axis=1)
+                merged_ids = np.concatenate([best_ids, np.broadcast_to(block_ids, scores.shape)], axis=1)
+                take = min(k, merged_scores.shape[1])
+                top = np.argpartition(-merged_scores, take - 1, axis=1)[:, :take]
+                best_scores = np.take_along_axis(merged_scores, top, axis=1)
+                best_ids = np.take_along_axis(merged_ids, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_ids, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+    def compact(self) -> None:
+        """Drop tombstoned rows so the matrix stays dense"""
+        with self._lock:
+            live = np.nonzero(self.ids[:self.count] >= 0)[0]
+            if len(live) == self.count:
+                return
+            self.vectors[:len(live)] = self.vectors[live]
+            self.ids[:len(live)] = self.ids[live]
+            self.ids[len(live):self.count] = -1
+            self.count = len(live)
+            self._rows = {int(event_id): row for row, event_id in enumerate(self.ids[:self.count])}
+
+    def save(self) -> None:
+        with self._lock:
+            if self.count and len(self._rows) < self.count * 0.75:
+                self.compact()
+            self.vectors.flush()
+            np.save(self._ids_file, self.ids)
+            with open(self._meta_file, 'w') as f:
+                json.dump({'dim': self.dim, 'count': self.count, 'capacity': self.capacity}, f)
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, leaving all-zero rows untouched"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
@@ -0,0 +1,57 @@
+"""
+Startup-time benchmark for the ZeroTask backend
+
+Imports app.main in a fresh interpreter several times and fails when the
+median exceeds the budget, or when importing app.utils.encryption starts
+paying for key derivation again. Run from zerotask-backend/:
+
+    python scripts/bench_startup.py [--budget-ms 2500] [--runs 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+IMPORT_SNIPPET = (
+    "import time; {preload} t = time.perf_counter(); import {module}; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+def measure(module: str, runs: int, preload: str = "") -> float:
+    """Median import time of a module in milliseconds, each run in a new process"""
+    snippet = IMPORT_SNIPPET.format(module=module, preload=f"import {preload};" if preload else "")
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", snippet],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+        samples.append(float(output))
+    return statistics.median(samples)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2500.0, help="median budget for importing app.main")
+    parser.add_argument("--encryption-budget-ms", type=float, default=30.0,
+                        help="median budget for importing app.utils.encryption (no PBKDF2 at import)")
+    args = parser.parse_args()
+
+    results = {
+        # app.config (pydantic-settings) is preloaded so only the module's own cost is measured
+        "app.utils.encryption": (measure("app.utils.encryption", args.runs, preload="app.config"),
+                                 args.encryption_budget_ms),
+        "app.main": (measure("app.main", args.runs), args.budget_ms),
+    }
+
+    failed = False
+    for module, (median_ms, budget_ms) in results.items():
+        status = "ok" if median_ms <= budget_ms else "REGRESSION"
+        failed |= median_ms > budget_ms
+        print(f"{module:<24} median {median_ms:8.1f} ms  budget {budget_ms:8.1f} ms  {status}")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
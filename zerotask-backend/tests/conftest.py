@@ -0,0 +1,40 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway SQLite file before app.database creates its engine
+_tmpdir = tempfile.mkdtemp(prefix="zerotask-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'test.db')}"
+os.environ.setdefault("EMBEDDING_INDEX_DIR", os.path.join(_tmpdir, "embeddings"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: E402,F401  (registers every table on Base)
+from app.config import settings  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+
+@pytest.fixture
+def db():
+    """Session on an empty schema"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def override_settings():
+    """Set settings attributes for one test: override_settings(name=value, ...)"""
+    saved = {}
+
+    def apply(**values):
+        for name, value in values.items():
+            saved.setdefault(name, getattr(settings, name))
+            setattr(settings, name, value)
+
+    yield apply
+    for name, value in saved.items():
+        setattr(settings, name, value)
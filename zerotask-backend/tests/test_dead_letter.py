@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.dead_letter import DeadLetter
+from app.models.events import Event
+from app.services import connector_service
+from app.services.dead_letter_service import DeadLetterService
+from app.utils.resilience import SourceUnavailableError
+
+@pytest.fixture
+def handler(monkeypatch, override_settings):
+    """Retry handler for ('test', 'item') that raises `state["error"]` or returns one record"""
+    override_settings(dead_letter_backoff_base=60, dead_letter_backoff_max=300, dead_letter_max_attempts=3)
+    state = {"error": ValueError("still failing"), "calls": 0}
+
+    def retry(db, item_id, payload):
+        state["calls"] += 1
+        if state["error"] is not None:
+            raise state["error"]
+        return [{"source": "test", "source_id": item_id, "title": "recovered", "ts": datetime.utcnow()}]
+
+    monkeypatch.setitem(connector_service.RETRY_HANDLERS, ("test", "item"), retry)
+    return state
+
+def delay_of(letter):
+    return (letter.next_retry_at.replace(tzinfo=None) - datetime.utcnow()).total_seconds()
+
+def test_record_refreshes_instead_of_duplicating(db):
+    service = DeadLetterService(db)
+    service.record("test", "item", "1", "first")
+    letter = service.record("test", "item", "1", "second")
+
+    assert db.query(DeadLetter).count() == 1
+    assert letter.error == "second"
+    assert letter.status == "pending"
+
+def test_failures_back_off_then_abandon(db, handler):
+    service = DeadLetterService(db)
+    letter = service.record("test", "item", "1", "boom")
+
+    assert not service.retry(letter)
+    assert letter.attempts == 1
+    assert 60 * 2 * 0.8 <= delay_of(letter) <= 60 * 2 * 1.2
+
+    assert not service.retry(letter)
+    # 60 * 4 = 240, still under the 300 s cap
+    assert 240 * 0.8 <= delay_of(letter) <= 240 * 1.2
+
+    assert not service.retry(letter)
+    assert letter.status == "abandoned"
+    assert letter.next_retry_at is None
+    assert letter.last_attempt_at is not None
+
+def test_backoff_is_capped(db, handler, override_settings):
+    override_settings(dead_letter_max_attempts=10)
+    service = DeadLetterService(db)
+    letter = service.record("test", "item", "1", "boom")
+    for _ in range(5):
+        service.retry(letter)
+
+    assert delay_of(letter) <= 300 * 1.2
+
+def test_unavailable_source_does_not_use_an_attempt(db, handler):
+    handler["error"] = SourceUnavailableError("test", "item", 120.0)
+    service = DeadLetterService(db)
+    letter = service.record("test", "item", "1", "boom")
+
+    assert not service.retry(letter)
+
+    assert letter.attempts == 0
+    assert letter.status == "pending"
+    assert 110 <= delay_of(letter) <= 120
+    assert letter.last_attempt_at is not None
+
+def test_successful_retry_ingests_and_resolves(db, handler):
+    handler["error"] = None
+    service = DeadLetterService(db)
+    service.record("test", "item", "1", "boom")
+    db.query(DeadLetter).update({DeadLetter.next_retry_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+    stats = service.retry_due()
+
+    assert stats == {"attempted": 1, "resolved": 1, "failed": 0, "abandoned": 0}
+    assert db.query(DeadLetter).one().status == "resolved"
+    assert db.query(Event).filter(Event.source == "test", Event.source_id == "1").count() == 1
+
+def test_retry_due_skips_items_still_backing_off(db, handler):
+    DeadLetterService(db).record("test", "item", "1", "boom")
+
+    assert DeadLetterService(db).retry_due()["attempted"] == 0
+    assert handler["calls"] == 0
+
+def test_replay_gives_abandoned_items_fresh_attempts(db, handler):
+    service = DeadLetterService(db)
+    letter = service.record("test", "item", "1", "boom")
+    for _ in range(3):
+        service.retry(letter)
+    assert letter.status == "abandoned"
+
+    handler["error"] = None
+    stats = service.replay(status="abandoned")
+
+    assert stats["resolved"] == 1
+    assert letter.status == "resolved"
+
+def test_purge_resolved_keeps_open_items(db, handler):
+    handler["error"] = None
+    service = DeadLetterService(db)
+    service.retry(service.record("test", "item", "1", "boom"))
+    service.record("test", "item", "2", "boom")
+
+    assert service.purge_resolved(datetime.utcnow() + timedelta(seconds=1)) == 1
+    assert [letter.item_id for letter in db.query(DeadLetter)] == ["2"]
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+from app.models.events import Event
+from app.services.event_ingest_service import EventIngestService
+from app.utils.union_find import UnionFind
+
+def record(source_id, title, url=None, snippet=None, source="slack", minutes_ago=0):
+    return {"source": source, "source_id": source_id, "title": title, "snippet": snippet, "url": url,
+            "ts": datetime.utcnow() - timedelta(minutes=minutes_ago), "raw_json": None}
+
+def clusters(db):
+    return {event.source_id: event.cluster_id for event in db.query(Event)}
+
+def test_union_find_merges_by_size():
+    forest = UnionFind({"big": 5})
+    forest.union("a", "b")
+    # The larger set's root survives, whichever side it is passed on
+    assert forest.union("a", "big") == "big"
+    assert forest.find("b") == "big"
+    assert forest.size["big"] == 7
+    assert sorted(forest.groups()["big"]) == ["a", "b", "big"]
+
+def test_union_find_keeps_disjoint_sets_apart():
+    forest = UnionFind()
+    forest.union(1, 2)
+    forest.union(3, 4)
+    assert forest.find(1) != forest.find(3)
+    assert len(forest.groups()) == 2
+
+def test_shared_canonical_url_joins_one_cluster(db, override_settings):
+    override_settings(near_duplicate_enabled=False)
+    EventIngestService(db).ingest([
+        record("1", "PR opened https://github.com/o/r/pull/7"),
+        record("2", "reviewing https://github.com/O/R/pull/7/files?utm_source=slack"),
+        record("3", "unrelated https://example.com/other"),
+    ])
+
+    ids = clusters(db)
+    assert ids["1"] == ids["2"]
+    assert ids["3"] != ids["1"]
+
+def test_later_batches_join_existing_clusters(db, override_settings):
+    override_settings(near_duplicate_enabled=False)
+    EventIngestService(db).ingest([record("1", "see https://example.com/doc/1"), record("2", "see https://example.com/doc/2")])
+    EventIngestService(db).ingest([record("3", "both https://example.com/doc/1 and https://example.com/doc/2")])
+
+    ids = clusters(db)
+    assert ids["1"] == ids["2"] == ids["3"]
+
+def test_reingested_event_moves_with_its_whole_cluster(db, override_settings):
+    override_settings(near_duplicate_enabled=False)
+    EventIngestService(db).ingest([record("1", "a https://example.com/x"), record("2", "b https://example.com/x")])
+    EventIngestService(db).ingest([record("3", "c https://example.com/y"), record("4", "d https://example.com/y"),
+                                   record("5", "e https://example.com/y")])
+
+    # Event 1 is edited to mention y: its cluster (1, 2) joins the y cluster as a whole
+    EventIngestService(db).ingest([record("1", "a https://example.com/x and https://example.com/y")])
+
+    assert len(set(clusters(db).values())) == 1
@@ -0,0 +1,58 @@
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.services import github_service
+from app.services.connector_service import CheckpointStore
+from app.services.github_service import GitHubService, github_rate_limits
+
+LAST_MODIFIED = "Mon, 19 Oct 2026 08:00:00 GMT"
+
+@pytest.fixture
+def github(monkeypatch):
+    """Notifications endpoint answering with the queued responses; returns the requests made"""
+    monkeypatch.setattr(GitHubService, "__init__", lambda self: setattr(self, "token", "token"))
+    monkeypatch.setattr(github_rate_limits, "_limits", {})
+    state = {"responses": [], "requests": []}
+
+    def http_request(source, endpoint, method, url, headers=None, params=None, **kwargs):
+        state["requests"].append({"headers": headers, "params": params})
+        return state["responses"].pop(0)
+
+    monkeypatch.setattr(github_service, "http_request", http_request)
+    return state
+
+def rate_headers(remaining):
+    return {"x-ratelimit-resource": "core", "x-ratelimit-remaining": str(remaining), "x-ratelimit-limit": "5000",
+            "x-ratelimit-reset": str(int(time.time()) + 600)}
+
+def test_poll_state_lives_in_the_cursor(db, github):
+    since = datetime.utcnow() - timedelta(hours=1)
+    github["responses"] = [httpx.Response(200, json=[{"id": "1"}], headers={
+        "last-modified": LAST_MODIFIED, "x-poll-interval": "60", **rate_headers(4999),
+    })]
+    cursor = {}
+
+    assert GitHubService().get_notifications(since, cursor) == [{"id": "1"}]
+    assert cursor["last_modified"] == LAST_MODIFIED
+    assert cursor["poll_after"] > time.time() + 50
+
+    # A restart reads the state back from the checkpoint and still honors X-Poll-Interval
+    CheckpointStore(db).save("github", "notifications", cursor)
+    restored = CheckpointStore(db).load("github", "notifications")
+    assert GitHubService().get_notifications(since, restored) == []
+    assert len(github["requests"]) == 1
+
+def test_conditional_poll_and_304_rate_limit_headers(db, github):
+    github["responses"] = [httpx.Response(304, headers={"x-poll-interval": "30", **rate_headers(4321)})]
+    cursor = {"last_modified": LAST_MODIFIED}
+
+    assert GitHubService().get_notifications(datetime.utcnow(), cursor) == []
+
+    request = github["requests"][0]
+    assert request["headers"]["If-Modified-Since"] == LAST_MODIFIED
+    assert "since" not in request["params"]
+    assert cursor["last_modified"] == LAST_MODIFIED
+    assert github_rate_limits.status()["core"]["remaining"] == 4321
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+
+from app.database import SessionLocal
+from app.models.runs import Run
+from app.models.tokens import Token
+from app.services import key_rotation_service
+from app.services.key_rotation_service import KeyRotationService
+
+class Keys:
+    """Stands in for token_encryption: a current key plus one previous key"""
+
+    key_id = "current"
+
+    def __init__(self):
+        self.old = Fernet(Fernet.generate_key())
+        self.new = Fernet(Fernet.generate_key())
+        self.fernet = MultiFernet([self.new, self.old])
+        self.before_rotate = None
+
+    def rotate_token(self, value: str) -> str:
+        if self.before_rotate:
+            self.before_rotate(value)
+        return self.fernet.rotate(value.encode()).decode()
+
+@pytest.fixture
+def keys(monkeypatch, override_settings):
+    override_settings(key_rotation_batch_size=2, key_rotation_pause=0)
+    keys = Keys()
+    monkeypatch.setattr(key_rotation_service, "token_encryption", keys)
+    return keys
+
+def add_tokens(db, keys, count):
+    for index in range(count):
+        db.add(Token(provider=f"provider-{index}", encrypted_token=keys.old.encrypt(f"secret-{index}".encode()).decode()))
+    db.commit()
+
+def stored(db):
+    db.expire_all()
+    return {token.provider: token.encrypted_token for token in db.query(Token)}
+
+def test_every_value_is_rotated_to_the_current_key(db, keys):
+    add_tokens(db, keys, 5)
+
+    stats = KeyRotationService(db).run()
+
+    assert stats["rotated"] == 5
+    assert stats["checkpoints"]["tokens"] == 5
+    for provider, value in stored(db).items():
+        assert keys.new.decrypt(value.encode()) == f"secret-{provider.rsplit('-', 1)[1]}".encode()
+    assert db.query(Run).one().status == "completed"
+
+def test_value_rewritten_mid_rotation_is_not_clobbered(db, keys):
+    add_tokens(db, keys, 1)
+    fresh = keys.new.encrypt(b"refreshed").decode()
+
+    def rewrite(value):
+        # The API stores a refreshed token between the rotation's read and its write
+        other = SessionLocal()
+        other.query(Token).update({Token.encrypted_token: fresh})
+        other.commit()
+        other.close()
+        keys.before_rotate = None
+
+    keys.before_rotate = rewrite
+    stats = KeyRotationService(db).run()
+
+    assert stats["skipped"] == 1
+    assert stats["rotated"] == 0
+    assert stored(db)["provider-0"] == fresh
+
+def test_interrupted_rotation_resumes_from_its_checkpoint(db, keys):
+    add_tokens(db, keys, 4)
+    calls = []
+
+    def fail_on_third(value):
+        calls.append(value)
+        if len(calls) == 3:
+            raise RuntimeError("disk full")
+
+    keys.before_rotate = fail_on_third
+    KeyRotationService(db).run()
+    run = db.query(Run).one()
+    assert run.status == "failed"
+    # The first batch of two was committed and checkpointed
+    assert json.loads(run.stats_json)["checkpoints"]["tokens"] == 2
+
+    keys.before_rotate = None
+    stats = KeyRotationService(db).run()
+
+    assert stats["rotated"] == 4
+    assert db.query(Run).count() == 1
+    assert all(keys.new.decrypt(value.encode()) for value in stored(db).values())
+
+def test_values_under_unknown_keys_are_counted_not_fatal(db, keys):
+    db.add(Token(provider="lost", encrypted_token=Fernet(Fernet.generate_key()).encrypt(b"x").decode()))
+    db.commit()
+
+    stats = KeyRotationService(db).run()
+
+    assert stats["undecryptable"] == 1
+    assert db.query(Run).one().status == "completed"
+    with pytest.raises(InvalidToken):
+        keys.fernet.decrypt(stored(db)["lost"].encode())
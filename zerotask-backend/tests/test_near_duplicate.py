@@ -0,0 +1,55 @@
+import random
+from datetime import datetime
+
+from app.models.events import Event
+from app.services.event_ingest_service import EventIngestService
+from app.utils.simhash import SIGNATURE_BITS, band_keys, from_signed, hamming_distance, simhash, to_signed
+
+TEXT = "Deploy of the billing service to production is blocked on the failing migration"
+
+def test_signature_ignores_markup_and_reply_markers():
+    assert simhash(f"Re: {TEXT} <https://example.com/x|link>") == simhash(TEXT)
+
+def test_short_texts_get_no_signature():
+    assert simhash("thanks!", min_tokens=8) is None
+
+def test_small_edits_stay_close_and_unrelated_texts_do_not():
+    edited = simhash(TEXT.replace("failing", "broken"))
+    unrelated = simhash("Lunch menu for the offsite next week has been posted to the shared drive")
+
+    assert hamming_distance(simhash(TEXT), edited) < hamming_distance(simhash(TEXT), unrelated)
+
+def test_signatures_within_band_count_share_a_band():
+    rng = random.Random(7)
+    for bands in (1, 4, 7, 64):
+        for _ in range(200):
+            signature = rng.getrandbits(SIGNATURE_BITS)
+            other = signature
+            # Pigeonhole: (bands - 1) flipped bits leave at least one band untouched
+            for bit in rng.sample(range(SIGNATURE_BITS), bands - 1):
+                other ^= 1 << bit
+            assert set(band_keys(signature, bands)) & set(band_keys(other, bands))
+
+def test_band_keys_cover_all_bits():
+    keys = band_keys(0, 5)
+    assert len(keys) == 5
+    assert len(set(band_keys(1 << 63, 5)) & set(keys)) == 4
+
+def test_signed_round_trip():
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        assert from_signed(to_signed(value)) == value
+        assert -(1 << 63) <= to_signed(value) < (1 << 63)
+
+def test_near_duplicates_join_one_cluster(db):
+    now = datetime.utcnow()
+    EventIngestService(db).ingest([
+        {"source": "gmail", "source_id": "1", "title": TEXT, "ts": now},
+        {"source": "slack", "source_id": "2", "title": TEXT + ".", "ts": now},
+        {"source": "slack", "source_id": "3", "title": "Lunch menu for the offsite next week has been posted", "ts": now},
+    ])
+    # A later batch is matched against the stored bands
+    EventIngestService(db).ingest([{"source": "github", "source_id": "4", "title": f"Fwd: {TEXT}", "ts": now}])
+
+    clusters = {event.source_id: event.cluster_id for event in db.query(Event)}
+    assert clusters["1"] == clusters["2"] == clusters["4"]
+    assert clusters["3"] != clusters["1"]
@@ -0,0 +1,35 @@
+import asyncio
+
+from app.services import poll_service
+from app.services.poll_service import PollService, run_poll_job
+
+def test_polls_of_one_source_never_overlap(db, monkeypatch):
+    running = {"gmail": 0, "slack": 0}
+    overlaps = []
+
+    async def poll(self, source):
+        running[source] += 1
+        overlaps.append(dict(running))
+        await asyncio.sleep(0.01)
+        running[source] -= 1
+        return {"status": "ok"}
+
+    monkeypatch.setattr(PollService, "poll", poll)
+
+    async def main():
+        # Scheduled job and brief run polling gmail at once, slack alongside
+        await asyncio.gather(run_poll_job("gmail"), run_poll_job("gmail"), run_poll_job("slack"))
+
+    asyncio.run(main())
+
+    assert max(state["gmail"] for state in overlaps) == 1
+    # Different sources still poll concurrently
+    assert any(state["gmail"] and state["slack"] for state in overlaps)
+
+def test_poll_locks_are_per_source():
+    async def main():
+        return poll_service.poll_lock("gmail"), poll_service.poll_lock("gmail"), poll_service.poll_lock("slack")
+
+    gmail, again, slack = asyncio.run(main())
+    assert gmail is again
+    assert gmail is not slack
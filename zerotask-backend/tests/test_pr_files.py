@@ -0,0 +1,92 @@
+import json
+
+import httpx
+import pytest
+
+from app.database import SessionLocal
+from app.models.pr_files import PullRequestFiles
+from app.services import github_service
+from app.services.github_service import GitHubService
+from app.services.pr_files_service import PullRequestFilesService
+
+@pytest.fixture
+def github(monkeypatch, override_settings):
+    """REST files pages served from `rest_files`; returns the list of pages requested"""
+    override_settings(github_patch_page_size=2, github_patch_files=2)
+    monkeypatch.setattr(GitHubService, "__init__", lambda self: setattr(self, "token", "token"))
+    state = {"rest_files": [], "pages": []}
+
+    def http_request(source, endpoint, method, url, params=None, **kwargs):
+        page, per_page = params["page"], params["per_page"]
+        state["pages"].append(page)
+        items = state["rest_files"][(page - 1) * per_page:page * per_page]
+        return httpx.Response(200, json=[{"filename": path, "patch": f"@@ {path}"} for path in items])
+
+    monkeypatch.setattr(github_service, "http_request", http_request)
+    return state
+
+def add_entry(db, paths):
+    entry = PullRequestFiles(
+        repo="o/r", number=1, head_sha="abc", file_count=len(paths), additions=0, deletions=0,
+        files_json=json.dumps([[path, 10 * (len(paths) - index), 0, "MODIFIED"] for index, path in enumerate(paths)]),
+    )
+    db.add(entry)
+    db.commit()
+    return entry
+
+def test_patches_fetch_only_the_pages_holding_the_top_files(db, github):
+    paths = ["a.py", "b.py", "c.py", "d.py", "e.py", "f.py"]
+    github["rest_files"] = paths
+    entry = add_entry(db, paths)
+
+    patches = PullRequestFilesService(db).patches(entry)
+
+    assert patches == {"a.py": "@@ a.py", "b.py": "@@ b.py"}
+    assert github["pages"] == [1]
+    assert json.loads(entry.patches_json) == patches
+
+def test_patches_look_on_neighbouring_pages_when_order_differs(db, github):
+    github["rest_files"] = ["c.py", "d.py", "a.py", "b.py", "e.py", "f.py"]
+    entry = add_entry(db, ["a.py", "b.py", "c.py", "d.py", "e.py", "f.py"])
+
+    patches = PullRequestFilesService(db).patches(entry)
+
+    assert set(patches) == {"a.py", "b.py"}
+    assert github["pages"] == [1, 2]
+    assert entry.patches_json is not None
+
+def test_incomplete_patches_are_not_cached(db, github):
+    github["rest_files"] = ["c.py", "d.py", "e.py", "f.py", "a.py", "g.py", "b.py"]
+    entry = add_entry(db, ["a.py", "b.py", "c.py", "d.py", "e.py", "f.py", "g.py"])
+
+    patches = PullRequestFilesService(db).patches(entry)
+
+    assert set(patches) == set()
+    assert entry.patches_json is None
+
+def test_load_rereads_after_losing_the_insert_race(db, monkeypatch):
+    def get_pr_files(self, repo, number):
+        # Another worker caches the same head commit while this one fetches
+        other = SessionLocal()
+        other.add(PullRequestFiles(repo=repo, number=number, head_sha="abc", file_count=1, files_json="[]"))
+        other.commit()
+        other.close()
+        return "abc", [{"path": "a.py", "additions": 1, "deletions": 0, "changeType": "MODIFIED"}]
+
+    monkeypatch.setattr(GitHubService, "__init__", lambda self: None)
+    monkeypatch.setattr(GitHubService, "get_pr_files", get_pr_files)
+    service = PullRequestFilesService(db)
+    original = service._cached
+    lookups = []
+
+    def cached(*args):
+        # The check right after the fetch still misses; the re-read after the conflict finds the row
+        lookups.append(args)
+        return None if len(lookups) == 1 else original(*args)
+
+    monkeypatch.setattr(service, "_cached", cached)
+
+    entry = service.load("o/r", 1)
+
+    assert entry.head_sha == "abc"
+    assert db.query(PullRequestFiles).count() == 1
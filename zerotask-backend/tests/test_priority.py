@@ -0,0 +1,77 @@
+import json
+from datetime import datetime, timedelta
+
+from app.models.cards import Card
+from app.models.events import Event
+from app.services.priority_service import PriorityScoringService
+
+def add_event(db, source_id, author="bob", title="Status update", snippet=None, raw=None, cluster_id=None, age_hours=1):
+    event = Event(
+        source="github", source_id=source_id, title=title, snippet=snippet, author=author,
+        ts=datetime.utcnow() - timedelta(hours=age_hours), raw_json=json.dumps(raw) if raw is not None else None,
+        cluster_id=cluster_id,
+    )
+    db.add(event)
+    db.commit()
+    return event
+
+def features_by_event(scorer):
+    features = scorer.build_features()
+    return {event_id: {name: features[name][row] for name in ("mention", "ownership", "due", "affinity")}
+            for row, event_id in enumerate(features["event_id"].tolist())}
+
+def test_ownership_from_assignee_and_to_only(db):
+    mine = add_event(db, "1", author="alice")
+    reply = add_event(db, "2", author="bob", cluster_id=mine.id)
+    assigned = add_event(db, "3", raw={"assignees": ["Alice"]})
+    addressed = add_event(db, "4", raw={"to": "Alice Smith <alice@example.com>"})
+    cc_only = add_event(db, "5", raw={"to": "team@example.com", "cc": "alice@example.com"})
+
+    features = features_by_event(PriorityScoringService(db, identities=["alice", "alice@example.com"]))
+
+    # Taking part in the user's thread is affinity, not ownership
+    assert features[reply.id]["ownership"] == 0.0
+    assert features[reply.id]["affinity"] > 0.0
+    assert features[assigned.id]["ownership"] == 1.0
+    assert features[addressed.id]["ownership"] == 1.0
+    assert features[cc_only.id]["ownership"] == 0.0
+    assert features[mine.id]["ownership"] == 0.0
+
+def test_mentions_match_whole_handles(db):
+    exact = add_event(db, "1", title="@al can you look at this?")
+    longer = add_event(db, "2", title="@alice can you look at this?")
+    bot = add_event(db, "3", title="ping @al-bot")
+    due = add_event(db, "4", title="Release blocker, due today")
+
+    features = features_by_event(PriorityScoringService(db, identities=["al"]))
+
+    assert features[exact.id]["mention"] == 1.0
+    assert features[longer.id]["mention"] == 0.0
+    assert features[bot.id]["mention"] == 0.0
+    assert features[due.id]["due"] == 1.0
+
+def test_flag_cache_follows_payload_changes(db):
+    event = add_event(db, "1", raw={"assignees": []})
+    scorer = PriorityScoringService(db, identities=["alice"])
+    assert features_by_event(scorer)[event.id]["ownership"] == 0.0
+
+    # Same title and snippet (so the same simhash), new assignee
+    event.raw_json = json.dumps({"assignees": ["alice"]})
+    db.commit()
+
+    assert features_by_event(scorer)[event.id]["ownership"] == 1.0
+
+def test_rescore_cards_updates_changed_scores(db):
+    event = add_event(db, "1", title="@alice please review", age_hours=0)
+    card = Card(primary_event_id=event.id, cluster_id=event.id, priority_score=0.0, summary_md="summary")
+    db.add(card)
+    db.commit()
+
+    stats = PriorityScoringService(db, identities=["alice"]).rescore_cards()
+
+    db.refresh(card)
+    assert stats["cards_updated"] == 1
+    assert card.priority_score > 0.0
+
+    # Nothing changed since, so a second pass writes nothing
+    assert PriorityScoringService(db, identities=["alice"]).rescore_cards()["cards_updated"] == 0
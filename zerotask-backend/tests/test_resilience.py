@@ -0,0 +1,97 @@
+import time
+
+import httpx
+import pytest
+
+from app.utils.resilience import CircuitBreaker, SourceUnavailableError, deadline_scope, time_remaining
+
+def fail_with(error):
+    def func(timeout):
+        raise error
+    return func
+
+@pytest.fixture
+def breaker(override_settings):
+    override_settings(circuit_failure_threshold=3, circuit_open_seconds=30, circuit_half_open_probes=1, connector_timeout=10)
+    return CircuitBreaker("gmail", "messages.get")
+
+def test_opens_after_threshold_outages_and_fails_fast(breaker):
+    for _ in range(3):
+        with pytest.raises(httpx.ConnectError):
+            breaker.call(fail_with(httpx.ConnectError("down")))
+    assert breaker.state == "open"
+
+    calls = []
+    with pytest.raises(SourceUnavailableError):
+        breaker.call(lambda timeout: calls.append(timeout))
+    assert calls == []
+
+def test_non_outage_errors_count_as_up(breaker):
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            breaker.call(fail_with(ValueError("bad request")))
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+def test_half_open_probe_closes_or_reopens(breaker):
+    for _ in range(3):
+        with pytest.raises(httpx.ConnectError):
+            breaker.call(fail_with(httpx.ConnectError("down")))
+    breaker.opened_at -= 31
+
+    with pytest.raises(httpx.ConnectError):
+        breaker.call(fail_with(httpx.ConnectError("still down")))
+    assert breaker.state == "open"
+
+    breaker.opened_at -= 31
+    assert breaker.call(lambda timeout: "ok") == "ok"
+    assert breaker.state == "closed"
+
+def test_expired_caller_deadline_does_not_count_against_breaker(breaker):
+    calls = []
+    with deadline_scope(0.001):
+        time.sleep(0.01)
+        for _ in range(5):
+            with pytest.raises(TimeoutError):
+                breaker.call(lambda timeout: calls.append(timeout))
+    assert calls == []
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    # A caller without a deadline still gets through
+    assert breaker.call(lambda timeout: timeout) == 10
+
+def test_timeout_shortened_by_deadline_does_not_count(breaker):
+    with deadline_scope(2):
+        for _ in range(5):
+            with pytest.raises(httpx.ReadTimeout):
+                breaker.call(fail_with(httpx.ReadTimeout("slow")))
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+def test_timeout_with_full_endpoint_timeout_counts(breaker):
+    for _ in range(3):
+        with pytest.raises(httpx.ReadTimeout):
+            breaker.call(fail_with(httpx.ReadTimeout("slow")))
+    assert breaker.state == "open"
+
+def test_shortened_timeout_returns_half_open_probe(breaker):
+    for _ in range(3):
+        with pytest.raises(httpx.ConnectError):
+            breaker.call(fail_with(httpx.ConnectError("down")))
+    breaker.opened_at -= 31
+
+    with deadline_scope(2):
+        with pytest.raises(httpx.ReadTimeout):
+            breaker.call(fail_with(httpx.ReadTimeout("slow")))
+    # The probe slot is free again, so the next caller can close the circuit
+    assert breaker.call(lambda timeout: "ok") == "ok"
+    assert breaker.state == "closed"
+
+def test_deadline_scope_nests_and_resets():
+    assert time_remaining() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert time_remaining() <= 10
+        with deadline_scope(60, inherit=False):
+            assert time_remaining() > 10
+    assert time_remaining() is None
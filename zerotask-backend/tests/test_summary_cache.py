@@ -0,0 +1,73 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.models.llm_cache import LLMCacheEntry
+from app.services.summarization_service import SummarizationService
+from app.services.summary_cache_service import SummaryCacheService
+
+class FakeClient:
+    """Stands in for OllamaClient; replies with one summary per item, or fails"""
+
+    model = "test-model"
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+
+    async def generate(self, prompt, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("LLM unavailable")
+        count = prompt.count("### ITEM")
+        return SimpleNamespace(text=json.dumps({"summaries": [{"id": n, "summary": f"summary {n}"} for n in range(1, count + 1)]}))
+
+def expire_all(db):
+    db.query(LLMCacheEntry).update({LLMCacheEntry.expires_at: datetime.utcnow() - timedelta(hours=1)})
+    db.commit()
+
+def test_fresh_entries_are_served(db):
+    cache = SummaryCacheService(db)
+    cache.put_many("test-model", "v1", {"some thread": "cached summary"})
+
+    assert cache.get_many("test-model", "v1", {"a": "some thread", "b": "other"}) == {"a": "cached summary"}
+
+def test_expired_entries_only_served_with_allow_stale(db):
+    cache = SummaryCacheService(db)
+    cache.put_many("test-model", "v1", {"some thread": "old summary"})
+    expire_all(db)
+
+    assert cache.get_many("test-model", "v1", {"a": "some thread"}) == {}
+    assert cache.get_many("test-model", "v1", {"a": "some thread"}, allow_stale=True) == {"a": "old summary"}
+
+def test_cache_key_ignores_whitespace_but_not_template(db):
+    cache = SummaryCacheService(db)
+    cache.put_many("test-model", "v1", {"some  thread\n": "cached summary"})
+
+    assert cache.get_many("test-model", "v1", {"a": "some thread"}) == {"a": "cached summary"}
+    assert cache.get_many("test-model", "v2", {"a": "some thread"}) == {}
+
+def test_summarize_falls_back_to_stale_when_llm_fails(db):
+    SummaryCacheService(db).put_many("test-model", "v1", {"first thread": "old summary"})
+    expire_all(db)
+    service = SummarizationService(db, FakeClient(fail=True), template_version="v1")
+
+    results = asyncio.run(service.summarize({"a": "first thread", "b": "second thread"}))
+
+    assert results == {"a": "old summary"}
+    assert service.stale == {"a"}
+    assert service.stats["stale"] == 1
+
+def test_summarize_prefers_llm_over_stale(db):
+    SummaryCacheService(db).put_many("test-model", "v1", {"first thread": "old summary"})
+    expire_all(db)
+    client = FakeClient()
+    service = SummarizationService(db, client, template_version="v1")
+
+    results = asyncio.run(service.summarize({"a": "first thread"}))
+
+    assert results == {"a": "summary 1"}
+    assert service.stale == set()
+    # The fresh summary replaced the expired one
+    assert SummaryCacheService(db).get_many("test-model", "v1", {"a": "first thread"}) == {"a": "summary 1"}
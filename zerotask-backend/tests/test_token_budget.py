@@ -0,0 +1,40 @@
+from app.utils.token_budget import estimate_tokens, fill_ratio, first_fit_decreasing, truncate_to_tokens
+
+def test_first_fit_decreasing_packs_largest_first():
+    sizes = {"a": 6, "b": 5, "c": 4, "d": 3, "e": 2}
+
+    bins = first_fit_decreasing(sizes, capacity=10)
+
+    assert bins == [["a", "c"], ["b", "d", "e"]]
+    assert all(sum(sizes[key] for key in members) <= 10 for members in bins)
+    assert fill_ratio(bins, sizes, 10) == 1.0
+
+def test_oversized_items_get_their_own_bin():
+    bins = first_fit_decreasing({"huge": 15, "small": 2}, capacity=10)
+
+    assert bins == [["huge"], ["small"]]
+
+def test_max_items_caps_each_bin():
+    bins = first_fit_decreasing({key: 1 for key in "abcde"}, capacity=100, max_items=2)
+
+    assert [len(members) for members in bins] == [2, 2, 1]
+
+def test_every_item_is_packed_once():
+    sizes = {index: (index * 7) % 13 + 1 for index in range(50)}
+
+    bins = first_fit_decreasing(sizes, capacity=20)
+
+    assert sorted(key for members in bins for key in members) == list(range(50))
+
+def test_truncate_respects_the_token_budget():
+    text = "word " * 500
+
+    truncated = truncate_to_tokens(text, 50)
+
+    assert estimate_tokens(truncated) <= 50 + estimate_tokens(" ...")
+    assert truncate_to_tokens("short", 50) == "short"
+
+def test_estimate_counts_symbols_and_long_words():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a, b") == 3
+    assert estimate_tokens("internationalization") == 5
@@ -0,0 +1,27 @@
+from app.utils.url_canonicalizer import canonicalize_url, extract_urls
+
+def test_tracking_params_and_cosmetic_differences_are_dropped():
+    assert canonicalize_url("http://www.Example.com/a/b/?utm_source=x&b=2&a=1&fbclid=y") == "https://example.com/a/b?a=1&b=2"
+
+def test_content_selecting_params_are_kept():
+    # ?ref picks the branch a GitHub file view shows; ?source is meaningful on many sites
+    assert canonicalize_url("https://github.com/o/r/blob/main/README.md?ref=dev") == "https://github.com/o/r/blob/main/README.md?ref=dev"
+    assert canonicalize_url("https://example.com/report?source=q3") == "https://example.com/report?source=q3"
+    assert canonicalize_url("https://example.com/a?ref=dev") != canonicalize_url("https://example.com/a?ref=main")
+
+def test_github_sub_pages_collapse_onto_the_item():
+    expected = "https://github.com/owner/repo/pull/12"
+    assert canonicalize_url("https://github.com/Owner/Repo/pull/12/files#diff-1") == expected
+    assert canonicalize_url("https://api.github.com/repos/owner/repo/pulls/12") == expected
+
+def test_redirect_wrappers_are_unwrapped():
+    wrapped = "https://www.google.com/url?q=https%3A%2F%2Fexample.com%2Fdoc%3Futm_medium%3Demail"
+    assert canonicalize_url(wrapped) == "https://example.com/doc"
+
+def test_extract_urls_from_slack_markup_and_text():
+    text = "see <https://example.com/a|the doc> and https://example.com/b)."
+    assert extract_urls(text) == ["https://example.com/a", "https://example.com/b"]
+
+def test_non_http_urls_are_ignored():
+    assert canonicalize_url("mailto:someone@example.com") is None
+    assert canonicalize_url("") is None